@@ -19,10 +19,27 @@ from DataNinja.formats.excel_handler import ExcelHandler
 from DataNinja.formats.sqlite_handler import SQLiteHandler
 from DataNinja.formats.yaml_handler import YAMLHandler
 from DataNinja.core.cleaner import DataCleaner
-from DataNinja.plugins.geo import GeoProcessor
-from DataNinja.plugins.ml import MLModel
+from DataNinja.core.expressions import Expression, ExpressionError, MapExpression
+from DataNinja.core.dedup import BloomDeduplicator, PartitionedDeduplicator
+from DataNinja.core.downsample import (
+    as_float_array,
+    histogram_counts,
+    minmax_envelope,
+    sample_indices,
+)
+from DataNinja.core.plotter import DataPlotter
+from DataNinja.plugins.geo import Gazetteer, GeocodeCache, GeoProcessor
+from DataNinja.plugins.ml import (
+    MODEL_REGISTRY,
+    FeatureCache,
+    MLModel,
+    ModelCache,
+    predict_chunks,
+)
+from DataNinja.plugins.serving import PredictionServer
 from DataNinja.plugins.sql import SQLProcessor
 from DataNinja.plugins.calculator import CalculatorProcessor # Import Calculator
+from DataNinja.plugins.units import UnitRegistry
 
 app = typer.Typer(
     help="DataNinja: Unified CLI for data manipulation, cleaning, analysis, and visualization."
@@ -72,6 +89,18 @@ def detect_format(filepath):
         return None
 
 
+def first_sqlite_table(filepath):
+    import sqlite3
+
+    with sqlite3.connect(filepath) as conn:
+        tables = pd.read_sql(
+            "SELECT name FROM sqlite_master WHERE type='table'", conn
+        )
+    if tables.empty:
+        raise typer.Exit("No tables found in SQLite DB.")
+    return tables.iloc[0, 0]
+
+
 def load_data(filepath, **kwargs):
     fmt = detect_format(filepath)
     if fmt == "csv":
@@ -82,24 +111,30 @@ def load_data(filepath, **kwargs):
         return ExcelHandler(filepath).load_data(**kwargs)
     elif fmt == "sqlite":
         # For now, load first table
-        handler = SQLiteHandler(filepath)
-        import sqlite3
-
-        with sqlite3.connect(filepath) as conn:
-            tables = pd.read_sql(
-                "SELECT name FROM sqlite_master WHERE type='table'", conn
-            )
-            if not tables.empty:
-                table_name = tables.iloc[0, 0]
-                return handler.load_data(table_name=table_name)
-            else:
-                raise typer.Exit("No tables found in SQLite DB.")
+        return SQLiteHandler(filepath).load_data(table_name=first_sqlite_table(filepath))
     elif fmt == "yaml":
         return YAMLHandler(filepath).load_data(**kwargs)
     else:
         raise typer.Exit(f"Unsupported file format: {filepath}")
 
 
+def iter_data(filepath, chunksize=100_000, **kwargs):
+    """Yield a file as DataFrame chunks; formats without a streaming reader are loaded and sliced."""
+    fmt = detect_format(filepath)
+    if fmt == "csv":
+        yield from CSVHandler(filepath).iter_chunks(chunksize=chunksize, **kwargs)
+    elif fmt == "json":
+        yield from JSONHandler(filepath).iter_chunks(chunksize=chunksize, **kwargs)
+    elif fmt == "sqlite":
+        yield from SQLiteHandler(filepath).iter_chunks(
+            table_name=first_sqlite_table(filepath), chunksize=chunksize, **kwargs
+        )
+    else:
+        df = load_data(filepath, **kwargs)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize]
+
+
 def save_data(df, filepath):
     fmt = detect_format(filepath)
     if fmt == "csv":
@@ -119,6 +154,37 @@ def save_data(df, filepath):
         raise typer.Exit(f"Unsupported file format for saving: {filepath}")
 
 
+def write_chunks(chunks, filepath):
+    """Write DataFrame chunks to a file as they arrive; returns the number of rows written."""
+    fmt = detect_format(filepath)
+    if fmt is None:
+        raise typer.Exit(f"Unsupported file format for saving: {filepath}")
+    if fmt in ("excel", "yaml"):
+        # No append mode for these formats: collect, then save once.
+        pieces = list(chunks)
+        df = pd.concat(pieces) if pieces else pd.DataFrame()
+        save_data(df, filepath)
+        return len(df)
+
+    target_dir = os.path.dirname(filepath)
+    if target_dir:
+        os.makedirs(target_dir, exist_ok=True)
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        if fmt == "csv":
+            chunk.to_csv(filepath, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        elif fmt == "json":
+            chunk.to_json(filepath, orient="records", lines=True, mode="w" if i == 0 else "a")
+        elif fmt == "sqlite":
+            SQLiteHandler(filepath).save_data(
+                chunk, table_name="data", if_exists="replace" if i == 0 else "append"
+            )
+        rows += len(chunk)
+    if not os.path.exists(filepath):
+        open(filepath, "w").close()  # no chunks at all: still produce the file
+    return rows
+
+
 # --- CLI Commands ---
 @app.command()
 def load(
@@ -404,15 +470,95 @@ def dedup(
     keep: str = typer.Option(
         "first", help="Which duplicates to keep: 'first', 'last', or 'none'"
     ),
+    partitions: int = typer.Option(
+        0, help="Spill rows into N on-disk hash partitions (0 = in-memory dedup)"
+    ),
+    jobs: int = typer.Option(1, help="Worker processes for partitioned dedup"),
+    approx: bool = typer.Option(
+        False,
+        help="Single-pass approximate dedup with a Bloom filter (keeps first); "
+        "filter memory grows with the number of distinct rows unless --fixed-memory",
+    ),
+    fp_rate: float = typer.Option(
+        1e-4, help="Target false-positive drop rate for --approx"
+    ),
+    bloom_capacity: int = typer.Option(
+        1_000_000, help="Distinct rows the --approx filter is sized for up front"
+    ),
+    fixed_memory: bool = typer.Option(
+        False, help="Keep the --approx filter at --bloom-capacity; past that, more unique rows are wrongly dropped"
+    ),
+    input_file: Optional[str] = typer.Option(
+        None, "--input", help="Stream this file instead of the session (partitioned mode)"
+    ),
+    output: Optional[str] = typer.Option(
+        None, help="Write result to this file instead of the session (format from the extension)"
+    ),
+    chunksize: int = typer.Option(100_000, help="Rows per chunk when streaming"),
 ):
     """Remove duplicate rows."""
-    df = load_session()
-    if df is None:
-        console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
-        raise typer.Exit()
     subset_cols = [c.strip() for c in subset.split(",")] if subset else None
     keep_val = False if keep == "none" else keep
-    df2 = df.drop_duplicates(subset=subset_cols, keep=keep_val)
+    if approx and keep != "first":
+        console.print("[red]--approx always keeps the first occurrence; use --keep first.")
+        raise typer.Exit()
+    if approx or partitions > 0:
+        if input_file:
+            # Key columns are read as text, so every chunk has the same dtype and
+            # values such as '007' and '7' stay distinct.
+            read_kwargs = {}
+            if detect_format(input_file) == "csv":
+                read_kwargs["dtype"] = {c: str for c in subset_cols} if subset_cols else str
+            chunks = iter_data(input_file, chunksize=chunksize, **read_kwargs)
+        else:
+            df = load_session()
+            if df is None:
+                console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+                raise typer.Exit()
+            chunks = (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+
+    if approx:
+        engine = BloomDeduplicator(
+            subset=subset_cols, fp_rate=fp_rate, initial_capacity=bloom_capacity, fixed_memory=fixed_memory
+        )
+        if output:
+            write_chunks(engine.run(chunks), output)
+        else:
+            pieces = list(engine.run(chunks))
+            df2 = pd.concat(pieces) if pieces else pd.DataFrame()
+        stats = engine.stats()
+        console.print(
+            f"[green]Approximate dedup (subset={subset_cols}, fp_rate={fp_rate}): "
+            f"{stats['rows_in']} -> {stats['rows_out']} rows, "
+            f"estimated false-positive drops: {stats['estimated_false_positive_drops']:.2f}, "
+            f"filter memory: {stats['filter_bytes'] / 2**20:.1f} MiB"
+        )
+        if output:
+            console.print(f"[green]Written to {output}")
+            return
+    elif partitions > 0:
+        with PartitionedDeduplicator(
+            subset=subset_cols, keep=keep_val, n_partitions=partitions, n_jobs=jobs
+        ) as engine:
+            engine.run(chunks)
+            if output:
+                written = write_chunks(engine.iter_chunks(), output)
+                console.print(
+                    f"[green]Removed duplicates (subset={subset_cols}, keep={keep}): "
+                    f"{engine.rows_in} -> {written} rows written to {output}"
+                )
+                return
+            df2 = engine.to_frame()
+    else:
+        df = load_data(input_file) if input_file else load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+        df2 = df.drop_duplicates(subset=subset_cols, keep=keep_val)
+        if output:
+            save_data(df2, output)
+            console.print(f"[green]Removed duplicates (subset={subset_cols}, keep={keep}) -> {output}")
+            return
     save_session(df2)
     console.print(f"[green]Removed duplicates (subset={subset_cols}, keep={keep})")
     head(n=10)
@@ -708,20 +854,29 @@ def map(
     expr: str = typer.Argument(
         ..., help="Python expression, e.g. 'x*2' or 'x.upper()'"
     ),
+    jobs: int = typer.Option(1, help="Worker processes for expressions that must run row by row"),
 ):
-    """Apply a mapping expression to a column."""
+    """Apply a mapping expression to a column (vectorized where possible)."""
+    try:
+        mapping = MapExpression(expr)
+    except ExpressionError as e:
+        console.print(f"[red]Map error: {e}")
+        raise typer.Exit()
     df = load_session()
     if df is None:
         console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
         raise typer.Exit()
-    df2 = df.copy()
+    if column not in df.columns:
+        console.print(f"[red]Column not found: {column}")
+        raise typer.Exit()
     try:
-        df2[column] = df2[column].apply(lambda x: eval(expr, {"x": x}))
+        result = mapping.apply(df[column], n_jobs=jobs)
     except Exception as e:
         console.print(f"[red]Map error: {e}")
         raise typer.Exit()
+    df2 = df.assign(**{column: result})
     save_session(df2)
-    console.print(f"[green]Mapped column {column} with '{expr}'")
+    console.print(f"[green]Mapped column {column} with '{expr}' ({mapping.mode})")
     head(n=10)
 
 
@@ -783,8 +938,16 @@ def plot(
     height: int = typer.Option(20, help="Plot height in characters"),
     show: bool = typer.Option(True, help="Show plot in terminal (default True)"),
     save: Optional[str] = typer.Option(None, help="Save plot to file (txt or png)"),
+    max_points: int = typer.Option(
+        0, help="Scatter points drawn after sampling (0 = 2 per character cell)"
+    ),
 ):
-    """Plot data (histogram, bar, line, scatter) in ASCII in the terminal."""
+    """Plot data (histogram, bar, line, scatter) in ASCII in the terminal.
+
+    Data is reduced with numpy before plotting: histograms are pre-binned, lines
+    become per-column min/max envelopes and scatter plots are sampled, so the
+    cost follows the plot size rather than the row count.
+    """
     df = load_session()
     if df is None:
         console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
@@ -794,7 +957,8 @@ def plot(
     plt.plotsize(width, height)
     if kind == "histogram":
         col = cols[0]
-        plt.hist(df[col].dropna(), bins=bins, label=col)
+        counts, edges = histogram_counts(df[col], bins=bins)
+        plt.bar((edges[:-1] + edges[1:]) / 2, counts, width=1, label=col)
         plt.title(f"Histogram of {col}")
     elif kind == "bar":
         x, y = cols[0], cols[1] if len(cols) > 1 else None
@@ -808,14 +972,29 @@ def plot(
     elif kind == "line":
         x, y = cols[0], cols[1] if len(cols) > 1 else None
         if y:
-            plt.plot(df[x], df[y], label=f"{y} vs {x}")
+            if pd.api.types.is_numeric_dtype(df[x]) and pd.api.types.is_numeric_dtype(df[y]):
+                plt.plot(*minmax_envelope(df[x], df[y], width), label=f"{y} vs {x}")
+            else:
+                plt.plot(df[x], df[y], label=f"{y} vs {x}")
             plt.title(f"Line plot: {y} vs {x}")
+        elif pd.api.types.is_numeric_dtype(df[x]):
+            plt.plot(*minmax_envelope(np.arange(len(df)), df[x], width), label=x)
+            plt.title(f"Line plot: {x}")
         else:
             plt.plot(df[x], label=x)
             plt.title(f"Line plot: {x}")
     elif kind == "scatter":
         x, y = cols[0], cols[1]
-        plt.scatter(df[x], df[y], label=f"{y} vs {x}")
+        if pd.api.types.is_numeric_dtype(df[x]) and pd.api.types.is_numeric_dtype(df[y]):
+            keep = sample_indices(len(df), max_points or 2 * width * height)
+            plt.scatter(
+                as_float_array(df[x].iloc[keep]),
+                as_float_array(df[y].iloc[keep]),
+                label=f"{y} vs {x}",
+            )
+        else:
+            # Categorical axes: plotext places the labels itself.
+            plt.scatter(df[x], df[y], label=f"{y} vs {x}")
         plt.title(f"Scatter plot: {y} vs {x}")
     else:
         console.print(f"[red]Unknown plot kind: {kind}")
@@ -828,6 +1007,39 @@ def plot(
         plt.show()
 
 
+@app.command("plot-export")
+def plot_export(
+    specs: str = typer.Argument(
+        ...,
+        help="JSON file with a list of plot specs: "
+        "[{'plot_type': 'histogram', 'path': 'out/age.png', 'params': {'column': 'age'}}, ...]",
+    ),
+    jobs: int = typer.Option(1, help="Worker processes used for rendering"),
+    input: Optional[str] = typer.Option(
+        None, help="Plot this file instead of the session data"
+    ),
+    dpi: int = typer.Option(100, help="Resolution for raster formats"),
+):
+    """Render many plots headlessly (PNG/SVG/PDF by file extension), optionally in parallel."""
+    import json
+
+    df = load_data(input) if input else load_session()
+    if df is None:
+        console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+        raise typer.Exit()
+    try:
+        with open(specs, "r") as f:
+            spec_list = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        console.print(f"[red]Could not read plot specs from {specs}: {e}")
+        raise typer.Exit()
+    for spec in spec_list:
+        out_dir = os.path.dirname(spec.get("path") or "")
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+    DataPlotter(df).export_plots(spec_list, n_jobs=jobs, dpi=dpi)
+
+
 @app.command()
 def sql(
     query: str = typer.Argument(
@@ -859,22 +1071,86 @@ def sql(
 
 @app.command()
 def ml(
-    action: str = typer.Argument(..., help="Action: train or predict"),
+    action: str = typer.Argument(..., help="Action: train, predict or serve"),
     target: Optional[str] = typer.Option(None, help="Target column for training"),
     model: Optional[str] = typer.Option(None, help="Model file to save/load"),
     features: Optional[str] = typer.Option(
         None, help="Comma-separated feature columns (default: all except target)"
     ),
     input: Optional[str] = typer.Option(
-        None, help="Input file for prediction (if not using session)"
+        None, help="Input file for prediction or --stream training (if not using session)"
+    ),
+    model_type: Optional[str] = typer.Option(
+        None,
+        help=f"Estimator: {', '.join(MODEL_REGISTRY)} "
+        "(default: random_forest for *.rf.pkl models, else logistic_regression)",
+    ),
+    jobs: int = typer.Option(1, help="Worker processes for CV/search folds and the estimator"),
+    cv: int = typer.Option(0, help="Run k-fold cross-validation with this many folds"),
+    search: Optional[str] = typer.Option(
+        None, help="Hyperparameter search: 'grid' or 'random' (uses --param-grid)"
+    ),
+    param_grid: Optional[str] = typer.Option(
+        None, help='JSON parameter grid, e.g. \'{"max_depth": [3, 5, null]}\''
+    ),
+    n_iter: int = typer.Option(10, help="Candidates sampled for --search random"),
+    cache_dir: Optional[str] = typer.Option(
+        ".dataninja_search", help="Directory caching finished search trials"
+    ),
+    scoring: Optional[str] = typer.Option(None, help="sklearn scorer name for CV/search"),
+    stream: bool = typer.Option(
+        False, help="Train out of core on --input with partial_fit (sgd, *_nb, minibatch_kmeans)"
+    ),
+    chunksize: int = typer.Option(100_000, help="Rows read per chunk when streaming"),
+    epochs: int = typer.Option(1, help="Passes over the input when streaming"),
+    buffer_size: int = typer.Option(10_000, help="Shuffle buffer rows when streaming"),
+    batch_size: int = typer.Option(1_000, help="Rows per partial_fit call when streaming"),
+    output: Optional[str] = typer.Option(
+        None, help="Write predictions to this file chunk by chunk instead of the session"
+    ),
+    model_cache: str = typer.Option(
+        ".dataninja_models", help="Directory of cached model copies used by predict/serve (arrays memory-mapped; not tree node tables)"
+    ),
+    host: str = typer.Option("127.0.0.1", help="Address the serve action binds to"),
+    port: int = typer.Option(8765, help="Port the serve action listens on"),
+    socket: Optional[str] = typer.Option(
+        None, help="Serve on this Unix socket path instead of host/port"
+    ),
+    max_batch_size: int = typer.Option(256, help="Most records scored per predict call when serving"),
+    max_latency_ms: float = typer.Option(
+        5.0, help="Longest a request waits for others to join its micro-batch"
     ),
+    feature_cache: Optional[str] = typer.Option(
+        None, help="Cache the feature matrix as a memory-mapped .npy in this directory"
+    ),
+    float32: bool = typer.Option(False, help="Store cached feature matrices as float32"),
 ):
-    """Machine learning: train or predict (LogisticRegression, RandomForest)."""
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.linear_model import LogisticRegression
+    """Machine learning: train, predict or serve with a registry of sklearn estimators."""
+    import json
     import pickle
 
-    if action == "train":
+    if action == "train" and stream:
+        if not input:
+            console.print("[red]Specify --input to stream training data from.")
+            raise typer.Exit()
+        try:
+            wrapper = MLModel(model_type or "sgd", n_jobs=jobs if jobs > 1 else None)
+            wrapper.train_stream(
+                lambda: iter_data(input, chunksize=chunksize),
+                target=target,
+                features=[c.strip() for c in features.split(",")] if features else None,
+                epochs=epochs,
+                buffer_size=buffer_size,
+                batch_size=batch_size,
+            )
+        except ValueError as e:
+            console.print(f"[red]{e}")
+            raise typer.Exit()
+        model_path = model or "dataninja_model.pkl"
+        with open(model_path, "wb") as f:
+            pickle.dump(wrapper.model, f)
+        console.print(f"[green]Model trained out of core and saved to {model_path}")
+    elif action == "train":
         df = load_session()
         if df is None:
             console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
@@ -882,45 +1158,125 @@ def ml(
         if not target:
             console.print("[red]Specify --target for training.")
             raise typer.Exit()
-        X = (
-            df.drop(columns=[target])
-            if not features
-            else df[[c.strip() for c in features.split(",")]]
-        )
-        y = df[target]
-        model_obj = (
-            RandomForestClassifier()
-            if model and model.endswith(".rf.pkl")
-            else LogisticRegression()
-        )
-        model_obj.fit(X, y)
+        feature_cols = [c.strip() for c in features.split(",")] if features else None
+        if feature_cache:
+            try:
+                X, y = FeatureCache(feature_cache, "float32" if float32 else "float64").load(
+                    df, target=target, features=feature_cols
+                )
+            except ValueError as e:
+                console.print(f"[red]Could not build a numeric feature matrix: {e}")
+                raise typer.Exit()
+        else:
+            X = df.drop(columns=[target]) if not feature_cols else df[feature_cols]
+            y = df[target]
+        if not model_type:
+            model_type = (
+                "random_forest"
+                if model and model.endswith(".rf.pkl")
+                else "logistic_regression"
+            )
+        try:
+            wrapper = MLModel(model_type, n_jobs=jobs if jobs > 1 else None)
+        except ValueError as e:
+            console.print(f"[red]{e}")
+            raise typer.Exit()
+        if search:
+            if search not in ("grid", "random") or not param_grid:
+                console.print("[red]--search needs 'grid' or 'random' and a --param-grid.")
+                raise typer.Exit()
+            result = wrapper.search(
+                X,
+                y,
+                json.loads(param_grid),
+                cv=cv or 5,
+                n_iter=n_iter if search == "random" else None,
+                scoring=scoring,
+                n_jobs=jobs,
+                cache_dir=cache_dir,
+            )
+            console.print(
+                f"[green]Best params: {result['best_params']} "
+                f"(mean CV score {result['best_score']:.4f})"
+            )
+        else:
+            if cv:
+                result = wrapper.cross_validate(X, y, cv=cv, scoring=scoring, n_jobs=jobs)
+                console.print(
+                    f"[green]{cv}-fold CV score: {result['mean']:.4f} ± {result['std']:.4f}"
+                )
+            wrapper.train(X, y)
+        model_obj = wrapper.model
         model_path = model or "dataninja_model.pkl"
         with open(model_path, "wb") as f:
             pickle.dump(model_obj, f)
         console.print(f"[green]Model trained and saved to {model_path}")
     elif action == "predict":
         model_path = model or "dataninja_model.pkl"
-        with open(model_path, "rb") as f:
-            model_obj = pickle.load(f)
+        model_obj = ModelCache(model_cache).load(model_path)
+        feature_cols = [c.strip() for c in features.split(",")] if features else None
         if input:
-            df = load_data(input)
+            scored = predict_chunks(model_obj, iter_data(input, chunksize=chunksize), feature_cols)
         else:
             df = load_session()
-        X = df if not features else df[[c.strip() for c in features.split(",")]]
-        preds = model_obj.predict(X)
-        df2 = df.copy()
-        df2["prediction"] = preds
+            if df is None:
+                console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+                raise typer.Exit()
+            if feature_cache:
+                if feature_cols is None and hasattr(model_obj, "feature_names_in_"):
+                    feature_cols = list(model_obj.feature_names_in_)
+                try:
+                    X, _ = FeatureCache(feature_cache, "float32" if float32 else "float64").load(
+                        df, features=feature_cols
+                    )
+                except ValueError as e:
+                    console.print(f"[red]Could not build a numeric feature matrix: {e}")
+                    raise typer.Exit()
+                scored = [df.assign(prediction=model_obj.predict(X))]
+            else:
+                chunks = (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+                scored = predict_chunks(model_obj, chunks, feature_cols)
+        if output:
+            rows = write_chunks(scored, output)
+            console.print(f"[green]Wrote {rows} predictions to {output}")
+            return
+        pieces = list(scored)
+        df2 = pd.concat(pieces) if pieces else pd.DataFrame()
         save_session(df2)
         console.print(f"[green]Predictions added to session DataFrame.")
         head(n=10)
+    elif action == "serve":
+        model_path = model or "dataninja_model.pkl"
+        model_obj = ModelCache(model_cache).load(model_path)
+        try:
+            server = PredictionServer(
+                model_obj,
+                host=host,
+                port=port,
+                unix_socket=socket,
+                max_batch_size=max_batch_size,
+                max_latency_ms=max_latency_ms,
+                features=[c.strip() for c in features.split(",")] if features else None,
+            )
+        except OSError as e:
+            console.print(f"[red]Could not start server: {e}")
+            raise typer.Exit()
+        console.print(
+            f"[green]Serving {model_path} on {server.address} "
+            "(POST /predict, GET /stats, GET /health). Press Ctrl+C to stop."
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            console.print("[yellow]Server stopped.")
     else:
-        console.print("[red]Unknown ML action. Use 'train' or 'predict'.")
+        console.print("[red]Unknown ML action. Use 'train', 'predict' or 'serve'.")
         raise typer.Exit()
 
 
 @app.command()
 def geo(
-    action: str = typer.Argument(..., help="Action: geocode or distance"),
+    action: str = typer.Argument(..., help="Action: geocode, distance, nearest or reverse"),
     address: Optional[str] = typer.Option(
         None, help="Address to geocode (for geocode action)"
     ),
@@ -929,15 +1285,213 @@ def geo(
     lat2: Optional[float] = typer.Option(None, help="Latitude 2 (for distance)"),
     lon2: Optional[float] = typer.Option(None, help="Longitude 2 (for distance)"),
     unit: str = typer.Option("km", help="Unit for distance: km or miles"),
+    lat_col: Optional[str] = typer.Option(
+        None, help="Session latitude column; distance then adds a column to every row"
+    ),
+    lon_col: Optional[str] = typer.Option(None, help="Session longitude column"),
+    to_lat_col: Optional[str] = typer.Option(
+        None, help="Second latitude column (otherwise --lat2/--lon2 is the fixed target)"
+    ),
+    to_lon_col: Optional[str] = typer.Option(None, help="Second longitude column"),
+    column: str = typer.Option("distance", help="Name of the added distance column"),
+    reference: Optional[str] = typer.Option(
+        None, help="Reference file of candidate points (for nearest)"
+    ),
+    ref_lat_col: Optional[str] = typer.Option(
+        None, help="Reference latitude column (default: --lat-col)"
+    ),
+    ref_lon_col: Optional[str] = typer.Option(
+        None, help="Reference longitude column (default: --lon-col)"
+    ),
+    ref_columns: Optional[str] = typer.Option(
+        None, help="Comma-separated reference columns copied onto each matched row"
+    ),
+    k: int = typer.Option(1, help="Number of nearest reference points per row"),
+    index_dir: str = typer.Option(
+        ".dataninja_geo", help="Directory where nearest-neighbour indexes are persisted"
+    ),
+    geocode_column: Optional[str] = typer.Option(
+        None, "--address-column", help="Session address column to geocode in bulk (needs --gazetteer)"
+    ),
+    gazetteer: Optional[str] = typer.Option(
+        None, help="Gazetteer file (csv or sqlite) with address, latitude and longitude columns"
+    ),
+    gazetteer_columns: str = typer.Option(
+        "address,latitude,longitude", help="Gazetteer address, latitude and longitude column names"
+    ),
+    geocode_cache: Optional[str] = typer.Option(
+        ".dataninja_geocode.sqlite", help="Persistent geocode cache file ('' to disable)"
+    ),
+    workers: int = typer.Option(8, help="Threads resolving geocode cache misses"),
+    max_distance: Optional[float] = typer.Option(
+        None, help="Leave rows untagged when the nearest place is farther (for reverse)"
+    ),
 ):
     """Geolocation/geo-cleaning: geocode address or calculate distance."""
     geo = GeoProcessor()
-    if action == "geocode":
+    gazetteer_obj = None
+    if gazetteer:
+        names = [c.strip() for c in gazetteer_columns.split(",")]
+        if len(names) != 3:
+            console.print("[red]--gazetteer-columns needs address,latitude,longitude names.")
+            raise typer.Exit()
+        try:
+            gazetteer_obj = Gazetteer(gazetteer, *names)
+        except (ValueError, KeyError, OSError) as e:
+            console.print(f"[red]Could not load gazetteer: {e}")
+            raise typer.Exit()
+    if action == "geocode" and geocode_column:
+        df = load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+        if gazetteer_obj is None:
+            console.print("[red]Specify --gazetteer to geocode a column.")
+            raise typer.Exit()
+        if geocode_column not in df.columns:
+            console.print(f"[red]Column not found: {geocode_column}")
+            raise typer.Exit()
+        cache = GeocodeCache(geocode_cache) if geocode_cache else None
+        try:
+            result = geo.geocode_batch(
+                df[geocode_column], gazetteer=gazetteer_obj, cache=cache, max_workers=workers
+            )
+        finally:
+            if cache is not None:
+                cache.close()
+        df = df.assign(
+            **{
+                lat_col or "latitude": result["latitude"].to_numpy(),
+                lon_col or "longitude": result["longitude"].to_numpy(),
+            }
+        )
+        save_session(df)
+        found = int(result["latitude"].notna().sum())
+        console.print(f"[green]Geocoded {found} of {len(df)} rows.")
+        head(n=10)
+    elif action == "geocode":
         if not address:
             console.print("[red]Specify --address for geocoding.")
             raise typer.Exit()
-        result = geo.geocode_address(address)
-        console.print(result)
+        result = geo.geocode_address(address, gazetteer=gazetteer_obj)
+        console.print(result if result is not None else f"[yellow]Address not found: {address}")
+    elif action == "reverse":
+        df = load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+        if not (reference and lat_col and lon_col):
+            console.print("[red]Specify --reference (places file), --lat-col and --lon-col for reverse.")
+            raise typer.Exit()
+        missing = [c for c in (lat_col, lon_col) if c not in df.columns]
+        if missing:
+            console.print(f"[red]Column(s) not found: {', '.join(missing)}")
+            raise typer.Exit()
+        names = [c.strip() for c in ref_columns.split(",")] if ref_columns else ["name"]
+        try:
+            places = geo.reverse_geocode_array(
+                pd.to_numeric(df[lat_col], errors="coerce").to_numpy(dtype=np.float64),
+                pd.to_numeric(df[lon_col], errors="coerce").to_numpy(dtype=np.float64),
+                reference,
+                name_col=names[0],
+                lat_col=ref_lat_col or lat_col,
+                lon_col=ref_lon_col or lon_col,
+                columns=names[1:],
+                unit=unit,
+                max_distance=max_distance,
+                cache_dir=index_dir,
+            )
+        except (ValueError, KeyError) as e:
+            console.print(f"[red]{e}")
+            raise typer.Exit()
+        places.index = df.index
+        df = df.assign(**{f"place_{col}": places[col] for col in places.columns})
+        save_session(df)
+        tagged = int(places["distance"].notna().sum())
+        console.print(f"[green]Tagged {tagged} of {len(df)} rows with the nearest place.")
+        head(n=10)
+    elif action == "distance" and (lat_col or lon_col):
+        df = load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+        if to_lat_col or to_lon_col:
+            targets = [to_lat_col, to_lon_col]
+        else:
+            targets = [lat2, lon2]
+        if None in (lat_col, lon_col, *targets):
+            console.print(
+                "[red]Specify --lat-col and --lon-col plus either --to-lat-col/--to-lon-col "
+                "or --lat2/--lon2."
+            )
+            raise typer.Exit()
+        missing = [c for c in (lat_col, lon_col, to_lat_col, to_lon_col) if c and c not in df.columns]
+        if missing:
+            console.print(f"[red]Column(s) not found: {', '.join(missing)}")
+            raise typer.Exit()
+
+        def coords(col):
+            return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+        if to_lat_col:
+            targets = [coords(to_lat_col), coords(to_lon_col)]
+        try:
+            distances = geo.distance_array(coords(lat_col), coords(lon_col), *targets, unit=unit)
+        except ValueError as e:
+            console.print(f"[red]{e}")
+            raise typer.Exit()
+        df = df.assign(**{column: distances})
+        save_session(df)
+        console.print(f"[green]Added '{column}' ({unit}) for {len(df)} rows.")
+        head(n=10)
+    elif action == "nearest":
+        df = load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+        if not (reference and lat_col and lon_col):
+            console.print("[red]Specify --reference, --lat-col and --lon-col for nearest.")
+            raise typer.Exit()
+        ref = load_data(reference)
+        ref_lat_col, ref_lon_col = ref_lat_col or lat_col, ref_lon_col or lon_col
+        extra = [c.strip() for c in ref_columns.split(",")] if ref_columns else []
+        missing = [c for c in (lat_col, lon_col) if c not in df.columns] + [
+            c for c in (ref_lat_col, ref_lon_col, *extra) if c not in ref.columns
+        ]
+        if missing:
+            console.print(f"[red]Column(s) not found: {', '.join(missing)}")
+            raise typer.Exit()
+
+        def coords(frame, col):
+            return pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+
+        try:
+            distances, indices = geo.nearest(
+                coords(df, lat_col),
+                coords(df, lon_col),
+                coords(ref, ref_lat_col),
+                coords(ref, ref_lon_col),
+                k=k,
+                unit=unit,
+                cache_dir=index_dir,
+            )
+        except ValueError as e:
+            console.print(f"[red]{e}")
+            raise typer.Exit()
+        new_columns = {}
+        for j in range(k):
+            prefix = "nearest" if k == 1 else f"nearest_{j + 1}"
+            idx = indices[:, j]
+            hit = idx >= 0  # -1 marks rows without valid coordinates
+            new_columns[f"{prefix}_index"] = pd.Series(idx, index=df.index, dtype="Int64").where(hit)
+            new_columns[f"{prefix}_distance"] = distances[:, j]
+            for col in extra:
+                matched = ref[col].to_numpy()[np.where(hit, idx, 0)]
+                new_columns[f"{prefix}_{col}"] = pd.Series(matched, index=df.index).where(hit)
+        df = df.assign(**new_columns)
+        save_session(df)
+        console.print(f"[green]Matched {len(df)} rows to {len(ref)} reference points (k={k}, {unit}).")
+        head(n=10)
     elif action == "distance":
         if None in (lat1, lon1, lat2, lon2):
             console.print("[red]Specify --lat1, --lon1, --lat2, --lon2 for distance.")
@@ -945,12 +1499,20 @@ def geo(
         dist = geo.calculate_distance(lat1, lon1, lat2, lon2, unit=unit)
         console.print(f"[green]Distance: {dist:.2f} {unit}")
     else:
-        console.print("[red]Unknown geo action. Use 'geocode' or 'distance'.")
+        console.print("[red]Unknown geo action. Use 'geocode', 'distance', 'nearest' or 'reverse'.")
         raise typer.Exit()
 
 # --- Calculator Commands ---
 calculator_processor = CalculatorProcessor()
 
+
+def _calculator(units_file: Optional[str]) -> CalculatorProcessor:
+    """The shared calculator, or one whose registry also has the units from `units_file`."""
+    if not units_file:
+        return calculator_processor
+    return CalculatorProcessor(UnitRegistry.from_file(units_file))
+
+
 @calc_app.command("sin")
 def calc_sin(value: float = typer.Argument(..., help="Input value (in radians)")):
     """Calculates the sine of a value."""
@@ -1004,14 +1566,97 @@ def calc_convert(
     value: float = typer.Argument(..., help="Value to convert"),
     from_unit: str = typer.Argument(..., help="Unit to convert from (e.g., km, kg, C)"),
     to_unit: str = typer.Argument(..., help="Unit to convert to (e.g., m, lb, F)"),
-    category: str = typer.Argument(..., help="Category of conversion (length, weight, temperature)")
+    category: str = typer.Argument(..., help="Category of conversion (length, weight, temperature, speed, ...; see 'calc units')"),
+    units_file: Optional[str] = typer.Option(None, help="JSON/YAML file with extra unit definitions"),
 ):
     """Converts a value between units."""
     try:
-        result = calculator_processor.convert_unit(value, from_unit, to_unit, category)
+        result = _calculator(units_file).convert_unit(value, from_unit, to_unit, category)
         console.print(f"{value} {from_unit} = {result} {to_unit} (category: {category})")
     except Exception as e:
         console.print(f"[red]Error: {e}")
 
+@calc_app.command("convert-column")
+def calc_convert_column(
+    column: str = typer.Argument(..., help="Session column to convert"),
+    from_unit: str = typer.Argument(..., help="Unit to convert from (e.g., km, kg, C)"),
+    to_unit: str = typer.Argument(..., help="Unit to convert to (e.g., m, lb, F)"),
+    category: str = typer.Argument(..., help="Category of conversion (length, weight, temperature, speed, ...; see 'calc units')"),
+    output_col: Optional[str] = typer.Option(None, help="Column for the result (default: overwrite)"),
+    units_file: Optional[str] = typer.Option(None, help="JSON/YAML file with extra unit definitions"),
+):
+    """Converts a whole session column between units in one vectorized pass."""
+    df = load_session()
+    if df is None:
+        console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+        raise typer.Exit()
+    if column not in df.columns:
+        console.print(f"[red]Column not found: {column}")
+        raise typer.Exit()
+    try:
+        values = pd.to_numeric(df[column], errors="coerce")
+        result = _calculator(units_file).convert_unit(values, from_unit, to_unit, category)
+    except Exception as e:
+        console.print(f"[red]Error: {e}")
+        raise typer.Exit()
+    df = df.assign(**{output_col or column: result})
+    save_session(df)
+    console.print(f"[green]Converted '{column}' from {from_unit} to {to_unit} ({len(df)} rows).")
+    head(n=10)
+
+@calc_app.command("units")
+def calc_units(
+    category: Optional[str] = typer.Argument(None, help="Only list units of this category"),
+    units_file: Optional[str] = typer.Option(None, help="JSON/YAML file with extra unit definitions"),
+):
+    """Lists unit categories and their units (SI prefixes such as k, m, µ also apply)."""
+    try:
+        registry = _calculator(units_file).registry
+        categories = [category] if category else registry.categories
+        table = Table(title="Units", box=box.SIMPLE)
+        table.add_column("Category")
+        table.add_column("Reference")
+        table.add_column("Units")
+        for name in categories:
+            table.add_row(name, registry.reference_unit(name), ", ".join(registry.units(name)))
+    except Exception as e:
+        console.print(f"[red]Error: {e}")
+        raise typer.Exit()
+    console.print(table)
+
+@calc_app.command("eval")
+def calc_eval(
+    expression: str = typer.Argument(..., help="Expression, e.g. '(temp_f - 32) * 5 / 9'"),
+    output_col: Optional[str] = typer.Option(
+        None, help="Store the result in this session column"
+    ),
+):
+    """Evaluates an arithmetic expression over session columns (vectorized, numexpr if installed)."""
+    try:
+        expr = Expression(expression)
+    except ExpressionError as e:
+        console.print(f"[red]Error: {e}")
+        raise typer.Exit()
+    df = None
+    if expr.columns or output_col:
+        df = load_session()
+        if df is None:
+            console.print("[red]No data loaded. Use 'dataninja load <file>' first.")
+            raise typer.Exit()
+    try:
+        result = expr.evaluate(df)
+    except (ExpressionError, TypeError, ValueError) as e:
+        console.print(f"[red]Error: {e}")
+        raise typer.Exit()
+    if df is None:
+        console.print(f"{expression} = {result}")
+    elif output_col:
+        df = df.assign(**{output_col: result})
+        save_session(df)
+        console.print(f"[green]Stored '{expression}' in column '{output_col}'.")
+        head(n=10)
+    else:
+        console.print(result.head(10).to_string())
+
 if __name__ == "__main__":
     app()
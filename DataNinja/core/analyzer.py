@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 
 
 class DataAnalyzer:
@@ -242,6 +245,193 @@ class DataAnalyzer:
             print(f"Error calculating value counts for column '{column}': {e}")
             return pd.Series(dtype="object")
 
+    # --- Mergeable partial aggregates ---
+    # A partial state is a plain dict of Python scalars so it can be pickled
+    # across a process pool or shipped between machines and merged later.
+
+    @staticmethod
+    def partial(chunk, columns=None, value_count_columns=None):
+        """
+        Computes a mergeable partial aggregate state for one chunk of data.
+
+        Args:
+            chunk (pd.DataFrame): A slice/shard of the full dataset.
+            columns (list of str, optional): Columns to aggregate. Defaults to all columns.
+            value_count_columns (list of str, optional): Columns to collect value counts for.
+                                                        Defaults to the non-numeric columns.
+
+        Returns:
+            dict: Partial state with row count, Welford moments (count, mean, m2),
+                  min/max per numeric column, null counts and value counts.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Chunk must be a pandas DataFrame.")
+
+        if columns:
+            chunk = chunk[[col for col in columns if col in chunk.columns]]
+
+        numeric = chunk.select_dtypes(include=np.number)
+        counts = numeric.count()
+        means = numeric.mean()
+        m2 = ((numeric - means) ** 2).sum()
+        mins = numeric.min()
+        maxs = numeric.max()
+
+        moments = {}
+        for col in numeric.columns:
+            n = int(counts[col])
+            moments[col] = {
+                "count": n,
+                "mean": float(means[col]) if n else 0.0,
+                "m2": float(m2[col]) if n else 0.0,
+                "min": float(mins[col]) if n else np.nan,
+                "max": float(maxs[col]) if n else np.nan,
+            }
+
+        if value_count_columns is None:
+            value_count_columns = [
+                col for col in chunk.columns if col not in numeric.columns
+            ]
+        value_counts = {
+            col: chunk[col].value_counts().to_dict()
+            for col in value_count_columns
+            if col in chunk.columns
+        }
+
+        return {
+            "rows": int(len(chunk)),
+            "columns": list(chunk.columns),
+            "moments": moments,
+            "nulls": {col: int(n) for col, n in chunk.isnull().sum().items()},
+            "value_counts": value_counts,
+        }
+
+    @staticmethod
+    def merge(a, b):
+        """
+        Combines two partial states into one (Chan et al. parallel variance update).
+
+        Args:
+            a (dict): Partial state from `partial` or a previous `merge`.
+            b (dict): Another partial state.
+
+        Returns:
+            dict: The merged partial state. Inputs are not modified.
+        """
+        columns = list(a["columns"]) + [col for col in b["columns"] if col not in a["columns"]]
+
+        moments = {}
+        for col in set(a["moments"]) | set(b["moments"]):
+            ma, mb = a["moments"].get(col), b["moments"].get(col)
+            if ma is None or (mb is not None and ma["count"] == 0):
+                moments[col] = dict(mb)
+                continue
+            if mb is None or mb["count"] == 0:
+                moments[col] = dict(ma)
+                continue
+            n = ma["count"] + mb["count"]
+            delta = mb["mean"] - ma["mean"]
+            moments[col] = {
+                "count": n,
+                "mean": ma["mean"] + delta * mb["count"] / n,
+                "m2": ma["m2"] + mb["m2"] + delta**2 * ma["count"] * mb["count"] / n,
+                "min": min(ma["min"], mb["min"]),
+                "max": max(ma["max"], mb["max"]),
+            }
+
+        nulls = dict(a["nulls"])
+        for col, n in b["nulls"].items():
+            nulls[col] = nulls.get(col, 0) + n
+
+        value_counts = {col: dict(vc) for col, vc in a["value_counts"].items()}
+        for col, vc in b["value_counts"].items():
+            merged = value_counts.setdefault(col, {})
+            for value, n in vc.items():
+                merged[value] = merged.get(value, 0) + n
+
+        return {
+            "rows": a["rows"] + b["rows"],
+            "columns": columns,
+            "moments": moments,
+            "nulls": nulls,
+            "value_counts": value_counts,
+        }
+
+    @staticmethod
+    def finalize(state):
+        """
+        Turns a (merged) partial state into final results.
+
+        Args:
+            state (dict): Partial state from `partial` or `merge`.
+
+        Returns:
+            dict: {'row_count': int,
+                   'summary_statistics': pd.DataFrame (count, mean, std, min, max per numeric column),
+                   'null_counts': pd.Series,
+                   'value_counts': dict of column -> pd.Series sorted by frequency}
+        """
+        numeric_cols = [col for col in state["columns"] if col in state["moments"]]
+        stats = {}
+        for col in numeric_cols:
+            m = state["moments"][col]
+            n = m["count"]
+            stats[col] = {
+                "count": float(n),
+                "mean": m["mean"] if n else np.nan,
+                "std": np.sqrt(m["m2"] / (n - 1)) if n > 1 else np.nan,
+                "min": m["min"],
+                "max": m["max"],
+            }
+        summary = pd.DataFrame(stats, index=["count", "mean", "std", "min", "max"])
+
+        value_counts = {}
+        for col, vc in state["value_counts"].items():
+            series = pd.Series(vc, dtype="int64" if vc else "object", name="count")
+            value_counts[col] = series.sort_values(ascending=False, kind="stable")
+
+        return {
+            "row_count": state["rows"],
+            "summary_statistics": summary,
+            "null_counts": pd.Series(
+                {col: state["nulls"].get(col, 0) for col in state["columns"]},
+                dtype="int64",
+            ),
+            "value_counts": value_counts,
+        }
+
+    @classmethod
+    def aggregate_chunks(cls, chunks, n_jobs=None, **partial_kwargs):
+        """
+        Computes partial states for an iterable of chunks and merges them.
+
+        Args:
+            chunks (iterable of pd.DataFrame): e.g. pd.read_csv(path, chunksize=...).
+            n_jobs (int, optional): Number of worker processes. None or 1 runs serially.
+                At most 2 * n_jobs chunks are in flight, so chunks are read no
+                faster than the workers process them.
+            **partial_kwargs: Passed through to `partial` (columns, value_count_columns).
+
+        Returns:
+            dict: Finalized results, see `finalize`.
+        """
+        if n_jobs and n_jobs > 1:
+            states = []
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                pending = deque()
+                for chunk in chunks:
+                    if len(pending) >= 2 * n_jobs:
+                        states.append(pending.popleft().result())
+                    pending.append(executor.submit(cls.partial, chunk, **partial_kwargs))
+                states.extend(future.result() for future in pending)
+        else:
+            states = [cls.partial(chunk, **partial_kwargs) for chunk in chunks]
+
+        if not states:
+            print("Warning: No chunks provided for aggregation.")
+            states = [cls.partial(pd.DataFrame())]
+        return cls.finalize(reduce(cls.merge, states))
+
 
 if __name__ == "__main__":
     print("--- DataAnalyzer Demonstration ---")
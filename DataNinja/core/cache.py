@@ -0,0 +1,202 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+from .analyzer import DataAnalyzer
+from .cleaner import DataCleaner
+from .transformer import DataTransformer
+from .utils import ensure_directory_exists, fingerprint_dataframe
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def _run_clean(df, operations):
+    return DataCleaner(df).clean_data(operations)
+
+
+def _run_transform(df, operations):
+    return DataTransformer(df).transform_data(operations)
+
+
+def _run_analyze(df, operations):
+    return DataAnalyzer(df).analyze_data(operations)
+
+
+STAGE_RUNNERS = {
+    "clean": _run_clean,
+    "transform": _run_transform,
+    "analyze": _run_analyze,
+}
+
+
+class StageCache:
+    """
+    Memoizes the outputs of cleaner -> transformer -> analyzer stages on disk.
+
+    Each stage's key is the hash of its parent key (ultimately the input
+    DataFrame fingerprint) plus the stage's operation spec, the same way a build
+    system chains targets. Re-running a pipeline loads the longest cached prefix
+    and only recomputes the stages after it. DataFrames are stored as Parquet
+    when pyarrow is installed (pickle otherwise); the directory is kept under
+    `max_bytes` by evicting the least recently used entries.
+    """
+
+    def __init__(self, cache_dir=".dataninja_cache", max_bytes=1024**3):
+        """
+        Args:
+            cache_dir (str): Directory holding the cached stage outputs.
+            max_bytes (int): Size limit for the cache directory.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.last_run = []
+        ensure_directory_exists(cache_dir)
+
+    @staticmethod
+    def stage_key(parent_key, stage, operations):
+        """Hash of the parent key plus this stage's name and operation spec."""
+        spec = json.dumps(
+            {"parent": parent_key, "stage": stage, "operations": operations},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+    def _entries(self, key="*"):
+        return [
+            path
+            for path in glob.glob(os.path.join(self.cache_dir, f"{key}.*"))
+            if path.endswith((".parquet", ".pkl"))
+        ]
+
+    def __contains__(self, key):
+        return bool(self._entries(key))
+
+    def get(self, key):
+        """
+        Returns the cached value for `key`, or None on a miss. A hit refreshes
+        the entry's position in the LRU order.
+        """
+        entries = self._entries(key)
+        if not entries:
+            return None
+        path = entries[0]
+        try:
+            if path.endswith(".parquet"):
+                value = pd.read_parquet(path)
+            else:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read cache entry '{path}': {e}. Ignoring it.")
+            return None
+        os.utime(path)
+        return value
+
+    def _write(self, path, write):
+        """
+        Writes through a uniquely named temp file in the cache directory and
+        renames it into place, so concurrent runs filling the same entry never
+        share a temp file and readers never see a partial one.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put(self, key, value):
+        """Stores `value` under `key` and evicts old entries if over the size limit."""
+        base = os.path.join(self.cache_dir, key)
+        stored = False
+        if HAS_PYARROW and isinstance(value, pd.DataFrame):
+            try:
+                self._write(base + ".parquet", value.to_parquet)
+                stored = True
+            except Exception:
+                pass  # e.g. non-string column names or mixed-type object columns
+        if not stored:
+            self._write(base + ".pkl", lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self.evict()
+
+    def size(self):
+        """Total bytes currently stored in the cache directory."""
+        return sum(os.path.getsize(path) for path in self._entries())
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in `max_bytes`."""
+        entries = sorted(
+            ((os.path.getmtime(path), os.path.getsize(path), path) for path in self._entries()),
+        )
+        total = sum(size for _, size, _ in entries)
+        # The most recent entry is always kept, even if it alone exceeds the limit.
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        for path in self._entries():
+            os.remove(path)
+
+    def run(self, df, stages, fingerprint=None):
+        """
+        Runs a multi-stage pipeline, reusing cached stage outputs where possible.
+
+        Args:
+            df (pd.DataFrame): The raw input data.
+            stages (list of dict): e.g. [{'stage': 'clean', 'operations': [...]},
+                                         {'stage': 'transform', 'operations': [...]},
+                                         {'stage': 'analyze', 'operations': [...]}]
+                                   'analyze' produces a dict, so it can only be last.
+            fingerprint (str, optional): Precomputed fingerprint of `df`.
+
+        Returns:
+            The output of the last stage (the input DataFrame if `stages` is empty).
+        """
+        for i, spec in enumerate(stages):
+            if spec.get("stage") not in STAGE_RUNNERS:
+                raise ValueError(f"Unknown pipeline stage: {spec.get('stage')}")
+            if spec["stage"] == "analyze" and i != len(stages) - 1:
+                raise ValueError("The 'analyze' stage must be the last stage.")
+
+        keys = []
+        parent = fingerprint or fingerprint_dataframe(df)
+        for spec in stages:
+            parent = self.stage_key(parent, spec["stage"], spec.get("operations"))
+            keys.append(parent)
+
+        # Resume after the longest cached prefix.
+        start, current = 0, df
+        for i in range(len(stages) - 1, -1, -1):
+            if keys[i] in self:
+                cached = self.get(keys[i])
+                if cached is not None:
+                    start, current = i + 1, cached
+                    break
+
+        self.last_run = []
+        for i, spec in enumerate(stages):
+            if i < start:
+                print(f"Stage '{spec['stage']}' unchanged. Using cached output.")
+                self.last_run.append({"stage": spec["stage"], "key": keys[i], "cached": True})
+                continue
+            current = STAGE_RUNNERS[spec["stage"]](current, spec.get("operations"))
+            self.put(keys[i], current)
+            self.last_run.append({"stage": spec["stage"], "key": keys[i], "cached": False})
+        return current
@@ -1,5 +1,24 @@
+import tracemalloc
+from contextlib import nullcontext
+
 import pandas as pd
 
+from .dedup import BloomDeduplicator, PartitionedDeduplicator
+from .linkage import FuzzyMatcher
+
+
+def _copy_on_write():
+    """
+    Returns a context that enables pandas Copy-on-Write.
+
+    CoW is always on from pandas 3.0 and opt-in on 2.x; older versions get a no-op
+    context (whole-column assignment there already replaces rather than writes into data).
+    """
+    major = int(pd.__version__.split(".")[0])
+    if major == 2:
+        return pd.option_context("mode.copy_on_write", True)
+    return nullcontext()
+
 
 class DataCleaner:
     """
@@ -47,7 +66,9 @@ class DataCleaner:
                 "Unsupported data type. Please provide a pandas DataFrame or a list of lists."
             )
 
-    def clean_data(self, operations=None):
+        self.memory_report = []  # Per-operation peak memory from clean_data(track_memory=True)
+
+    def clean_data(self, operations=None, low_memory=False, track_memory=False):
         """
         Applies a series of cleaning operations to the data.
 
@@ -57,6 +78,12 @@ class DataCleaner:
                 Example: [{'method': 'remove_missing_values', 'params': {'threshold': 1}},
                           {'method': 'convert_column_type', 'params': {'column': 'age', 'new_type': int}}]
                 If None, this method might apply a default set of cleaning steps or do nothing.
+            low_memory (bool): If True, skips the defensive full copy of the input and relies on
+                               column-level Copy-on-Write instead, and fuses consecutive operations
+                               (type conversions into one astype, row-wise NA drops into one dropna)
+                               so fewer intermediate frames are allocated.
+            track_memory (bool): If True, records the peak memory allocated by each operation
+                                 in `self.memory_report` and prints it.
 
         Returns:
             The cleaned data (typically a pandas DataFrame).
@@ -67,31 +94,119 @@ class DataCleaner:
             )
             return self.data
 
-        cleaned_df = self.data.copy()
+        self.memory_report = []
+        started_tracing = track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
 
-        if operations:
-            for op in operations:
-                method_name = op.get("method")
-                params = op.get("params", {})
-                if hasattr(self, method_name) and callable(getattr(self, method_name)):
-                    print(f"Applying operation: {method_name} with params: {params}")
-                    cleaned_df = getattr(self, method_name)(cleaned_df, **params)
-                else:
-                    print(
-                        f"Warning: Unknown cleaning method '{method_name}'. Skipping."
-                    )
-        else:
-            # Placeholder for default cleaning if no operations are specified
+        with _copy_on_write() if low_memory else nullcontext():
+            cleaned_df = self.data.copy(deep=not low_memory)
+
+            if operations:
+                if low_memory:
+                    operations = self._fuse_operations(operations)
+                for op in operations:
+                    method_name = op.get("method")
+                    params = op.get("params", {})
+                    if hasattr(self, method_name) and callable(getattr(self, method_name)):
+                        print(f"Applying operation: {method_name} with params: {params}")
+                        if track_memory:
+                            tracemalloc.reset_peak()
+                            before = tracemalloc.get_traced_memory()[0]
+                        cleaned_df = getattr(self, method_name)(cleaned_df, **params)
+                        if track_memory:
+                            current, peak = tracemalloc.get_traced_memory()
+                            self.memory_report.append(
+                                {
+                                    "method": method_name,
+                                    "peak_bytes": peak - before,
+                                    "net_bytes": current - before,
+                                }
+                            )
+                    else:
+                        print(
+                            f"Warning: Unknown cleaning method '{method_name}'. Skipping."
+                        )
+            else:
+                # Placeholder for default cleaning if no operations are specified
+                print(
+                    "No specific cleaning operations provided. Applying default steps (if any)."
+                )
+                # Example: cleaned_df = self.remove_missing_values(cleaned_df)
+                # cleaned_df = self.remove_duplicates(cleaned_df)
+                pass
+
+        if started_tracing:
+            tracemalloc.stop()
+        for entry in self.memory_report:
             print(
-                "No specific cleaning operations provided. Applying default steps (if any)."
+                f"Memory: {entry['method']} peak {entry['peak_bytes'] / 1024**2:.2f} MiB, "
+                f"net {entry['net_bytes'] / 1024**2:.2f} MiB"
             )
-            # Example: cleaned_df = self.remove_missing_values(cleaned_df)
-            # cleaned_df = self.remove_duplicates(cleaned_df)
-            pass
 
         self.data = cleaned_df  # Update internal data
         return self.data
 
+    @staticmethod
+    def _fuse_operations(operations):
+        """
+        Merges runs of consecutive operations that can be executed as one pandas call.
+
+        - convert_column_type on distinct columns (no extra kwargs) -> convert_column_types
+        - remove_missing_values with strategy 'drop_rows' and no threshold -> one dropna
+          over the union of the subsets (a row with an NA in any subset is dropped either way)
+
+        Returns:
+            list of dict: The (possibly shorter) list of operations.
+        """
+        fused = []
+        for op in operations:
+            method_name = op.get("method")
+            params = dict(op.get("params", {}))
+            prev = fused[-1] if fused else None
+
+            if method_name == "convert_column_type" and set(params) == {"column", "new_type"}:
+                if (
+                    prev
+                    and prev["method"] == "convert_column_types"
+                    and params["column"] not in prev["params"]["mapping"]
+                ):
+                    prev["params"]["mapping"][params["column"]] = params["new_type"]
+                else:
+                    fused.append(
+                        {
+                            "method": "convert_column_types",
+                            "params": {"mapping": {params["column"]: params["new_type"]}},
+                        }
+                    )
+                continue
+
+            if (
+                method_name == "remove_missing_values"
+                and params.get("strategy", "drop_rows") == "drop_rows"
+                and params.get("threshold") is None
+            ):
+                subset = params.get("subset")
+                if (
+                    prev
+                    and prev["method"] == "remove_missing_values"
+                    and prev["params"].get("strategy", "drop_rows") == "drop_rows"
+                    and prev["params"].get("threshold") is None
+                ):
+                    prev_subset = prev["params"].get("subset")
+                    if prev_subset is None or subset is None:
+                        prev["params"]["subset"] = None
+                    else:
+                        prev["params"]["subset"] = list(prev_subset) + [
+                            col for col in subset if col not in prev_subset
+                        ]
+                    continue
+                fused.append({"method": method_name, "params": params})
+                continue
+
+            fused.append({"method": method_name, "params": params})
+        return fused
+
     def remove_missing_values(
         self, df, threshold=None, subset=None, strategy="drop_rows"
     ):
@@ -157,7 +272,43 @@ class DataCleaner:
             print(f"Error converting column '{column}' to {new_type}: {e}")
         return df
 
-    def remove_duplicates(self, df, subset=None, keep="first"):
+    def convert_column_types(self, df, mapping):
+        """
+        Converts several columns in a single astype call.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to modify.
+            mapping (dict): Column name -> target data type.
+
+        Returns:
+            pd.DataFrame: DataFrame with the column types converted. If the combined
+                          conversion fails, columns are converted one by one so that
+                          a single bad column does not block the others.
+        """
+        if not isinstance(df, pd.DataFrame):
+            print("Data is not a DataFrame. Cannot convert column types.")
+            return df
+
+        present = {col: typ for col, typ in mapping.items() if col in df.columns}
+        for col in mapping:
+            if col not in present:
+                print(
+                    f"Warning: Column '{col}' not found in DataFrame. Skipping type conversion."
+                )
+        if not present:
+            return df
+
+        print(f"Converting columns {present}...")
+        try:
+            return df.astype(present)
+        except Exception:
+            for col, typ in present.items():
+                df = self.convert_column_type(df, col, typ)
+            return df
+
+    def remove_duplicates(
+        self, df, subset=None, keep="first", strategy="memory", chunksize=100_000, **kwargs
+    ):
         """
         Removes duplicate rows from the DataFrame.
 
@@ -168,6 +319,14 @@ class DataCleaner:
                 - first : Drop duplicates except for the first occurrence.
                 - last : Drop duplicates except for the last occurrence.
                 - False : Drop all duplicates.
+            strategy (str): 'memory' uses DataFrame.drop_duplicates,
+                            'partitioned' spills hash partitions to disk and deduplicates
+                            them independently (see core.dedup.PartitionedDeduplicator),
+                            'approx' keeps first occurrences in a single pass against a
+                            Bloom filter (see core.dedup.BloomDeduplicator); unique rows may
+                            be dropped with probability ~fp_rate, duplicates are never kept.
+            chunksize (int): Rows per chunk fed to the partitioned engine.
+            **kwargs: Passed to the engine (e.g. n_partitions, n_jobs, spill_dir, fp_rate).
         Returns:
             pd.DataFrame: DataFrame with duplicate rows removed.
         """
@@ -175,8 +334,76 @@ class DataCleaner:
             print("Data is not a DataFrame. Cannot remove duplicates.")
             return df
 
-        print(f"Removing duplicates (subset: {subset}, keep: {keep})...")
-        return df.drop_duplicates(subset=subset, keep=keep)
+        print(f"Removing duplicates (subset: {subset}, keep: {keep}, strategy: {strategy})...")
+        if isinstance(subset, str):
+            subset = [subset]
+        if strategy == "memory":
+            return df.drop_duplicates(subset=subset, keep=keep)
+        elif strategy == "partitioned":
+            chunks = (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+            with PartitionedDeduplicator(subset=subset, keep=keep, **kwargs) as engine:
+                result = engine.run(chunks).to_frame()
+            return result if not result.empty else df.iloc[0:0]
+        elif strategy == "approx":
+            if keep != "first":
+                print("Warning: Approximate dedup only supports keep='first'.")
+            engine = BloomDeduplicator(subset=subset, **kwargs)
+            chunks = (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+            result = pd.concat(list(engine.run(chunks))) if len(df) else df
+            print(
+                f"Approximate dedup dropped {len(df) - len(result)} rows "
+                f"(estimated false-positive drops: {engine.estimated_false_positive_drops:.2f})"
+            )
+            return result
+        else:
+            print(f"Warning: Unknown strategy '{strategy}' for duplicate removal.")
+            return df
+
+    def assign_fuzzy_clusters(
+        self, df, columns, threshold=0.8, cluster_column="cluster_id", **kwargs
+    ):
+        """
+        Labels near-duplicate rows (e.g. misspelled names/addresses) with a shared cluster ID.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to label.
+            columns (list of str): Columns compared (joined into one normalized key).
+            threshold (float): Minimum estimated Jaccard similarity of character shingles.
+            cluster_column (str): Name of the added cluster ID column.
+            **kwargs: Passed to core.linkage.FuzzyMatcher (method, window, n_jobs, ...).
+
+        Returns:
+            pd.DataFrame: DataFrame with the cluster ID column added. Follow with
+                          remove_duplicates(subset=[cluster_column]) to collapse clusters.
+        """
+        if not isinstance(df, pd.DataFrame):
+            print("Data is not a DataFrame. Cannot assign fuzzy clusters.")
+            return df
+
+        print(f"Assigning fuzzy clusters (columns: {columns}, threshold: {threshold})...")
+        try:
+            labels = FuzzyMatcher(columns, threshold=threshold, **kwargs).cluster(df)
+        except KeyError as e:
+            print(f"Warning: {e.args[0]}. Skipping fuzzy clustering.")
+            return df
+        return df.assign(**{cluster_column: labels})
+
+    def remove_fuzzy_duplicates(self, df, columns, threshold=0.8, keep="first", **kwargs):
+        """
+        Collapses each fuzzy cluster (see assign_fuzzy_clusters) to a single row.
+
+        Returns:
+            pd.DataFrame: DataFrame with near-duplicate rows removed.
+        """
+        if not isinstance(df, pd.DataFrame):
+            print("Data is not a DataFrame. Cannot remove fuzzy duplicates.")
+            return df
+
+        column = "__dataninja_cluster__"
+        labelled = self.assign_fuzzy_clusters(df, columns, threshold, cluster_column=column, **kwargs)
+        if column not in labelled.columns:
+            return df
+        return labelled.drop_duplicates(subset=[column], keep=keep).drop(columns=column)
 
     def get_cleaned_data(self):
         """
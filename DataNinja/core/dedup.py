@@ -0,0 +1,383 @@
+import math
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SEQ_COLUMN = "__dataninja_seq__"
+
+
+_MISSING = "\0<NA>"
+
+
+def _canonical_numbers(numbers):
+    """Integral values as int strings ('1' for 1 and 1.0), the rest as float repr."""
+    if pd.api.types.is_integer_dtype(numbers.dtype):
+        return numbers.astype(str)
+    floats = numbers.astype("float64")
+    integral = np.isfinite(floats) & (floats == np.round(floats)) & (floats.abs() < 2.0 ** 63)
+    return floats.astype(str).mask(integral, floats.where(integral, 0).astype("int64").astype(str))
+
+
+def _normalize_keys(keys):
+    """
+    Key columns in a form that compares equal across chunk dtypes. A numeric
+    CSV column can be int64 in one chunk and float64 in the next (a missing
+    value), so numbers become canonical strings ('1' for both 1 and 1.0).
+    Text is never reinterpreted: '007', '7' and '1e3' stay distinct. Missing
+    values share one marker.
+    """
+    columns = {}
+    for name, col in keys.items():
+        if pd.api.types.is_numeric_dtype(col.dtype) and not pd.api.types.is_bool_dtype(col.dtype):
+            values = _canonical_numbers(col)
+        else:
+            values = col
+        columns[name] = values.astype(object).where(col.notna(), _MISSING)
+    return pd.DataFrame(columns, index=keys.index)
+
+
+def _row_hashes(chunk, subset=None):
+    """Returns a uint64 hash per row over the normalized subset columns (all columns if None)."""
+    keys = chunk[list(subset)] if subset else chunk
+    return pd.util.hash_pandas_object(_normalize_keys(keys), index=False).to_numpy()
+
+
+def _dedup_partition(paths, out_prefix, subset, keep, bucket_rows):
+    """
+    Deduplicates one spilled partition and writes the result next to `out_prefix`.
+
+    Runs in a worker process, so only file paths cross the process boundary.
+    Rows are ordered by their global sequence number first, which makes
+    keep='first'/'last' refer to the original input order. Survivors are
+    written in buckets of `bucket_rows` consecutive sequence numbers, so the
+    output can later be assembled in input order one bucket at a time.
+
+    Returns:
+        dict: bucket number -> result file.
+    """
+    pieces = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pieces.append(pickle.load(f))
+    part = pd.concat(pieces) if pieces else pd.DataFrame()
+    if part.empty:
+        return {}
+    # Keys are normalized per spilled chunk, before concat mixes their dtypes.
+    keys = pd.concat([_normalize_keys(piece[subset]) for piece in pieces])
+    order = np.argsort(part[SEQ_COLUMN].to_numpy(), kind="stable")
+    part = part.iloc[order][~keys.iloc[order].duplicated(keep=keep).to_numpy()]
+    buckets = part[SEQ_COLUMN].to_numpy() // bucket_rows
+    results = {}
+    for bucket in np.unique(buckets):
+        out_path = f"{out_prefix}-{bucket:06d}.pkl"
+        with open(out_path, "wb") as f:
+            pickle.dump(part[buckets == bucket], f, protocol=pickle.HIGHEST_PROTOCOL)
+        results[int(bucket)] = out_path
+    return results
+
+
+class PartitionedDeduplicator:
+    """
+    Exact, out-of-core duplicate removal.
+
+    Rows are streamed in chunks, hashed on the subset columns and spilled to
+    one of `n_partitions` files on disk. Duplicates always hash to the same
+    partition, so each partition can then be deduplicated independently (and
+    in parallel). Memory use is bounded by the largest chunk / partition rather
+    than by the full input.
+
+    Key values are compared in a normalized form (see `_normalize_keys`), so
+    duplicates are found even when chunks were read with different dtypes.
+    """
+
+    def __init__(self, subset=None, keep="first", n_partitions=16, n_jobs=None, spill_dir=None):
+        """
+        Args:
+            subset (list of str, optional): Columns identifying duplicates. Defaults to all columns.
+            keep ({'first', 'last', False}): Same semantics as DataFrame.drop_duplicates.
+            n_partitions (int): Number of on-disk hash partitions.
+            n_jobs (int, optional): Worker processes for the per-partition pass. None or 1 runs serially.
+            spill_dir (str, optional): Parent directory for spill files. Defaults to the system temp dir.
+        """
+        if keep not in ("first", "last", False):
+            raise ValueError("keep must be 'first', 'last' or False")
+        if n_partitions < 1:
+            raise ValueError("n_partitions must be at least 1")
+
+        self.subset = list(subset) if subset else None
+        self.keep = keep
+        self.n_partitions = n_partitions
+        self.n_jobs = n_jobs
+        self.work_dir = tempfile.mkdtemp(prefix="dataninja_dedup_", dir=spill_dir)
+        self._spills = [[] for _ in range(n_partitions)]
+        self._results = None
+        self._n_chunks = 0
+        self._bucket_rows = 1
+        self.rows_in = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def add_chunk(self, chunk):
+        """Hashes a chunk and spills its rows into the partition files."""
+        if self._results is not None:
+            raise RuntimeError("Cannot add chunks after deduplication has run")
+        if chunk.empty:
+            return
+
+        chunk = chunk.assign(**{SEQ_COLUMN: np.arange(self.rows_in, self.rows_in + len(chunk))})
+        self.rows_in += len(chunk)
+        self._bucket_rows = max(self._bucket_rows, len(chunk))
+        part_ids = _row_hashes(chunk, self.subset or [c for c in chunk.columns if c != SEQ_COLUMN])
+        part_ids = part_ids % np.uint64(self.n_partitions)
+
+        for part_id in np.unique(part_ids):
+            path = os.path.join(self.work_dir, f"part-{part_id:04d}-{self._n_chunks:06d}.pkl")
+            with open(path, "wb") as f:
+                pickle.dump(chunk[part_ids == part_id], f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spills[part_id].append(path)
+        self._n_chunks += 1
+
+    def run(self, chunks):
+        """Spills every chunk of an iterable and deduplicates all partitions."""
+        for chunk in chunks:
+            self.add_chunk(chunk)
+        self._deduplicate()
+        return self
+
+    def _deduplicate(self):
+        if self._results is not None:
+            return
+        subset = self.subset
+        jobs = [
+            (paths, os.path.join(self.work_dir, f"result-{i:04d}"))
+            for i, paths in enumerate(self._spills)
+            if paths
+        ]
+        if subset is None and jobs:
+            # Only known once data has been seen; excludes the sequence column.
+            with open(jobs[0][0][0], "rb") as f:
+                subset = [c for c in pickle.load(f).columns if c != SEQ_COLUMN]
+
+        if self.n_jobs and self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = [
+                    executor.submit(_dedup_partition, paths, out, subset, self.keep, self._bucket_rows)
+                    for paths, out in jobs
+                ]
+                self._results = [future.result() for future in futures]
+        else:
+            self._results = [
+                _dedup_partition(paths, out, subset, self.keep, self._bucket_rows)
+                for paths, out in jobs
+            ]
+
+        for paths in self._spills:
+            for path in paths:
+                os.remove(path)
+        self._spills = [[] for _ in range(self.n_partitions)]
+
+    def iter_chunks(self):
+        """
+        Yields the deduplicated rows in original input order, without the
+        sequence column. Each chunk covers one bucket of sequence numbers (about
+        the size of the largest input chunk), so memory stays bounded.
+        """
+        self._deduplicate()
+        for bucket in sorted(set().union(*self._results)):
+            pieces = []
+            for results in self._results:
+                if bucket in results:
+                    with open(results[bucket], "rb") as f:
+                        pieces.append(pickle.load(f))
+            yield pd.concat(pieces).sort_values(SEQ_COLUMN, kind="stable").drop(columns=SEQ_COLUMN)
+
+    def to_frame(self):
+        """Returns all surviving rows as one DataFrame in original input order."""
+        pieces = list(self.iter_chunks())
+        return pd.concat(pieces) if pieces else pd.DataFrame()
+
+    def cleanup(self):
+        """Removes all spill and result files."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+def _mix64(values):
+    """SplitMix64 finaliser; derives a second independent hash from the first."""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _popcount(bits):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum())
+    return int(np.unpackbits(bits).sum())
+
+
+class _BloomSlice:
+    """A fixed-capacity Bloom filter over pre-computed 64-bit hashes."""
+
+    def __init__(self, capacity, fp_rate):
+        self.capacity = int(capacity)
+        self.target = fp_rate
+        self.n_bits = max(8, int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, h1, h2):
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.n_bits)
+
+    def contains(self, h1, h2):
+        pos = self._positions(h1, h2)
+        hit = self.bits[pos >> np.uint64(3)] & (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8))
+        return (hit != 0).all(axis=1)
+
+    def add(self, h1, h2):
+        pos = self._positions(h1, h2).ravel()
+        np.bitwise_or.at(
+            self.bits, pos >> np.uint64(3), np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)
+        )
+        self.count += len(h1)
+
+    def fp_rate(self):
+        return (_popcount(self.bits) / self.n_bits) ** self.n_hashes
+
+
+class ScalableBloomFilter:
+    """
+    Scalable Bloom filter (Almeida et al.) over 64-bit row hashes.
+
+    Starts with one slice of `initial_capacity`; when a slice is full a new one
+    with `growth` times the capacity and a `tightening`-times-smaller error rate
+    is added, so the compound false-positive rate stays below `fp_rate` while
+    memory grows with the number of distinct hashes.
+
+    With `fixed=True` there is a single slice and memory never grows; past
+    `initial_capacity` hashes the false-positive rate rises above `fp_rate`
+    instead (see `estimated_fp_rate`).
+    """
+
+    def __init__(self, fp_rate=1e-4, initial_capacity=1_000_000, growth=2, tightening=0.5, fixed=False):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.growth = growth
+        self.tightening = tightening
+        self.fixed = fixed
+        self.slices = [_BloomSlice(initial_capacity, fp_rate if fixed else fp_rate * (1 - tightening))]
+
+    def __contains__(self, hashes):
+        return bool(self.contains(np.atleast_1d(np.asarray(hashes, dtype=np.uint64)))[0])
+
+    def contains(self, hashes):
+        """Vectorized membership test; returns a bool array (no false negatives)."""
+        h2 = _mix64(hashes)
+        found = np.zeros(len(hashes), dtype=bool)
+        for bloom in self.slices:
+            found |= bloom.contains(hashes, h2)
+        return found
+
+    def add(self, hashes):
+        """Adds hashes, opening a new slice whenever the current one reaches capacity."""
+        h2 = _mix64(hashes)
+        if self.fixed:
+            self.slices[0].add(hashes, h2)
+            return
+        start = 0
+        while start < len(hashes):
+            bloom = self.slices[-1]
+            room = bloom.capacity - bloom.count
+            if room <= 0:
+                self.slices.append(
+                    _BloomSlice(bloom.capacity * self.growth, bloom.target * self.tightening)
+                )
+                continue
+            end = start + room
+            bloom.add(hashes[start:end], h2[start:end])
+            start = end
+
+    def estimated_fp_rate(self):
+        """Current compound false-positive probability from the slices' fill ratios."""
+        p_miss = 1.0
+        for bloom in self.slices:
+            p_miss *= 1 - bloom.fp_rate()
+        return 1 - p_miss
+
+    @property
+    def nbytes(self):
+        return sum(bloom.bits.nbytes for bloom in self.slices)
+
+
+class BloomDeduplicator:
+    """
+    Approximate single-pass streaming dedup (keep='first').
+
+    Each row is looked up in a ScalableBloomFilter of its subset hash; rows already
+    "seen" are dropped. A false positive drops a unique row, never keeps a duplicate.
+    Memory is a few bytes per distinct row and grows as the filter adds slices;
+    with `fixed_memory=True` it stays at the size for `initial_capacity` rows and
+    the false-positive rate rises once more distinct rows than that are seen.
+    """
+
+    def __init__(self, subset=None, fp_rate=1e-4, initial_capacity=1_000_000, fixed_memory=False):
+        """
+        Args:
+            subset (list of str, optional): Columns identifying duplicates. Defaults to all columns.
+            fp_rate (float): Target false-positive (wrong drop) probability.
+            initial_capacity (int): Expected number of distinct rows for the first filter slice.
+            fixed_memory (bool): Never grow the filter beyond `initial_capacity`.
+        """
+        self.subset = list(subset) if subset else None
+        self.bloom = ScalableBloomFilter(
+            fp_rate=fp_rate, initial_capacity=initial_capacity, fixed=fixed_memory
+        )
+        self.rows_in = 0
+        self.rows_out = 0
+        self.estimated_false_positive_drops = 0.0
+
+    def filter_chunk(self, chunk):
+        """Returns the rows of `chunk` not seen before (in this chunk or earlier ones)."""
+        if chunk.empty:
+            return chunk
+        hashes = _row_hashes(chunk, self.subset)
+        first_in_chunk = ~pd.Series(hashes).duplicated().to_numpy()
+        candidates = hashes[first_in_chunk]
+
+        p = self.bloom.estimated_fp_rate()
+        seen = self.bloom.contains(candidates)
+        new_hashes = candidates[~seen]
+        # Observed new rows are the truly new ones that did not hit a false positive,
+        # so the expected number of wrongly dropped rows is new * p / (1 - p).
+        self.estimated_false_positive_drops += len(new_hashes) * p / (1 - p)
+        self.bloom.add(new_hashes)
+
+        keep = first_in_chunk.copy()
+        keep[first_in_chunk] = ~seen
+        self.rows_in += len(chunk)
+        self.rows_out += int(keep.sum())
+        return chunk[keep]
+
+    def run(self, chunks):
+        """Yields the filtered version of each chunk in an iterable."""
+        for chunk in chunks:
+            yield self.filter_chunk(chunk)
+
+    def stats(self):
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "dropped": self.rows_in - self.rows_out,
+            "estimated_false_positive_drops": self.estimated_false_positive_drops,
+            "filter_bytes": self.bloom.nbytes,
+        }
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+
+def as_float_array(values):
+    """
+    Converts numeric, boolean or datetime-like values to a float64 numpy array
+    (datetimes become nanoseconds since the epoch).
+    """
+    series = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.astype("int64").to_numpy(dtype=np.float64)
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def histogram_range(values):
+    """Finite (min, max) of `values`, widened slightly when all values are equal."""
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return 0.0, 1.0
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return low, high
+
+
+def histogram_counts(values, bins=10, range=None):
+    """
+    Pre-bins values with numpy so only `bins` rectangles reach the plotting layer.
+
+    Args:
+        values (array-like): Values to bin. Non-finite values are ignored.
+        bins (int or array-like): Number of bins or explicit bin edges.
+        range (tuple, optional): (min, max) of the bins. Defaults to the data range.
+
+    Returns:
+        tuple: (counts, edges) as numpy arrays.
+    """
+    values = as_float_array(values)
+    values = values[np.isfinite(values)]
+    if np.ndim(bins) == 0 and range is None:
+        range = histogram_range(values)
+    return np.histogram(values, bins=bins, range=range)
+
+
+def histogram_chunks(chunks, column, bins=10, range=None):
+    """
+    Streams a histogram over an iterable of DataFrames (or Series).
+
+    The bin edges must be fixed before the first chunk is seen, so either
+    `range` or explicit edges in `bins` are required.
+
+    Returns:
+        tuple: (counts, edges) summed over all chunks.
+    """
+    if np.ndim(bins) == 0:
+        if range is None:
+            raise ValueError("Streaming histograms need a 'range' or explicit bin edges.")
+        edges = np.linspace(range[0], range[1], int(bins) + 1)
+    else:
+        edges = np.asarray(bins, dtype=np.float64)
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for chunk in chunks:
+        values = chunk[column] if isinstance(chunk, pd.DataFrame) else chunk
+        counts += histogram_counts(values, bins=edges)[0]
+    return counts, edges
+
+
+def bin_2d(x, y, gridsize=100):
+    """
+    Counts points on a regular `gridsize` x `gridsize` grid.
+
+    Returns:
+        tuple: (counts, x_edges, y_edges); counts has shape (gridsize, gridsize)
+               indexed [x_bin, y_bin].
+    """
+    x, y = as_float_array(x), as_float_array(y)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    return np.histogram2d(
+        x, y, bins=gridsize, range=[histogram_range(x), histogram_range(y)]
+    )
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of the `n_out - 2` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. This preserves
+    peaks and troughs that plain striding would drop.
+
+    Args:
+        x (np.ndarray): Sorted x values (float).
+        y (np.ndarray): y values (float), no NaNs.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Indices of the kept points, in increasing order.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_envelope(x, y, n_buckets):
+    """
+    Reduces a line to per-bucket (min, max) pairs over equal-width x buckets,
+    i.e. what a display `n_buckets` pixels wide can show anyway.
+
+    Args:
+        x (array-like): x values (numeric or datetime).
+        y (array-like): y values.
+        n_buckets (int): Number of x buckets (e.g. the plot width in characters).
+
+    Returns:
+        tuple: (x_out, y_out) with two points per non-empty bucket, the min and the
+               max, both at the bucket centre, ordered by x.
+    """
+    x, y = as_float_array(x), as_float_array(y)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) <= 2 * n_buckets:
+        order = np.argsort(x, kind="stable")
+        return x[order], y[order]
+
+    low, high = histogram_range(x)
+    ids = ((x - low) / (high - low) * n_buckets).astype(np.int64).clip(0, n_buckets - 1)
+    y_min = np.full(n_buckets, np.inf)
+    y_max = np.full(n_buckets, -np.inf)
+    np.minimum.at(y_min, ids, y)
+    np.maximum.at(y_max, ids, y)
+
+    filled = np.isfinite(y_min)
+    centers = low + (np.arange(n_buckets) + 0.5) * (high - low) / n_buckets
+    return (
+        np.repeat(centers[filled], 2),
+        np.column_stack([y_min[filled], y_max[filled]]).ravel(),
+    )
+
+
+def sample_indices(n, max_points, seed=0):
+    """Sorted indices of a uniform sample of at most `max_points` out of `n` rows."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, size=max_points, replace=False))
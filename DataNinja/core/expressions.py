@@ -0,0 +1,749 @@
+import ast
+import copy
+import operator
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr
+
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+
+# Functions an expression may call, by the name used in the expression.
+FUNCTIONS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan, "arctan2": np.arctan2,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "expm1": np.expm1,
+    "log": np.log, "log10": np.log10, "log2": np.log2, "log1p": np.log1p,
+    "sqrt": np.sqrt, "abs": np.abs, "floor": np.floor, "ceil": np.ceil, "round": np.round,
+    "minimum": np.minimum, "maximum": np.maximum, "clip": np.clip, "where": np.where,
+    "isnan": np.isnan,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e, "nan": np.nan, "inf": np.inf}
+
+# Subset numexpr understands (aliases are rewritten to these names first).
+NUMEXPR_FUNCTIONS = {
+    "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+    "exp", "expm1", "log", "log10", "log1p", "sqrt", "abs", "where",
+}
+ALIASES = {"asin": "arcsin", "acos": "arccos", "atan": "arctan", "atan2": "arctan2"}
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.BitAnd, ast.BitOr)
+_UNARY_OPS = (ast.UAdd, ast.USub, ast.Invert, ast.Not)
+_CMP_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are invalid or use anything outside the whitelist."""
+
+
+class _Vectorize(ast.NodeTransformer):
+    """
+    Rewrites Python's scalar-only constructs into their elementwise forms:
+    `and`/`or`/`not` -> `&`/`|`/`~`, chained comparisons -> `&` of pairs,
+    `a if c else b` -> `where(c, a, b)`, and function aliases -> canonical names.
+    """
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        left, parts = node.left, []
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return ast.Call(
+            func=ast.Name(id="where", ctx=ast.Load()),
+            args=[node.test, node.body, node.orelse],
+            keywords=[],
+        )
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name) and node.func.id in ALIASES:
+            node.func = ast.Name(id=ALIASES[node.func.id], ctx=ast.Load())
+        return node
+
+
+class _FixedWidthInts(ast.NodeTransformer):
+    """
+    Wraps integer constants in numpy int64 (float64 as an exponent) so that
+    constant-only subexpressions such as 9**9**9 cannot turn into unbounded
+    Python integer arithmetic.
+    """
+
+    def visit_BinOp(self, node):
+        if isinstance(node.op, ast.Pow) and _is_constant_only(node.right):
+            # Float exponents also keep `x ** -1` valid for integer columns.
+            # Visit the exponent too: nested powers like 9**9**9 are constant-only all the way down.
+            node.left = self.visit(node.left)
+            node.right = _call("__float64", self.visit(node.right))
+            return node
+        return self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, int) and not isinstance(node.value, bool):
+            return _call("__int64", node)
+        return node
+
+
+class _FloatExponents(ast.NodeTransformer):
+    """numexpr counterpart of _FixedWidthInts: constant-only exponents become float literals."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow) and _is_constant_only(node.right):
+            for child in ast.walk(node.right):
+                if isinstance(child, ast.Constant):
+                    child.value = float(child.value)
+        return node
+
+
+def _is_constant_only(node) -> bool:
+    return all(not isinstance(child, (ast.Name, ast.Call)) for child in ast.walk(node))
+
+
+def _call(name, arg):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[arg], keywords=[])
+
+
+_EVAL_GLOBALS = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS, "__int64": np.int64, "__float64": np.float64}
+
+
+class Expression:
+    """
+    An arithmetic expression over named columns, validated and compiled once and
+    then evaluated on whole arrays.
+
+    Only numbers, column names, the operators + - * / // % ** & | ~, comparisons,
+    and/or/not, `a if cond else b` and the functions in FUNCTIONS are allowed;
+    there is no attribute access, subscripting or builtins, so untrusted input
+    cannot run arbitrary code. Column names that are not identifiers can be
+    written in backticks (`unit price` * qty). Evaluation uses numexpr when it
+    is installed and the expression only needs functions numexpr supports
+    (multi-threaded, no full-size temporaries); otherwise numpy ufuncs.
+    """
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Expression text, e.g. "(temp_f - 32) * 5 / 9".
+
+        Raises:
+            ExpressionError: If the expression cannot be parsed or is not allowed.
+        """
+        if not isinstance(source, str) or not source.strip():
+            raise ExpressionError("Expression must be a non-empty string")
+        self.source = source
+
+        # Backtick-quoted column names become placeholder identifiers.
+        self._quoted = {}
+
+        def quote(match):
+            placeholder = f"__col{len(self._quoted)}"
+            self._quoted[placeholder] = match.group(1)
+            return placeholder
+
+        text = re.sub(r"`([^`]+)`", quote, source.strip())
+        try:
+            tree = ast.parse(text, mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{source}': {e.msg}") from None
+        tree = ast.fix_missing_locations(_Vectorize().visit(tree))
+
+        self.columns = []
+        self._validate(tree.body)
+        self.uses_numexpr = HAS_NUMEXPR and self._numexpr_ok(tree.body)
+        self._text = ast.unparse(_FloatExponents().visit(copy.deepcopy(tree)))
+        self._code = compile(
+            ast.fix_missing_locations(_FixedWidthInts().visit(copy.deepcopy(tree))),
+            "<expression>",
+            "eval",
+        )
+
+    def _validate(self, node) -> None:
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ExpressionError(f"Only numeric constants are allowed, got {node.value!r}")
+        elif isinstance(node, ast.Name):
+            name = node.id
+            if name in FUNCTIONS:
+                raise ExpressionError(f"Function '{name}' must be called")
+            if name not in CONSTANTS:
+                column = self._quoted.get(name, name)
+                if column not in self.columns:
+                    self.columns.append(column)
+        elif isinstance(node, ast.BinOp):
+            if not isinstance(node.op, _BIN_OPS):
+                raise ExpressionError(f"Operator {type(node.op).__name__} is not allowed")
+            self._validate(node.left)
+            self._validate(node.right)
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, _UNARY_OPS):
+                raise ExpressionError(f"Operator {type(node.op).__name__} is not allowed")
+            self._validate(node.operand)
+        elif isinstance(node, ast.Compare):
+            if not all(isinstance(op, _CMP_OPS) for op in node.ops):
+                raise ExpressionError("Only ==, !=, <, <=, >, >= comparisons are allowed")
+            self._validate(node.left)
+            for comparator in node.comparators:
+                self._validate(comparator)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                name = node.func.id if isinstance(node.func, ast.Name) else ast.unparse(node.func)
+                raise ExpressionError(f"Function '{name}' is not allowed")
+            if node.keywords:
+                raise ExpressionError("Keyword arguments are not allowed")
+            for arg in node.args:
+                self._validate(arg)
+        else:
+            raise ExpressionError(f"'{ast.unparse(node)}' is not allowed in an expression")
+
+    @staticmethod
+    def _numexpr_ok(root) -> bool:
+        for node in ast.walk(root):
+            if isinstance(node, ast.Call) and node.func.id not in NUMEXPR_FUNCTIONS:
+                return False
+            if isinstance(node, ast.BinOp) and isinstance(node.op, ast.FloorDiv):
+                return False
+        return True
+
+    def _namespace(self, data) -> dict:
+        namespace = {}
+        for placeholder_or_name in self._names():
+            column = self._quoted.get(placeholder_or_name, placeholder_or_name)
+            try:
+                values = data[column]
+            except KeyError:
+                raise ExpressionError(f"Unknown column or name: '{column}'") from None
+            if isinstance(values, pd.Series):
+                values = values.to_numpy()
+            namespace[placeholder_or_name] = values
+        return namespace
+
+    def _names(self) -> list:
+        reverse = {column: placeholder for placeholder, column in self._quoted.items()}
+        return [reverse.get(column, column) for column in self.columns]
+
+    def evaluate(self, data=None):
+        """
+        Evaluates the expression.
+
+        Args:
+            data: DataFrame or mapping of column name -> array. May be omitted when
+                  the expression references no columns.
+
+        Returns:
+            A Series aligned with `data` if it is a DataFrame, otherwise a numpy
+            array or scalar.
+        """
+        namespace = self._namespace(data if data is not None else {})
+        result = None
+        if self.uses_numexpr and namespace:
+            try:
+                result = numexpr.evaluate(self._text, local_dict=namespace, global_dict=CONSTANTS)
+            except (TypeError, ValueError, KeyError, NotImplementedError, OverflowError):
+                result = None  # e.g. dtypes numexpr does not support, or huge constants; use numpy instead
+        if result is None:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                result = eval(self._code, _EVAL_GLOBALS, namespace)
+        if isinstance(data, pd.DataFrame):
+            if np.ndim(result) == 0:
+                result = np.full(len(data), result)
+            return pd.Series(result, index=data.index)
+        return result
+
+    def __repr__(self):
+        return f"Expression({self.source!r})"
+
+
+def evaluate(source: str, data=None):
+    """Shortcut for `Expression(source).evaluate(data)`."""
+    return Expression(source).evaluate(data)
+
+
+# --- Single-column mapping expressions (the `map` command) ---
+
+# Builtins a mapping expression may call, row by row.
+MAP_BUILTINS = {
+    "len": len, "str": str, "int": int, "float": float, "bool": bool,
+    "abs": abs, "round": round, "min": min, "max": max,
+}
+# String methods a mapping expression may call. str.format/format_map are left out
+# on purpose: their replacement fields can reach attributes ("{0.__class__}").
+STRING_METHODS = {
+    "upper", "lower", "title", "capitalize", "swapcase", "casefold",
+    "strip", "lstrip", "rstrip", "replace", "zfill", "center", "ljust", "rjust",
+    "find", "rfind", "count", "split", "rsplit", "startswith", "endswith", "join",
+    "removeprefix", "removesuffix",
+    "isdigit", "isalpha", "isalnum", "isnumeric", "isdecimal", "isspace",
+    "isupper", "islower", "istitle",
+}
+# The subset with a pandas `.str` counterpart taking the same positional arguments.
+_VECTOR_STRING_METHODS = STRING_METHODS - {"join", "startswith", "endswith", "count"}
+
+_MAP_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: operator.pow, ast.BitAnd: operator.and_, ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor, ast.LShift: operator.lshift, ast.RShift: operator.rshift,
+}
+_MAP_COMPARISONS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+# Limits on what a single value may grow to, so that `9**9**9**9`, `'a' * 10**10`
+# or `1 << 10**10` fail fast instead of hanging or exhausting memory.
+MAX_INT_BITS = 100_000
+MAX_SEQUENCE_LENGTH = 10_000_000
+MAX_FORMAT_WIDTH = 10_000
+_PADDING_METHODS = {"zfill", "center", "ljust", "rjust"}
+
+
+def _guarded_pow(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and base not in (-1, 0, 1):
+        if base.bit_length() * exponent > MAX_INT_BITS:
+            raise OverflowError(f"Integer power too large: {base} ** {exponent}")
+    return base ** exponent
+
+
+def _guarded_mul(left, right):
+    for sequence, count in ((left, right), (right, left)):
+        if isinstance(sequence, (str, bytes, list, tuple)) and isinstance(count, int) \
+                and len(sequence) * count > MAX_SEQUENCE_LENGTH:
+            raise OverflowError(f"Repeated sequence too long: {len(sequence)} * {count}")
+    return left * right
+
+
+def _check_widths(spec: str) -> None:
+    """Rejects format widths/precisions above MAX_FORMAT_WIDTH and `*` (width taken from the data)."""
+    if "*" in spec or any(int(digits) > MAX_FORMAT_WIDTH for digits in re.findall(r"\d+", spec)):
+        raise OverflowError(f"Format width too large: {spec!r}")
+
+
+def _guarded_mod(left, right):
+    if isinstance(left, str):
+        for directive in re.findall(r"%[^a-zA-Z%]*", left):
+            _check_widths(directive)
+    return left % right
+
+
+def _guarded_lshift(value, shift):
+    if isinstance(value, int) and isinstance(shift, int) and value and value.bit_length() + shift > MAX_INT_BITS:
+        raise OverflowError(f"Shifted integer too large: {value} << {shift}")
+    return value << shift
+
+
+_GUARDED_OPERATORS = {ast.Pow: "__pow", ast.Mult: "__mul", ast.Mod: "__mod", ast.LShift: "__lshift"}
+_GUARDS = {"__pow": _guarded_pow, "__mul": _guarded_mul, "__mod": _guarded_mod, "__lshift": _guarded_lshift}
+
+
+class _GuardOperators(ast.NodeTransformer):
+    """Routes **, *, % and << through the size-checked functions above."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if type(node.op) in _GUARDED_OPERATORS:
+            return ast.Call(
+                func=ast.Name(id=_GUARDED_OPERATORS[type(node.op)], ctx=ast.Load()),
+                args=[node.left, node.right],
+                keywords=[],
+            )
+        return node
+
+
+class _RowWise(Exception):
+    """Raised while vectorizing when a construct has no exact whole-column equivalent."""
+
+
+def _is_bool(value) -> bool:
+    if isinstance(value, pd.Series):
+        return pd.api.types.is_bool_dtype(value.dtype)
+    return isinstance(value, (bool, np.bool_))
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, pd.Series):
+        return pd.api.types.is_numeric_dtype(value.dtype)
+    return isinstance(value, (int, float, complex, np.number))
+
+
+def _kind(value) -> str:
+    """Coarse Python type of a scalar or of every value in a Series, or 'mixed'."""
+    if isinstance(value, pd.Series):
+        if value.isna().any():
+            return "mixed"
+        if pd.api.types.is_bool_dtype(value.dtype):
+            return "bool"
+        if pd.api.types.is_numeric_dtype(value.dtype):
+            return "number"
+        inferred = pd.api.types.infer_dtype(value, skipna=False)
+        if inferred == "mixed" and value.map(type).eq(list).all():
+            return "list"  # e.g. the result of x.split(',')
+        return {"string": "string", "empty": "empty", "boolean": "bool", "integer": "number",
+                "floating": "number", "mixed-integer-float": "number"}.get(inferred, "mixed")
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, float, np.number)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "mixed"
+
+
+def _sequences(value):
+    """`value.str` if every value is a string or list (for len() and subscripts)."""
+    if not isinstance(value, pd.Series) or _kind(value) not in ("string", "list", "empty"):
+        raise _RowWise
+    return value.str
+
+
+def _strings(value):
+    """`value.str` if every value is a string; Python would raise on anything else."""
+    if not isinstance(value, pd.Series) or _kind(value) not in ("string", "empty"):
+        raise _RowWise
+    return value.str
+
+
+# Mapping expression shared with pool workers through the initializer, so each
+# worker compiles it once instead of once per chunk.
+_worker_map = None
+
+
+def _init_map_worker(source, variable):
+    global _worker_map
+    _worker_map = MapExpression(source, variable)
+
+
+def _map_chunk(values):
+    return _worker_map.apply_rows(values)
+
+
+class MapExpression:
+    """
+    A Python expression over one value `x`, parsed and checked once, then applied
+    to a whole column.
+
+    Allowed are literals, `x`, arithmetic/bitwise operators, comparisons
+    (including `in`), and/or/not, `a if cond else b`, subscripts and slices,
+    f-strings, the builtins in MAP_BUILTINS, the numpy functions in FUNCTIONS and
+    the string methods in STRING_METHODS. Anything else (attribute access,
+    dunder names, lambdas, comprehensions, imports) is rejected up front.
+
+    `apply` first translates the expression to whole-column pandas/numpy
+    operations (`x * 2 + 1`, `x.upper()`, `x.split(',')[0]`, `len(x)`,
+    `x in ('a', 'b')`). Constructs without an exact vectorized equivalent, or
+    columns where the translation fails (e.g. `.str` on numbers), fall back to
+    the compiled code object evaluated row by row, optionally across a
+    process pool.
+    """
+
+    def __init__(self, source: str, variable: str = "x"):
+        """
+        Args:
+            source: Expression text, e.g. "x * 2" or "x.strip().upper()".
+            variable: Name the expression uses for the row value.
+
+        Raises:
+            ExpressionError: If the expression cannot be parsed or is not allowed.
+        """
+        if not isinstance(source, str) or not source.strip():
+            raise ExpressionError("Expression must be a non-empty string")
+        self.source = source
+        self.variable = variable
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{source}': {e.msg}") from None
+        self._validate(tree.body)
+        self._tree = tree
+        self._code = compile(
+            ast.fix_missing_locations(_GuardOperators().visit(copy.deepcopy(tree))), "<map>", "eval"
+        )
+        self._globals = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS, **MAP_BUILTINS, **_GUARDS}
+        self.mode = None  # "vectorized" or "row-wise" after apply()
+
+    def _validate(self, node) -> None:
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, complex, str, type(None))):
+                raise ExpressionError(f"Constant {node.value!r} is not allowed")
+        elif isinstance(node, ast.Name):
+            if node.id != self.variable and node.id not in MAP_BUILTINS \
+                    and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+                raise ExpressionError(f"Name '{node.id}' is not allowed (use '{self.variable}' for the value)")
+        elif isinstance(node, ast.Attribute):
+            raise ExpressionError(f"Attribute access '{ast.unparse(node)}' is not allowed")
+        elif isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute):
+                if func.attr not in STRING_METHODS:
+                    raise ExpressionError(f"Method '{func.attr}' is not allowed")
+                if func.attr in _PADDING_METHODS:
+                    width = node.args[0] if node.args else None
+                    if not (isinstance(width, ast.Constant) and type(width.value) is int
+                            and width.value <= MAX_FORMAT_WIDTH):
+                        raise ExpressionError(
+                            f"'{func.attr}' needs a constant width of at most {MAX_FORMAT_WIDTH}"
+                        )
+                self._validate(func.value)
+            elif isinstance(func, ast.Name) and (func.id in MAP_BUILTINS or func.id in FUNCTIONS):
+                pass
+            else:
+                raise ExpressionError(f"Function '{ast.unparse(func)}' is not allowed")
+            for arg in node.args:
+                if isinstance(arg, ast.Starred):
+                    raise ExpressionError("Starred arguments are not allowed")
+                self._validate(arg)
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise ExpressionError("Keyword argument unpacking is not allowed")
+                self._validate(keyword.value)
+        elif isinstance(node, (ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+                               ast.Subscript, ast.Slice, ast.Tuple, ast.List, ast.Set,
+                               ast.JoinedStr, ast.FormattedValue)):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, ast.MatMult):
+                raise ExpressionError("Operator MatMult is not allowed")
+            if isinstance(node, ast.FormattedValue) and node.format_spec is not None:
+                parts = node.format_spec.values
+                if not all(isinstance(part, ast.Constant) for part in parts):
+                    raise ExpressionError("Format specs must be constant")
+                try:
+                    _check_widths("".join(part.value for part in parts))
+                except OverflowError as e:
+                    raise ExpressionError(str(e)) from None
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.operator, ast.unaryop, ast.boolop, ast.cmpop, ast.expr_context)):
+                    continue
+                self._validate(child)
+        else:
+            raise ExpressionError(f"'{ast.unparse(node)}' is not allowed in a map expression")
+
+    # --- row-wise ---
+
+    def apply_rows(self, values) -> list:
+        """Evaluates the compiled expression for each value in turn."""
+        code, env, name = self._code, self._globals, self.variable
+        return [eval(code, env, {name: value}) for value in values]
+
+    def _apply_rows_parallel(self, values: list, n_jobs: int, chunk_size: int) -> list:
+        chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+        if n_jobs and n_jobs > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs, initializer=_init_map_worker, initargs=(self.source, self.variable)
+            ) as executor:
+                results = list(executor.map(_map_chunk, chunks))
+        else:
+            results = [self.apply_rows(chunk) for chunk in chunks]
+        return [value for chunk in results for value in chunk]
+
+    # --- vectorized ---
+
+    def _vec(self, node, x):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id == self.variable:
+                return x
+            if node.id in CONSTANTS:
+                return CONSTANTS[node.id]
+            raise _RowWise
+        if isinstance(node, ast.BinOp):
+            left, right = self._vec(node.left, x), self._vec(node.right, x)
+            if isinstance(node.op, ast.Mod) and isinstance(left, str):
+                raise _RowWise  # printf-style formatting
+            if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)) and np.any(np.asarray(right == 0)):
+                raise _RowWise  # Python raises ZeroDivisionError where numpy gives inf/nan
+            if not isinstance(left, pd.Series) and not isinstance(right, pd.Series):
+                name = _GUARDED_OPERATORS.get(type(node.op))
+                return (_GUARDS[name] if name else _MAP_OPERATORS[type(node.op)])(left, right)
+            if _is_bool(left) or _is_bool(right):
+                raise _RowWise  # Python arithmetic on bools gives ints; pandas keeps bool
+            if not (_is_number(left) and _is_number(right)):
+                # Only whole-string concatenation matches Python; elsewhere pandas
+                # propagates NaN where Python raises, and repeats/formatting are size-checked.
+                if not (isinstance(node.op, ast.Add) and _kind(left) == _kind(right) == "string"):
+                    raise _RowWise
+            if isinstance(node.op, ast.Pow):
+                if np.any(np.asarray((left < 0) & (right % 1 != 0))):
+                    raise _RowWise  # a negative base to a fractional power is complex in Python
+                if np.any(np.asarray((left == 0) & (right < 0))):
+                    raise _RowWise  # ZeroDivisionError in Python, inf in numpy
+            func = _MAP_OPERATORS[type(node.op)]
+            result = func(left, right)
+            if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Pow, ast.LShift)) \
+                    and isinstance(result, pd.Series) and pd.api.types.is_integer_dtype(result.dtype):
+                # Python ints never overflow; fixed-width columns would wrap silently.
+                approx = func(*(v.astype("float64") if isinstance(v, pd.Series) else float(v)
+                                for v in (left, right)))
+                if (np.abs(approx) >= 2.0 ** 63).any():
+                    raise _RowWise
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = self._vec(node.operand, x)
+            if isinstance(node.op, ast.Not):
+                if not _is_bool(operand):
+                    raise _RowWise
+                return ~operand if isinstance(operand, pd.Series) else not operand
+            if _is_bool(operand):
+                raise _RowWise  # -True is -1 and ~True is -2 in Python; pandas keeps bool
+            return {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert}[type(node.op)](operand)
+        if isinstance(node, ast.BoolOp):
+            values = [self._vec(value, x) for value in node.values]
+            if not all(_is_bool(value) for value in values):
+                raise _RowWise  # `a or b` returns an operand, not a bool
+            func = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = values[0]
+            for value in values[1:]:
+                result = func(result, value)
+            return result
+        if isinstance(node, ast.Compare):
+            result, left = None, self._vec(node.left, x)
+            for op, comparator in zip(node.ops, node.comparators):
+                part, left = self._vec_compare(left, op, comparator, x)
+                result = part if result is None else result & part
+            return result
+        if isinstance(node, ast.IfExp):
+            test = self._vec(node.test, x)
+            if not isinstance(test, pd.Series) or not _is_bool(test):
+                raise _RowWise
+            body, orelse = self._vec(node.body, x), self._vec(node.orelse, x)
+            kinds = {_kind(body), _kind(orelse)} - {"empty"}
+            if len(kinds) > 1 or "mixed" in kinds:
+                raise _RowWise  # numpy would coerce both branches to one dtype
+            if not isinstance(body, pd.Series):
+                body = pd.Series([body] * len(test), index=test.index)
+            return body.where(test, orelse)
+        if isinstance(node, ast.Call):
+            return self._vec_call(node, x)
+        if isinstance(node, ast.Subscript):
+            value = self._vec(node.value, x)
+            accessor = _sequences(value)
+            index = node.slice
+            if isinstance(index, ast.Slice):
+                bounds = [self._vec(part, x) if part is not None else None
+                          for part in (index.lower, index.upper, index.step)]
+                if not all(b is None or isinstance(b, int) for b in bounds):
+                    raise _RowWise
+                return accessor.slice(*bounds)
+            position = self._vec(index, x)
+            if not isinstance(position, int):
+                raise _RowWise
+            lengths = accessor.len()
+            if ((lengths <= position) if position >= 0 else (lengths < -position)).any():
+                raise _RowWise  # Python raises IndexError where pandas gives NaN
+            return accessor[position]
+        raise _RowWise
+
+    def _vec_compare(self, left, op, comparator, x):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if isinstance(comparator, (ast.Tuple, ast.List, ast.Set)) and isinstance(left, pd.Series) \
+                    and all(isinstance(elt, ast.Constant) and elt.value is not None for elt in comparator.elts):
+                result = left.isin([elt.value for elt in comparator.elts])
+            else:
+                right = self._vec(comparator, x)
+                if not isinstance(left, str):
+                    raise _RowWise
+                result = _strings(right).contains(left, regex=False)
+            return (~result if isinstance(op, ast.NotIn) else result), None
+        if type(op) not in _MAP_COMPARISONS:
+            raise _RowWise  # `is` / `is not`
+        right = self._vec(comparator, x)
+        if left is None or right is None:
+            raise _RowWise  # pandas compares None as missing: `x == None` would be all False
+        return _MAP_COMPARISONS[type(op)](left, right), right
+
+    def _vec_call(self, node, x):
+        if node.keywords:
+            raise _RowWise
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            target = self._vec(func.value, x)
+            args = [self._vec(arg, x) for arg in node.args]
+            if func.attr not in _VECTOR_STRING_METHODS or any(isinstance(arg, pd.Series) for arg in args):
+                raise _RowWise
+            return getattr(_strings(target), func.attr)(*args)
+        args = [self._vec(arg, x) for arg in node.args]
+        name = func.id
+        if name not in MAP_BUILTINS:  # builtins shadow the numpy functions of the same name
+            result = FUNCTIONS[name](*args)
+            return pd.Series(result, index=x.index) if isinstance(result, np.ndarray) else result
+        if len(args) != 1 or not isinstance(args[0], pd.Series):
+            raise _RowWise
+        (value,) = args
+        if name == "len":
+            return _sequences(value).len()
+        if name == "abs" and _is_number(value) and not _is_bool(value):
+            return value.abs()
+        if name == "float" and pd.api.types.is_numeric_dtype(value.dtype):
+            return value.astype("float64")
+        if name == "str" and not value.isna().any():
+            return value.astype(str)
+        raise _RowWise
+
+    def apply(self, values, n_jobs: int = 1, chunk_size: int = 50_000) -> pd.Series:
+        """
+        Applies the expression to every value of a column.
+
+        Args:
+            values: Series (or array-like) of values bound to `x`.
+            n_jobs: Worker processes for the row-wise fallback.
+            chunk_size: Values per task in the row-wise fallback.
+
+        Returns:
+            pd.Series: Results, aligned with `values`. `self.mode` records whether
+            the vectorized translation or the row-wise fallback produced them.
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        try:
+            with np.errstate(all="ignore"):
+                result = self._vec(self._tree.body, series)
+            if isinstance(result, pd.Series):
+                if len(result) != len(series):
+                    raise _RowWise
+                result = result.set_axis(series.index)
+            elif np.ndim(result) == 0:
+                result = pd.Series([result] * len(series), index=series.index)
+            else:
+                raise _RowWise
+            self.mode = "vectorized"
+            return result.rename(series.name)
+        except (_RowWise, TypeError, ValueError, AttributeError, IndexError, KeyError,
+                OverflowError, ZeroDivisionError):
+            pass
+        self.mode = "row-wise"
+        rows = self._apply_rows_parallel(series.tolist(), n_jobs, chunk_size)
+        return pd.Series(rows, index=series.index, name=series.name)
+
+    def __repr__(self):
+        return f"MapExpression({self.source!r})"
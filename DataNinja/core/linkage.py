@@ -0,0 +1,199 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .dedup import _mix64
+
+# Signatures shared with pool workers through the initializer, so each worker
+# receives them once instead of once per block of candidate pairs.
+_worker_signatures = None
+
+
+def _init_worker(signatures):
+    global _worker_signatures
+    _worker_signatures = signatures
+
+
+def _score_block(pairs):
+    sig = _worker_signatures
+    return (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1)
+
+
+class FuzzyMatcher:
+    """
+    Finds near-duplicate records without comparing all n² pairs.
+
+    A blocking index proposes candidate pairs, either MinHash LSH over character
+    shingles ('minhash') or a sorted-neighbourhood window over the normalized
+    key ('sorted'). Candidates are scored by vectorized MinHash signature
+    agreement (an estimate of shingle Jaccard similarity), and matches are
+    grouped into clusters with connected components.
+    """
+
+    def __init__(
+        self,
+        columns,
+        threshold=0.8,
+        method="minhash",
+        shingle_size=3,
+        num_perm=64,
+        bands=16,
+        window=5,
+        max_bucket_size=500,
+        n_jobs=None,
+        block_size=200_000,
+        seed=0,
+    ):
+        """
+        Args:
+            columns (list of str): Columns whose values are joined into the comparison key.
+            threshold (float): Minimum estimated Jaccard similarity for a match.
+            method (str): 'minhash' (LSH banding) or 'sorted' (sorted neighbourhood).
+            shingle_size (int): Character shingle length.
+            num_perm (int): MinHash signature length; must be divisible by `bands`.
+            bands (int): LSH bands; more bands find lower-similarity candidates.
+            window (int): Window size for the sorted-neighbourhood method.
+            max_bucket_size (int): LSH buckets larger than this are skipped (stop-word like keys).
+            n_jobs (int, optional): Worker processes for scoring. None or 1 runs serially.
+            block_size (int): Candidate pairs scored per task.
+            seed (int): Seed for the MinHash hash family.
+        """
+        if method not in ("minhash", "sorted"):
+            raise ValueError(f"Unknown blocking method: {method}")
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.columns = [columns] if isinstance(columns, str) else list(columns)
+        self.threshold = threshold
+        self.method = method
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.window = window
+        self.max_bucket_size = max_bucket_size
+        self.n_jobs = n_jobs
+        self.block_size = block_size
+        self.seeds = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64
+        ).astype(np.uint64)
+
+    def _keys(self, df):
+        """Normalized comparison keys; missing values contribute nothing, so all-null rows get ''."""
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"Columns not found: {missing}")
+        parts = [df[col].astype("string").fillna("") for col in self.columns]
+        joined = parts[0]
+        for part in parts[1:]:
+            joined = joined + " " + part
+        joined = joined.str.lower().str.replace(r"[^\w\s]", " ", regex=True)
+        return joined.str.replace(r"\s+", " ", regex=True).str.strip().to_numpy(dtype=object)
+
+    def signatures(self, keys):
+        """Returns an (n_records, num_perm) uint64 MinHash signature matrix."""
+        k = self.shingle_size
+        keys = pd.Series(keys, dtype="string")
+        lengths = keys.str.len().to_numpy(dtype=np.int64)
+        # All keys as one array of code points, padded so shingles of keys
+        # shorter than k can read past their end.
+        codes = np.frombuffer("".join(keys).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        codes = np.r_[codes, np.zeros(k, dtype=np.uint64)]
+        key_starts = np.cumsum(lengths) - lengths
+
+        # One shingle per start position; a key shorter than k is a single shingle.
+        counts = np.maximum(1, lengths - k + 1)
+        owners = np.repeat(np.arange(len(keys)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = key_starts[owners] + offsets
+        hashes = np.zeros(len(positions), dtype=np.uint64)
+        for t in range(k):
+            inside = offsets + t < lengths[owners]
+            hashes = _mix64(hashes ^ np.where(inside, codes[positions + t] + np.uint64(1), 0))
+        starts = np.cumsum(counts) - counts
+
+        sig = np.empty((len(keys), self.num_perm), dtype=np.uint64)
+        for p, seed in enumerate(self.seeds):
+            sig[:, p] = np.minimum.reduceat(_mix64(hashes ^ seed), starts)
+        return sig
+
+    def candidate_pairs(self, keys, sig):
+        """Returns unique candidate pairs (i < j) as an (m, 2) int array."""
+        n = len(keys)
+        if self.method == "sorted":
+            order = np.argsort(keys, kind="stable")
+            pairs = [
+                np.column_stack([order[:-offset], order[offset:]])
+                for offset in range(1, min(self.window, n))
+            ]
+        else:
+            rows = self.num_perm // self.bands
+            pairs = []
+            for b in range(self.bands):
+                band = sig[:, b * rows : (b + 1) * rows]
+                bucket = pd.util.hash_pandas_object(pd.DataFrame(band), index=False).to_numpy()
+                order = np.argsort(bucket, kind="stable")
+                sorted_bucket = bucket[order]
+                bounds = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1], True])
+                sizes = np.diff(bounds)
+                for i in np.flatnonzero((sizes >= 2) & (sizes <= self.max_bucket_size)):
+                    start, size = bounds[i], sizes[i]
+                    members = order[start : start + size]
+                    left, right = np.triu_indices(size, k=1)
+                    pairs.append(np.column_stack([members[left], members[right]]))
+
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.sort(np.concatenate(pairs), axis=1)
+        return np.unique(pairs, axis=0)
+
+    def score(self, pairs, sig):
+        """Estimated Jaccard similarity per candidate pair."""
+        if len(pairs) == 0:
+            return np.empty(0)
+        blocks = [pairs[i : i + self.block_size] for i in range(0, len(pairs), self.block_size)]
+        if self.n_jobs and self.n_jobs > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs, initializer=_init_worker, initargs=(sig,)
+            ) as executor:
+                return np.concatenate(list(executor.map(_score_block, blocks)))
+        _init_worker(sig)
+        return np.concatenate([_score_block(block) for block in blocks])
+
+    def match(self, df):
+        """
+        Returns a DataFrame of matched pairs with columns 'left', 'right'
+        (positional row numbers) and 'similarity'.
+
+        Rows whose key columns are all missing or empty never match anything.
+        """
+        keys = self._keys(df)
+        rows = np.flatnonzero(keys != "")
+        keys = keys[rows]
+        sig = self.signatures(keys)
+        pairs = self.candidate_pairs(keys, sig)
+        similarity = self.score(pairs, sig)
+        pairs = rows[pairs]
+        keep = similarity >= self.threshold
+        return pd.DataFrame(
+            {"left": pairs[keep, 0], "right": pairs[keep, 1], "similarity": similarity[keep]}
+        )
+
+    def cluster(self, df):
+        """
+        Assigns a cluster ID to every row; rows linked by a chain of matches share one.
+        IDs are numbered in order of each cluster's first row.
+        """
+        n = len(df)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        matches = self.match(df)
+        graph = coo_matrix(
+            (np.ones(len(matches)), (matches["left"], matches["right"])), shape=(n, n)
+        )
+        _, labels = connected_components(graph, directed=False)
+        _, first_seen = np.unique(labels, return_index=True)
+        renumber = np.empty_like(first_seen)
+        renumber[np.argsort(first_seen)] = np.arange(len(first_seen))
+        return renumber[labels]
@@ -0,0 +1,277 @@
+import json
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from sklearn.preprocessing import OneHotEncoder
+
+from .transformer import CategoryCodeEncoder, DataTransformer, HashingEncoder, sparse_frame
+
+FORMAT_VERSION = 1
+
+
+def _tag_category(value):
+    """'i:1', 's:1', 'f:0.5', 'b:True': a category as text that keeps its Python type."""
+    if isinstance(value, (bool, np.bool_)):
+        return f"b:{bool(value)}"
+    if isinstance(value, (int, np.integer)):
+        return f"i:{int(value)}"
+    if isinstance(value, (float, np.floating)):
+        return f"f:{float(value)!r}"
+    if isinstance(value, str):
+        return f"s:{value}"
+    raise ValueError(f"Cannot store category {value!r} of type {type(value).__name__}")
+
+
+def _untag_category(text):
+    tag, value = text[0], text[2:]
+    if tag == "b":
+        return value == "True"
+    if tag == "i":
+        return int(value)
+    if tag == "f":
+        return float(value)
+    return value
+
+
+def _pack_categories(categories):
+    """
+    Splits a category array into a non-object numpy array (numeric or unicode)
+    plus a NaN flag, so it can be stored without pickle.
+
+    Object categories that are not all strings (ints in an object column, or
+    both 1 and '1') are stored as type-tagged strings, so they still match the
+    original values after loading.
+    """
+    values = pd.Index(categories)
+    has_nan = bool(values.isna().any())
+    values = values.dropna()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return np.asarray(values), has_nan, "numeric"
+    items = values.tolist()
+    if all(isinstance(value, str) for value in items):
+        return np.asarray(items, dtype=str), has_nan, "str"
+    return np.asarray([_tag_category(value) for value in items], dtype=str), has_nan, "tagged"
+
+
+def _unpack_categories(values, kind):
+    if kind == "tagged":
+        return pd.Index([_untag_category(text) for text in values.tolist()], dtype=object)
+    return pd.Index(values.astype(float) if kind == "numeric" and values.dtype.kind == "f" else values)
+
+
+class TransformPipeline:
+    """
+    Fit once, transform many: a serializable DataTransformer pipeline.
+
+    `fit` runs the transformation steps (same spec as DataTransformer.transform_data)
+    and keeps only the fitted state each step needs: affine coefficients for
+    scalers, categories/feature names for encoders. `transform` applies that state
+    to new batches without refitting. `save`/`load` use a single uncompressed
+    .npz file (JSON spec + plain arrays, no pickle), which loads in milliseconds.
+
+    Supported steps: scale_numerical_features, encode_categorical_features.
+    """
+
+    SUPPORTED_METHODS = ("scale_numerical_features", "encode_categorical_features")
+
+    def __init__(self, steps):
+        """
+        Args:
+            steps (list of dict): [{'method': ..., 'params': {...}}, ...]
+        """
+        for step in steps:
+            if step.get("method") not in self.SUPPORTED_METHODS:
+                raise ValueError(f"Unsupported pipeline step: {step.get('method')}")
+        self.steps = steps
+        self.fitted_steps = None
+
+    # --- Fitting ---
+
+    def fit(self, df):
+        """Fits every step in order on `df` and records its state."""
+        self.fit_transform(df)
+        return self
+
+    def fit_transform(self, df):
+        transformer = DataTransformer(df)
+        current = df.copy()
+        self.fitted_steps = []
+        for step in self.steps:
+            # Start each step with empty state so only this step's fitted objects are exported.
+            transformer.scalers, transformer.encoders = {}, {}
+            current = getattr(transformer, step["method"])(current, **dict(step.get("params", {})))
+            if step["method"] == "scale_numerical_features":
+                self.fitted_steps.append(self._export_scalers(transformer))
+            else:
+                self.fitted_steps.append(self._export_encoders(transformer))
+        return current
+
+    @staticmethod
+    def _export_scalers(transformer):
+        groups = []
+        for columns, scaler in transformer._scaler_groups():
+            # Every supported scaler is affine: x * a + b.
+            zeros = np.zeros((1, len(columns)))
+            b = scaler.transform(zeros)[0]
+            a = scaler.transform(zeros + 1)[0] - b
+            groups.append({"columns": columns, "a": a, "b": b})
+        return {"kind": "scale", "groups": groups}
+
+    @staticmethod
+    def _export_encoders(transformer):
+        columns = []
+        for col, encoder in transformer.encoders.items():
+            entry = {"column": col}
+            if isinstance(encoder, OneHotEncoder):
+                values, has_nan, kind = _pack_categories(encoder.categories_[0])
+                drop_idx = None if encoder.drop_idx_ is None else encoder.drop_idx_[0]
+                entry.update(
+                    type="onehot",
+                    categories=values,
+                    has_nan=has_nan,
+                    category_kind=kind,
+                    drop_idx=None if drop_idx is None else int(drop_idx),
+                    feature_names=[str(n) for n in encoder.get_feature_names_out([col])],
+                    sparse=bool(encoder.sparse_output),
+                )
+            elif isinstance(encoder, CategoryCodeEncoder):
+                values, has_nan, kind = _pack_categories(encoder.categories_)
+                entry.update(type="ordinal", categories=values, category_kind=kind)
+            elif isinstance(encoder, HashingEncoder):
+                entry.update(
+                    type="hashing",
+                    n_features=encoder.n_features,
+                    sparse=bool(encoder.sparse),
+                )
+            columns.append(entry)
+        return {"kind": "encode", "columns": columns}
+
+    # --- Applying ---
+
+    def transform(self, df):
+        """Applies the fitted state of every step to a new batch."""
+        if self.fitted_steps is None:
+            raise RuntimeError("Pipeline is not fitted. Call fit() or load() first.")
+        result = df.copy(deep=False)
+        for state in self.fitted_steps:
+            if state["kind"] == "scale":
+                result = self._apply_scale(result, state)
+            else:
+                result = self._apply_encode(result, state)
+        return result
+
+    @staticmethod
+    def _apply_scale(df, state):
+        for group in state["groups"]:
+            cols = group["columns"]
+            missing = [col for col in cols if col not in df.columns]
+            if missing:
+                print(f"Warning: Columns {missing} not found for scaling. Skipping.")
+                continue
+            df[cols] = df[cols].to_numpy(dtype=np.float64) * group["a"] + group["b"]
+        return df
+
+    @staticmethod
+    def _onehot_block(values, entry, index):
+        categories = _unpack_categories(entry["categories"], entry["category_kind"])
+        codes = categories.get_indexer(values).astype(np.int64)
+        n_cols = len(categories) + entry["has_nan"]
+        if entry["has_nan"]:
+            codes[pd.isna(values)] = len(categories)  # sklearn orders NaN last
+        rows = np.flatnonzero(codes >= 0)
+        matrix = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, codes[rows])), shape=(len(values), n_cols)
+        )
+        if entry["drop_idx"] is not None:
+            keep = [j for j in range(n_cols) if j != entry["drop_idx"]]
+            matrix = matrix[:, keep]
+        names = entry["feature_names"]
+        if entry["sparse"]:
+            return sparse_frame(matrix, names, index)
+        return pd.DataFrame(matrix.toarray(), columns=names, index=index)
+
+    def _apply_encode(self, df, state):
+        blocks, encoded_cols = [], []
+        for entry in state["columns"]:
+            col = entry["column"]
+            if col not in df.columns:
+                print(f"Warning: Column '{col}' not found for encoding. Skipping.")
+                continue
+            values = df[col]
+            if entry["type"] == "ordinal":
+                categories = _unpack_categories(entry["categories"], entry["category_kind"])
+                df[col] = categories.get_indexer(values)
+                continue
+            if entry["type"] == "onehot":
+                block = self._onehot_block(values.to_numpy(), entry, df.index)
+            else:
+                matrix = HashingEncoder(entry["n_features"]).transform(values)
+                names = [f"{col}_hash_{i}" for i in range(entry["n_features"])]
+                if entry["sparse"]:
+                    block = sparse_frame(matrix, names, df.index)
+                else:
+                    block = pd.DataFrame(matrix.toarray(), columns=names, index=df.index)
+            blocks.append(block)
+            encoded_cols.append(col)
+        if blocks:
+            df = pd.concat([df.drop(columns=encoded_cols), *blocks], axis=1)
+        return df
+
+    # --- Serialization ---
+
+    def save(self, path):
+        """Writes the fitted pipeline to a single .npz file."""
+        if self.fitted_steps is None:
+            raise RuntimeError("Pipeline is not fitted. Call fit() first.")
+        arrays = {}
+        spec_steps = []
+        for i, state in enumerate(self.fitted_steps):
+            if state["kind"] == "scale":
+                groups = []
+                for j, group in enumerate(state["groups"]):
+                    arrays[f"s{i}_g{j}_a"] = group["a"]
+                    arrays[f"s{i}_g{j}_b"] = group["b"]
+                    groups.append({"columns": group["columns"]})
+                spec_steps.append({"kind": "scale", "groups": groups})
+            else:
+                columns = []
+                for j, entry in enumerate(state["columns"]):
+                    entry = dict(entry)
+                    if "categories" in entry:
+                        arrays[f"s{i}_c{j}_categories"] = entry.pop("categories")
+                    columns.append(entry)
+                spec_steps.append({"kind": "encode", "columns": columns})
+
+        spec = {"version": FORMAT_VERSION, "steps": self.steps, "fitted_steps": spec_steps}
+        arrays["__spec__"] = np.frombuffer(json.dumps(spec, default=str).encode("utf-8"), dtype=np.uint8)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a pipeline written by `save`; no refitting and no pickle involved."""
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(data["__spec__"].tobytes().decode("utf-8"))
+            if spec.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported pipeline format version: {spec.get('version')}")
+            fitted_steps = []
+            for i, state in enumerate(spec["fitted_steps"]):
+                if state["kind"] == "scale":
+                    groups = [
+                        {"columns": g["columns"], "a": data[f"s{i}_g{j}_a"], "b": data[f"s{i}_g{j}_b"]}
+                        for j, g in enumerate(state["groups"])
+                    ]
+                    fitted_steps.append({"kind": "scale", "groups": groups})
+                else:
+                    columns = []
+                    for j, entry in enumerate(state["columns"]):
+                        key = f"s{i}_c{j}_categories"
+                        if key in data:
+                            entry["categories"] = data[key]
+                        columns.append(entry)
+                    fitted_steps.append({"kind": "encode", "columns": columns})
+
+        pipeline = cls(spec["steps"])
+        pipeline.fitted_steps = fitted_steps
+        return pipeline
@@ -1,6 +1,62 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
+from scipy import stats
+
+from .downsample import (
+    as_float_array,
+    bin_2d,
+    histogram_chunks,
+    histogram_counts,
+    lttb_indices,
+)
+
+
+def _get_axes(ax=None):
+    """Returns (figure, axes): a new pyplot figure, or the figure owning `ax`."""
+    if ax is None:
+        return plt.subplots()
+    return ax.figure, ax
+
+
+# Per-process state for `DataPlotter.export_plots`: the data reaches each worker
+# once through the pool initializer, and one Agg figure is reused for every chart.
+_export_plotter = None
+_export_figure = None
+
+
+def _init_export_worker(data, big_data_threshold):
+    global _export_plotter, _export_figure
+    _export_plotter = DataPlotter(data, big_data_threshold=big_data_threshold)
+    _export_figure = Figure()
+    FigureCanvasAgg(_export_figure)  # Headless canvas, independent of the pyplot backend
+
+
+def _render_spec(spec):
+    """Renders one plot spec into the reused figure. Returns (path, error or None)."""
+    path = spec.get("path")
+    plot_type = spec.get("plot_type")
+    method = getattr(_export_plotter, f"plot_{plot_type}", None)
+    if not path:
+        return path, "Plot spec has no 'path'."
+    if method is None:
+        return path, f"Unsupported plot type '{plot_type}'."
+
+    fig = _export_figure
+    fig.clear()
+    fig.set_size_inches(spec["figsize"])
+    try:
+        if method(ax=fig.add_subplot(), **spec.get("params", {})) is None:
+            return path, "Plot could not be created."
+        fig.savefig(path, dpi=spec["dpi"])
+    except Exception as e:
+        return path, str(e)
+    return path, None
 
 
 class DataPlotter:
@@ -10,16 +66,23 @@ class DataPlotter:
     The class is initialized with data (ideally a pandas DataFrame).
     It provides methods to generate common plots like histograms,
     scatter plots, bar charts, etc.
+
+    Above `big_data_threshold` rows, plots switch to aggregated renderings
+    (numpy pre-binned histograms, 2-D binned scatter, LTTB-downsampled lines)
+    so drawing cost depends on the number of bins/points, not rows.
     """
 
-    def __init__(self, data):
+    def __init__(self, data, big_data_threshold=100_000):
         """
         Initializes the DataPlotter with the dataset.
 
         Args:
             data: The data to be plotted. Expected to be a pandas DataFrame
                   or convertible to one.
+            big_data_threshold (int): Row count above which 'auto' modes aggregate
+                                      before drawing.
         """
+        self.big_data_threshold = big_data_threshold
         if data is None:
             raise ValueError("Input data cannot be None.")
 
@@ -101,8 +164,61 @@ class DataPlotter:
             )
             return None
 
+    def export_plots(self, specs, n_jobs=None, figsize=(8, 6), dpi=100):
+        """
+        Renders many plots headlessly and writes them to disk.
+
+        Args:
+            specs (list of dict): e.g. [{'plot_type': 'histogram', 'path': 'age.png',
+                                         'params': {'column': 'Age', 'bins': 20}}, ...].
+                                  The file format follows the path extension (png, svg, pdf).
+                                  'figsize' and 'dpi' may be set per spec.
+            n_jobs (int, optional): Worker processes. None or 1 renders in this process.
+            figsize (tuple): Default figure size in inches.
+            dpi (int): Default resolution for raster formats.
+
+        Returns:
+            list of str: Paths that were written successfully.
+        """
+        global _export_plotter, _export_figure
+        specs = [{"figsize": figsize, "dpi": dpi, **spec} for spec in specs]
+        if n_jobs and n_jobs > 1 and len(specs) > 1:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                initializer=_init_export_worker,
+                initargs=(self.data, self.big_data_threshold),
+            ) as executor:
+                chunksize = max(1, len(specs) // (n_jobs * 4))
+                results = list(executor.map(_render_spec, specs, chunksize=chunksize))
+        else:
+            _export_plotter, _export_figure = self, Figure()
+            FigureCanvasAgg(_export_figure)
+            try:
+                results = [_render_spec(spec) for spec in specs]
+            finally:
+                _export_plotter = _export_figure = None
+
+        saved = []
+        for path, error in results:
+            if error:
+                print(f"Error exporting plot '{path}': {error}")
+            else:
+                saved.append(path)
+        print(f"Exported {len(saved)} of {len(specs)} plots.")
+        return saved
+
     def plot_histogram(
-        self, column, title=None, xlabel=None, ylabel="Frequency", bins=10, **kwargs
+        self,
+        column,
+        title=None,
+        xlabel=None,
+        ylabel="Frequency",
+        bins=10,
+        mode="auto",
+        chunks=None,
+        range=None,
+        ax=None,
+        **kwargs,
     ):
         """
         Generates a histogram for a specified column.
@@ -113,11 +229,25 @@ class DataPlotter:
             xlabel (str, optional): Label for the x-axis. Defaults to column name.
             ylabel (str, optional): Label for the y-axis.
             bins (int): Number of bins for the histogram.
-            **kwargs: Additional keyword arguments for sns.histplot().
+            mode (str): 'auto' pre-bins numeric columns with numpy above `big_data_threshold`
+                        rows, 'binned' always pre-bins, 'raw' always uses sns.histplot.
+            chunks (iterable, optional): DataFrames to stream through a pre-binned histogram
+                                         instead of `self.data`; requires `range` (or bin edges).
+            range (tuple, optional): (min, max) of the bins.
+            ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+            **kwargs: Additional keyword arguments for sns.histplot() (or ax.stairs() when pre-binned).
 
         Returns:
             matplotlib.figure.Figure: The figure object.
         """
+        if chunks is not None:
+            try:
+                counts, edges = histogram_chunks(chunks, column, bins=bins, range=range)
+            except (KeyError, ValueError) as e:
+                print(f"Error building streamed histogram for '{column}': {e}")
+                return None
+            return self._draw_binned_histogram(counts, edges, column, title, xlabel, ylabel, ax, kwargs)
+
         if column not in self.data.columns:
             print(f"Column '{column}' not found in data.")
             return None
@@ -127,7 +257,18 @@ class DataPlotter:
             )
             # Potentially try to convert or handle, but for now, just warn.
 
-        fig, ax = plt.subplots()
+        numeric = pd.api.types.is_numeric_dtype(self.data[column])
+        seaborn_only = kwargs.get("kde") or "hue" in kwargs
+        if mode == "binned" or (
+            mode == "auto" and numeric and not seaborn_only and len(self.data) > self.big_data_threshold
+        ):
+            kwargs.pop("kde", None)
+            counts, edges = histogram_counts(self.data[column], bins=bins, range=range)
+            return self._draw_binned_histogram(counts, edges, column, title, xlabel, ylabel, ax, kwargs)
+
+        if range is not None:
+            kwargs["binrange"] = range
+        fig, ax = _get_axes(ax)
         sns.histplot(
             data=self.data,
             x=column,
@@ -143,6 +284,17 @@ class DataPlotter:
 
         return fig
 
+    @staticmethod
+    def _draw_binned_histogram(counts, edges, column, title, xlabel, ylabel, ax, kwargs):
+        """Draws precomputed histogram counts as a single filled step artist."""
+        kwargs.pop("save_path", None)
+        fig, ax = _get_axes(ax)
+        ax.stairs(counts, edges, fill=True, **kwargs)
+        ax.set_title(title if title else f"Histogram of {column}")
+        ax.set_xlabel(xlabel if xlabel else column)
+        ax.set_ylabel(ylabel)
+        return fig
+
     def plot_scatter(
         self,
         x_column,
@@ -151,6 +303,9 @@ class DataPlotter:
         xlabel=None,
         ylabel=None,
         hue=None,
+        mode="auto",
+        gridsize=100,
+        ax=None,
         **kwargs,
     ):
         """
@@ -163,6 +318,10 @@ class DataPlotter:
             xlabel (str, optional): Label for the x-axis. Defaults to x_column name.
             ylabel (str, optional): Label for the y-axis. Defaults to y_column name.
             hue (str, optional): Column name for color encoding.
+            mode (str): 'points' draws every row, 'hexbin' or 'raster' draw a 2-D binned
+                        density; 'auto' picks 'hexbin' above `big_data_threshold` rows.
+            gridsize (int): Number of bins per axis for the binned modes.
+            ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
             **kwargs: Additional keyword arguments for sns.scatterplot().
 
         Returns:
@@ -177,10 +336,33 @@ class DataPlotter:
             print(f"Hue column '{hue}' not found in data. Ignoring.")
             hue = None
 
-        fig, ax = plt.subplots()
-        sns.scatterplot(
-            data=self.data, x=x_column, y=y_column, hue=hue, ax=ax, **kwargs
-        )
+        if mode == "auto":
+            mode = "hexbin" if len(self.data) > self.big_data_threshold else "points"
+
+        fig, ax = _get_axes(ax)
+        if mode in ("hexbin", "raster"):
+            if hue:
+                print(f"Warning: Hue '{hue}' is ignored in '{mode}' mode.")
+            kwargs.pop("save_path", None)
+            if mode == "hexbin":
+                x = as_float_array(self.data[x_column])
+                y = as_float_array(self.data[y_column])
+                finite = np.isfinite(x) & np.isfinite(y)
+                artist = ax.hexbin(
+                    x[finite], y[finite], gridsize=gridsize, mincnt=1, bins="log", **kwargs
+                )
+            else:
+                counts, x_edges, y_edges = bin_2d(
+                    self.data[x_column], self.data[y_column], gridsize=gridsize
+                )
+                artist = ax.pcolormesh(
+                    x_edges, y_edges, np.ma.masked_equal(counts.T, 0), **kwargs
+                )
+            fig.colorbar(artist, ax=ax, label="Count")
+        else:
+            sns.scatterplot(
+                data=self.data, x=x_column, y=y_column, hue=hue, ax=ax, **kwargs
+            )
 
         ax.set_title(title if title else f"Scatter Plot of {y_column} vs {x_column}")
         ax.set_xlabel(xlabel if xlabel else x_column)
@@ -188,6 +370,59 @@ class DataPlotter:
 
         return fig
 
+    def plot_line(
+        self,
+        x_column,
+        y_column,
+        title=None,
+        xlabel=None,
+        ylabel=None,
+        max_points=2000,
+        ax=None,
+        **kwargs,
+    ):
+        """
+        Generates a line plot, downsampled with LTTB when there are more than
+        `max_points` rows. Rows are sorted by `x_column` first if needed.
+
+        Args:
+            x_column (str): The name of the column for the x-axis (numeric or datetime).
+            y_column (str): The name of the numeric column for the y-axis.
+            title (str, optional): Title of the plot.
+            xlabel (str, optional): Label for the x-axis. Defaults to x_column name.
+            ylabel (str, optional): Label for the y-axis. Defaults to y_column name.
+            max_points (int): Maximum number of points drawn. None disables downsampling.
+            ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+            **kwargs: Additional keyword arguments for ax.plot().
+
+        Returns:
+            matplotlib.figure.Figure: The figure object.
+        """
+        if x_column not in self.data.columns or y_column not in self.data.columns:
+            print(
+                f"One or both columns ('{x_column}', '{y_column}') not found in data."
+            )
+            return None
+
+        data = self.data[[x_column, y_column]].dropna()
+        if not data[x_column].is_monotonic_increasing:
+            data = data.sort_values(x_column, kind="stable")
+        if max_points and len(data) > max_points:
+            keep = lttb_indices(
+                as_float_array(data[x_column]), as_float_array(data[y_column]), max_points
+            )
+            data = data.iloc[keep]
+
+        kwargs.pop("save_path", None)
+        fig, ax = _get_axes(ax)
+        ax.plot(data[x_column].to_numpy(), data[y_column].to_numpy(), **kwargs)
+
+        ax.set_title(title if title else f"Line Plot of {y_column} over {x_column}")
+        ax.set_xlabel(xlabel if xlabel else x_column)
+        ax.set_ylabel(ylabel if ylabel else y_column)
+
+        return fig
+
     def plot_bar(
         self,
         x_column,
@@ -196,6 +431,9 @@ class DataPlotter:
         xlabel=None,
         ylabel=None,
         estimator="mean",
+        mode="auto",
+        ci=95,
+        ax=None,
         **kwargs,
     ):
         """
@@ -210,7 +448,14 @@ class DataPlotter:
             ylabel (str, optional): Label for the y-axis. Defaults to y_column name.
             estimator (str or callable): Statistical function to estimate within each categorical bin.
                                      Common: 'mean', 'sum', 'count'.
-            **kwargs: Additional keyword arguments for sns.barplot().
+            mode (str): 'fast' aggregates once with a groupby (or value_counts for 'count') and
+                        draws bars from the small aggregated frame; 'seaborn' passes raw rows to
+                        sns.barplot/sns.countplot (bootstrapped error bars); 'auto' uses 'fast'
+                        above `big_data_threshold` rows.
+            ci (float, optional): Confidence level in percent for the analytic t-interval drawn
+                                  in 'fast' mode ('mean' and 'sum' only). None draws no error bars.
+            ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+            **kwargs: Additional keyword arguments for sns.barplot() (ax.bar() in 'fast' mode).
 
         Returns:
             matplotlib.figure.Figure: The figure object.
@@ -221,7 +466,12 @@ class DataPlotter:
             )
             return None
 
-        fig, ax = plt.subplots()
+        if mode == "fast" or (mode == "auto" and len(self.data) > self.big_data_threshold):
+            return self._plot_bar_aggregated(
+                x_column, y_column, title, xlabel, ylabel, estimator, ci, ax, kwargs
+            )
+
+        fig, ax = _get_axes(ax)
         # Seaborn's barplot default estimator is mean. For 'count', use sns.countplot directly or adjust.
         if estimator == "count":
             sns.countplot(data=self.data, x=x_column, ax=ax, **kwargs)
@@ -250,10 +500,78 @@ class DataPlotter:
 
         ax.set_title(title if title else f"Bar Plot: {y_column} by {x_column}")
         ax.set_xlabel(xlabel if xlabel else x_column)
-        plt.xticks(
-            rotation=45, ha="right"
+        plt.setp(
+            ax.get_xticklabels(), rotation=45, ha="right"
         )  # Rotate x-axis labels for better readability
-        plt.tight_layout()  # Adjust layout
+        fig.tight_layout()  # Adjust layout
+
+        return fig
+
+    @staticmethod
+    def _category_order(values):
+        """Category order matching seaborn: declared categories, sorted numbers, else first appearance."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return list(values.cat.categories)
+        unique = values.dropna().unique()
+        if pd.api.types.is_numeric_dtype(values):
+            return list(np.sort(unique))
+        return list(unique)
+
+    def aggregate_bar(self, x_column, y_column, estimator="mean", ci=95):
+        """
+        Aggregates `y_column` per category of `x_column` in one pass.
+
+        Returns:
+            pd.DataFrame: Indexed by category (in plotting order) with columns 'value'
+                          and, when an analytic interval applies, 'error' (half-width).
+        """
+        order = self._category_order(self.data[x_column])
+        if estimator == "count":
+            counts = self.data[x_column].value_counts(sort=False)
+            return pd.DataFrame({"value": counts.reindex(order, fill_value=0)})
+
+        y = pd.to_numeric(self.data[y_column], errors="coerce")
+        grouped = y.groupby(self.data[x_column], observed=True, sort=False)
+        if ci is not None and estimator in ("mean", "sum"):
+            stats_frame = grouped.agg(["mean", "std", "count"]).reindex(order)
+            n = stats_frame["count"]
+            t = stats.t.ppf(0.5 + ci / 200, np.maximum(n - 1, 1))
+            error = t * stats_frame["std"] / np.sqrt(n)
+            if estimator == "sum":
+                return pd.DataFrame(
+                    {"value": stats_frame["mean"] * n, "error": error * n}
+                )
+            return pd.DataFrame({"value": stats_frame["mean"], "error": error})
+        return pd.DataFrame({"value": grouped.agg(estimator).reindex(order)})
+
+    def _plot_bar_aggregated(
+        self, x_column, y_column, title, xlabel, ylabel, estimator, ci, ax, kwargs
+    ):
+        """Draws bars from the output of `aggregate_bar` instead of raw rows."""
+        kwargs.pop("save_path", None)
+        aggregated = self.aggregate_bar(x_column, y_column, estimator=estimator, ci=ci)
+        positions = np.arange(len(aggregated))
+
+        fig, ax = _get_axes(ax)
+        error = aggregated["error"].fillna(0).to_numpy() if "error" in aggregated else None
+        ax.bar(
+            positions,
+            aggregated["value"].to_numpy(),
+            yerr=error,
+            capsize=3 if error is not None else 0,
+            **kwargs,
+        )
+        ax.set_xticks(positions, [str(label) for label in aggregated.index])
+        if estimator == "count":
+            ax.set_ylabel(ylabel if ylabel else "Count")
+        else:
+            name = estimator if isinstance(estimator, str) else getattr(estimator, "__name__", "Estimate")
+            ax.set_ylabel(ylabel if ylabel else f"{name.capitalize()} of {y_column}")
+
+        ax.set_title(title if title else f"Bar Plot: {y_column} by {x_column}")
+        ax.set_xlabel(xlabel if xlabel else x_column)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
 
         return fig
 
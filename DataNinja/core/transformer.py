@@ -1,7 +1,79 @@
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+from scipy import sparse as sp
+from sklearn.preprocessing import MinMaxScaler, OneHotEncoder, RobustScaler, StandardScaler
 import numpy as np
 
+SCALERS = {
+    "minmax": MinMaxScaler,
+    "standard": StandardScaler,
+    "robust": RobustScaler,
+}
+
+
+class CategoryCodeEncoder:
+    """Ordinal encoder built on pandas category codes; unseen values and NaN map to -1."""
+
+    def fit(self, values):
+        self.dtype_ = pd.CategoricalDtype(pd.Series(values).dropna().unique())
+        return self
+
+    def transform(self, values):
+        return self.dtype_.categories.get_indexer(values)
+
+    @property
+    def categories_(self):
+        return self.dtype_.categories
+
+
+def sparse_frame(matrix, columns, index):
+    """
+    A DataFrame of SparseDtype columns (fill value 0) from a scipy sparse matrix.
+
+    Built column by column: DataFrame.sparse.from_spmatrix uses NaN as the fill
+    value in recent pandas, which would turn every implicit zero into NaN.
+    """
+    matrix = sp.csc_matrix(matrix)
+    return pd.DataFrame(
+        {name: pd.arrays.SparseArray.from_spmatrix(matrix[:, [j]]) for j, name in enumerate(columns)},
+        index=index,
+    )
+
+
+class HashingEncoder:
+    """
+    Feature-hashing encoder with a fixed column budget.
+
+    Values are hashed (vectorized, stable across runs) into `n_features`
+    buckets, so memory does not grow with the number of distinct levels.
+    """
+
+    def __init__(self, n_features=32, sparse=False):
+        """
+        Args:
+            n_features (int): Number of hash buckets (output columns).
+            sparse (bool): Whether encoded blocks become SparseDtype columns.
+        """
+        if n_features < 1:
+            raise ValueError("n_features must be at least 1")
+        self.n_features = n_features
+        self.sparse = sparse
+
+    def fit(self, values):
+        return self
+
+    def transform(self, values):
+        """Returns an (n_rows, n_features) CSR matrix with one 1.0 per row."""
+        keys = np.asarray(pd.Series(values).astype(str), dtype=object)
+        buckets = pd.util.hash_array(keys) % np.uint64(self.n_features)
+        n = len(keys)
+        return sp.csr_matrix(
+            (np.ones(n), buckets.astype(np.int64), np.arange(n + 1)),
+            shape=(n, self.n_features),
+        )
+
+    def get_feature_names_out(self, input_features):
+        return np.array([f"{input_features[0]}_hash_{i}" for i in range(self.n_features)])
+
 
 class DataTransformer:
     """
@@ -93,15 +165,29 @@ class DataTransformer:
         )
         return self.data
 
+    def _numeric_columns(self, df, columns):
+        """Returns the subset of `columns` present in df and numeric, warning about the rest."""
+        valid = []
+        for col in columns:
+            if col not in df.columns:
+                print(f"Warning: Column '{col}' not found for scaling. Skipping.")
+            elif not pd.api.types.is_numeric_dtype(df[col]):
+                print(f"Warning: Column '{col}' is not numeric. Skipping scaling.")
+            else:
+                valid.append(col)
+        return valid
+
     def scale_numerical_features(self, df, columns, scaler_type="minmax", **kwargs):
         """
         Scales specified numerical columns using a chosen scaler.
 
+        All valid columns are scaled together in one vectorized pass by a single
+        multi-column scaler, which is stored in `self.scalers` under each column name.
+
         Args:
             df (pd.DataFrame): The DataFrame to transform.
             columns (list of str): List of numerical column names to scale.
-            scaler_type (str): Type of scaler to use ('minmax', 'standard', etc.).
-                               Currently only 'minmax' is implemented.
+            scaler_type (str): Type of scaler to use ('minmax', 'standard' or 'robust').
             **kwargs: Additional arguments for the scaler.
 
         Returns:
@@ -113,54 +199,177 @@ class DataTransformer:
 
         print(f"Scaling numerical features: {columns} using {scaler_type} scaler...")
 
-        for col in columns:
-            if col not in df.columns:
-                print(f"Warning: Column '{col}' not found for scaling. Skipping.")
-                continue
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                print(f"Warning: Column '{col}' is not numeric. Skipping scaling.")
-                continue
-
-            feature_data = df[[col]].copy()  # Scaler expects 2D array
-
-            # Handle NaN values before scaling: either error, impute, or skip.
-            # For simplicity here, we'll proceed, but MinMaxScaler will error on NaNs.
-            if feature_data.isnull().values.any():
+        valid = self._numeric_columns(df, columns)
+        if not valid:
+            return df
+        if scaler_type not in SCALERS:
+            for col in valid:
                 print(
-                    f"Warning: Column '{col}' contains NaN values. Scaler may fail or produce NaNs."
+                    f"Warning: Scaler type '{scaler_type}' not recognized. Skipping column '{col}'."
                 )
-                # df[col] = df[col].fillna(df[col].mean()) # Example: Impute NaNs - careful with data leakage
+            return df
 
-            if scaler_type == "minmax":
-                scaler = MinMaxScaler(**kwargs)
-            # Elif scaler_type == 'standard':
-            # from sklearn.preprocessing import StandardScaler
-            #     scaler = StandardScaler(**kwargs)
-            else:
+        # NaNs are ignored when fitting and kept as NaN in the output.
+        for col in valid:
+            if df[col].isnull().any():
                 print(
-                    f"Warning: Scaler type '{scaler_type}' not recognized. Skipping column '{col}'."
+                    f"Warning: Column '{col}' contains NaN values. Scaler may fail or produce NaNs."
                 )
-                continue
 
-            try:
-                # Fit and transform the column
-                scaled_values = scaler.fit_transform(feature_data)
-                # Update the DataFrame column with scaled values
-                df[col] = scaled_values
-                self.scalers[col] = scaler  # Store the fitted scaler
-            except Exception as e:
+        scaler = SCALERS[scaler_type](**kwargs)
+        try:
+            scaled_values = scaler.fit_transform(df[valid].to_numpy(dtype=np.float64))
+        except Exception as e:
+            for col in valid:
                 print(f"Error scaling column '{col}': {e}")
+            return df
+
+        df[valid] = scaled_values
+        self._store_scaler(valid, scaler)
         return df
 
-    def encode_categorical_features(self, df, columns, encoder_type="onehot", **kwargs):
+    def _store_scaler(self, columns, scaler):
+        # Re-insert keys so that grouping self.scalers by scaler (see _scaler_groups)
+        # yields the columns in the order the scaler was fitted on.
+        for col in columns:
+            self.scalers.pop(col, None)
+            self.scalers[col] = scaler
+
+    def _scaler_groups(self):
+        """Returns [(columns, scaler), ...] for each distinct fitted scaler."""
+        groups = {}
+        for col, scaler in self.scalers.items():
+            groups.setdefault(id(scaler), ([], scaler))[0].append(col)
+        return list(groups.values())
+
+    def fit_partial(self, chunk, columns, scaler_type="minmax", **kwargs):
+        """
+        Updates scaling statistics from one chunk of a streamed dataset.
+
+        Call repeatedly over all chunks, then apply the learned scaling chunk by
+        chunk with `transform`. Only scalers supporting incremental fitting
+        ('minmax', 'standard') can be used.
+
+        Args:
+            chunk (pd.DataFrame): The next chunk of data.
+            columns (list of str): Numerical columns to learn statistics for.
+            scaler_type (str): 'minmax' or 'standard'.
+            **kwargs: Arguments for a newly created scaler.
+
+        Returns:
+            DataTransformer: self, for chaining.
+        """
+        if scaler_type not in SCALERS:
+            raise ValueError(f"Scaler type '{scaler_type}' not recognized.")
+        if not hasattr(SCALERS[scaler_type], "partial_fit"):
+            raise ValueError(
+                f"Scaler type '{scaler_type}' cannot be fitted incrementally."
+            )
+
+        valid = self._numeric_columns(chunk, columns)
+        if not valid:
+            return self
+
+        scaler = self.scalers.get(valid[0])
+        fitted_columns = next(
+            (cols for cols, s in self._scaler_groups() if s is scaler), None
+        )
+        if not isinstance(scaler, SCALERS[scaler_type]) or fitted_columns != valid:
+            scaler = SCALERS[scaler_type](**kwargs)
+            self._store_scaler(valid, scaler)
+        scaler.partial_fit(chunk[valid].to_numpy(dtype=np.float64))
+        return self
+
+    def transform(self, chunk):
+        """
+        Applies the fitted scalers, then the fitted encoders, to new data without refitting.
+
+        Args:
+            chunk (pd.DataFrame): Data containing (some of) the fitted columns.
+
+        Returns:
+            pd.DataFrame: A transformed copy of the chunk.
+        """
+        result = chunk.copy(deep=False)
+        for cols, scaler in self._scaler_groups():
+            if len(cols) != scaler.n_features_in_:
+                print(f"Warning: Scaler for columns {cols} was partially refitted. Skipping.")
+            elif all(col in result.columns for col in cols):
+                result[cols] = scaler.transform(result[cols].to_numpy(dtype=np.float64))
+            else:
+                print(f"Warning: Columns {cols} not all present. Skipping scaling.")
+
+        blocks, encoded_cols = [], []
+        for col, encoder in self.encoders.items():
+            if col not in result.columns:
+                print(f"Warning: Column '{col}' not found for encoding. Skipping.")
+                continue
+            block = self._encode_block(encoder, result[col], col, result.index)
+            if isinstance(encoder, CategoryCodeEncoder):
+                result[col] = block[col]
+            else:
+                blocks.append(block)
+                encoded_cols.append(col)
+        if blocks:
+            result = pd.concat([result.drop(columns=encoded_cols), *blocks], axis=1)
+        return result
+
+    def _fit_encoder(self, values, col, encoder_type, sparse, drop, n_features, kwargs):
+        """Creates and fits one encoder for a column, or returns None for unknown types."""
+        if encoder_type == "onehot":
+            # Default to drop=None which keeps all categories. 'first' drops the first to avoid multicollinearity.
+            encoder = OneHotEncoder(
+                sparse_output=sparse,
+                handle_unknown="ignore",
+                drop=drop,
+                **kwargs,
+            )
+            return encoder.fit(values.to_frame())
+        elif encoder_type == "ordinal":
+            return CategoryCodeEncoder().fit(values)
+        elif encoder_type == "hashing":
+            return HashingEncoder(n_features=n_features, sparse=sparse).fit(values)
+        return None
+
+    @staticmethod
+    def _encoder_matrix(encoder, values):
+        """Encoded values of one column as a 2-D array or sparse matrix."""
+        if isinstance(encoder, OneHotEncoder):
+            return encoder.transform(values.to_frame())
+        return encoder.transform(values)
+
+    def _encode_block(self, encoder, values, col, index):
+        """Encoded values of one column as a DataFrame block (dense or SparseDtype)."""
+        if isinstance(encoder, CategoryCodeEncoder):
+            return pd.DataFrame({col: encoder.transform(values)}, index=index)
+
+        encoded = self._encoder_matrix(encoder, values)
+        feature_names = encoder.get_feature_names_out([col])
+        if sp.issparse(encoded):
+            if isinstance(encoder, HashingEncoder) and not encoder.sparse:
+                encoded = encoded.toarray()
+            else:
+                return sparse_frame(encoded, feature_names, index)
+        return pd.DataFrame(encoded, columns=feature_names, index=index)
+
+    def encode_categorical_features(
+        self, df, columns, encoder_type="onehot", sparse=False, n_features=32, **kwargs
+    ):
         """
         Encodes specified categorical columns.
 
+        All encoded blocks are joined to the frame in a single concat.
+
         Args:
             df (pd.DataFrame): The DataFrame to transform.
             columns (list of str): List of categorical column names to encode.
-            encoder_type (str): Type of encoder ('onehot', 'label').
-                                Currently only 'onehot' is implemented.
+            encoder_type (str): Type of encoder:
+                - 'onehot': one indicator column per level.
+                - 'ordinal': integer category codes in place (NaN/unseen -> -1).
+                - 'hashing': `n_features` hashed indicator columns regardless of cardinality.
+            sparse (bool): For 'onehot'/'hashing', produce pandas SparseDtype columns
+                           instead of dense float64 blocks.
+            n_features (int): Column budget per column for 'hashing'.
             **kwargs: Additional arguments for the encoder (e.g., drop='first' for OneHotEncoder).
 
         Returns:
@@ -175,57 +384,71 @@ class DataTransformer:
             f"Encoding categorical features: {columns} using {encoder_type} encoder..."
         )
 
+        drop_behavior = kwargs.pop("drop", None)
+        blocks = []
+        encoded_cols = []
         for col in columns:
             if col not in df.columns:
                 print(f"Warning: Column '{col}' not found for encoding. Skipping.")
                 continue
-            # It's good practice to ensure the column is treated as categorical/object
-            # if not pd.api.types.is_object_dtype(df[col]) and not pd.api.types.is_categorical_dtype(df[col]):
-            #     print(f"Warning: Column '{col}' may not be categorical. Proceeding with encoding.")
-
-            if encoder_type == "onehot":
-                # Handle NaN values before encoding if necessary.
-                # OneHotEncoder can handle NaNs if configured (e.g., handle_unknown='ignore' or by imputation)
-                # For simplicity, let's fill NaNs with a placeholder string if this is desired.
-                # current_col_data = df[[col]].fillna('Unknown') # Example: fill NaNs
-                current_col_data = df[[col]]
-
-                # Default to drop=None which keeps all categories. 'first' drops the first to avoid multicollinearity.
-                drop_behavior = kwargs.pop("drop", None)
-                encoder = OneHotEncoder(
-                    sparse_output=False,
-                    handle_unknown="ignore",
-                    drop=drop_behavior,
-                    **kwargs,
+            if encoder_type not in ("onehot", "ordinal", "hashing"):
+                print(
+                    f"Warning: Encoder type '{encoder_type}' not recognized. Skipping column '{col}'."
                 )
+                continue
 
-                try:
-                    encoded_data = encoder.fit_transform(current_col_data)
-                    feature_names = encoder.get_feature_names_out([col])
+            try:
+                encoder = self._fit_encoder(
+                    df[col], col, encoder_type, sparse, drop_behavior, n_features, kwargs
+                )
+                blocks.append(self._encode_block(encoder, df[col], col, df.index))
+                encoded_cols.append(col)
+                self.encoders[col] = encoder  # Store fitted encoder
+            except Exception as e:
+                print(f"Error encoding column '{col}' with {encoder_type} encoder: {e}")
 
-                    encoded_df = pd.DataFrame(
-                        encoded_data, columns=feature_names, index=df.index
-                    )
+        if not blocks:
+            return df
+        if encoder_type == "ordinal":
+            return df.assign(**{block.columns[0]: block.iloc[:, 0] for block in blocks})
+        # Drop original columns and concatenate all new encoded columns at once
+        return pd.concat([df.drop(columns=encoded_cols), *blocks], axis=1)
 
-                    # Drop original column and concatenate new encoded columns
-                    df = df.drop(col, axis=1)
-                    df = pd.concat([df, encoded_df], axis=1)
-                    self.encoders[col] = encoder  # Store fitted encoder
-                except Exception as e:
-                    print(f"Error encoding column '{col}' with OneHotEncoder: {e}")
-            # Elif encoder_type == 'label':
-            # from sklearn.preprocessing import LabelEncoder
-            #     encoder = LabelEncoder(**kwargs)
-            #     try:
-            #         df[col] = encoder.fit_transform(df[col].astype(str)) # LabelEncoder prefers string input
-            #         self.encoders[col] = encoder
-            #     except Exception as e:
-            # print(f"Error label encoding column '{col}': {e}")
-            else:
-                print(
-                    f"Warning: Encoder type '{encoder_type}' not recognized. Skipping column '{col}'."
-                )
-        return df
+    def encode_to_matrix(self, df, columns, encoder_type="onehot", n_features=32, **kwargs):
+        """
+        Encodes categorical columns straight into a scipy CSR matrix.
+
+        Useful for very high-cardinality columns that should never be materialized
+        as DataFrame columns. Fitted encoders are stored in `self.encoders`.
+
+        Args:
+            df (pd.DataFrame): The data to encode.
+            columns (list of str): Columns to encode ('onehot' or 'hashing').
+            encoder_type (str): 'onehot' or 'hashing'.
+            n_features (int): Column budget per column for 'hashing'.
+            **kwargs: Additional arguments for OneHotEncoder.
+
+        Returns:
+            tuple: (scipy.sparse.csr_matrix, list of feature names)
+        """
+        if encoder_type not in ("onehot", "hashing"):
+            raise ValueError(f"Encoder type '{encoder_type}' cannot produce a sparse matrix.")
+
+        drop_behavior = kwargs.pop("drop", None)
+        matrices, names = [], []
+        for col in columns:
+            if col not in df.columns:
+                print(f"Warning: Column '{col}' not found for encoding. Skipping.")
+                continue
+            encoder = self._fit_encoder(
+                df[col], col, encoder_type, True, drop_behavior, n_features, kwargs
+            )
+            matrices.append(sp.csr_matrix(self._encoder_matrix(encoder, df[col])))
+            names.extend(encoder.get_feature_names_out([col]))
+            self.encoders[col] = encoder
+        if not matrices:
+            return sp.csr_matrix((len(df), 0)), []
+        return sp.hstack(matrices, format="csr"), names
 
     def get_transformed_data(self):
         """
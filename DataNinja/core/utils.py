@@ -1,8 +1,11 @@
+import hashlib
 import logging
 import os
 import json
 from datetime import datetime
 
+import pandas as pd
+
 
 # --- Configuration Loading ---
 def load_config(config_path="config.json"):
@@ -97,4 +100,27 @@ def generate_timestamped_filename(base_name, extension, prefix=""):
         return f"{base_name}_{timestamp}.{clean_extension}"
 
 
+# --- Data Fingerprinting ---
+def fingerprint_dataframe(df):
+    """
+    Computes a content fingerprint of a DataFrame: equal data, index, column
+    names and dtypes give the same hex digest across runs.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to fingerprint.
 
+    Returns:
+        str: A 32-character hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    for col in range(df.shape[1]):
+        # Hash column by column so mixed dtypes are not upcast to object.
+        values = df.iloc[:, col]
+        try:
+            hashes = pd.util.hash_pandas_object(values, index=False)
+        except TypeError:  # Unhashable cells such as lists or dicts
+            hashes = pd.util.hash_pandas_object(values.astype(str), index=False)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
@@ -25,6 +25,16 @@ class CSVHandler(DataLoader):
         except Exception as e:
             raise Exception(f"Error loading {self.source}: {e}")
 
+    def iter_chunks(self, chunksize=100_000, **kwargs):
+        """Yield CSV data as DataFrames of at most `chunksize` rows."""
+        if not os.path.exists(self.source):
+            raise FileNotFoundError(f"File not found: {self.source}")
+        try:
+            with pd.read_csv(self.source, chunksize=chunksize, **kwargs) as reader:
+                yield from reader
+        except pd.errors.EmptyDataError:
+            return
+
     def save_data(self, data, target_path=None, **kwargs):
         """Save DataFrame to CSV file."""
         if target_path is None:
@@ -31,6 +31,30 @@ class JSONHandler(DataLoader):
         except Exception as e:
             raise Exception(f"Error loading {self.source}: {e}")
 
+    def iter_chunks(self, chunksize=100_000, **kwargs):
+        """
+        Yield JSON data as DataFrames of at most `chunksize` rows.
+
+        Newline-delimited JSON (what `save_data` writes for DataFrames) is streamed;
+        a top-level JSON array has to be parsed whole and is then sliced.
+        """
+        if not os.path.exists(self.source):
+            raise FileNotFoundError(f"File not found: {self.source}")
+
+        encoding = kwargs.get('encoding', 'utf-8')
+        with open(self.source, 'r', encoding=encoding) as f:
+            head = f.read(1024).lstrip()
+        if not head:
+            return
+        if head.startswith('['):
+            df = pd.DataFrame(self.load_data(**kwargs))
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+            return
+
+        with pd.read_json(self.source, lines=True, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
     def save_data(self, data, target_path=None, **kwargs):
         """Save data to JSON file."""
         if target_path is None:
@@ -18,8 +18,8 @@ class SQLiteHandler(DataLoader):
         """Create SQLite connection."""
         return sqlite3.connect(self.source, **(connect_args or {}))
 
-    def load_data(self, table_name=None, query=None, **kwargs):
-        """Load data from SQLite database."""
+    def _build_query(self, table_name=None, query=None):
+        """Validate arguments and return the SQL to run."""
         if not (table_name or query):
             raise ValueError("Either 'table_name' or 'query' must be provided")
         if table_name and query:
@@ -29,15 +29,28 @@ class SQLiteHandler(DataLoader):
         if table_name:
             if not table_name.replace("_", "").isalnum():
                 raise ValueError(f"Invalid table_name: '{table_name}'")
-            sql = f"SELECT * FROM {table_name}"
-        else:
-            sql = query
+            return f"SELECT * FROM {table_name}"
+        return query
+
+    def load_data(self, table_name=None, query=None, **kwargs):
+        """Load data from SQLite database."""
+        sql = self._build_query(table_name, query)
         
         # Execute query
         connect_args = kwargs.pop("connect_args", {})
         with self._connect(connect_args) as conn:
             return pd.read_sql_query(sql, conn, **kwargs)
 
+    def iter_chunks(self, table_name=None, query=None, chunksize=100_000, **kwargs):
+        """Yield query results as DataFrames of at most `chunksize` rows."""
+        sql = self._build_query(table_name, query)
+        connect_args = kwargs.pop("connect_args", {})
+        conn = self._connect(connect_args)
+        try:
+            yield from pd.read_sql_query(sql, conn, chunksize=chunksize, **kwargs)
+        finally:
+            conn.close()
+
     def save_data(self, data, table_name, if_exists="fail", index=False, **kwargs):
         """Save DataFrame to SQLite database."""
         if not isinstance(data, pd.DataFrame):
@@ -1,75 +1,94 @@
 import math
 
+import numpy as np
+import pandas as pd
+
+from ..core.expressions import Expression
+from .units import UnitRegistry, _as_array, _is_array, _like, get_default_registry
+
 
 class CalculatorProcessor:
-    """Scientific calculator with unit conversion capabilities."""
-    
-    def sin(self, value: float) -> float:
+    """
+    Scientific calculator with unit conversion capabilities.
+
+    Every method accepts a single number (computed with `math`, as before) or an
+    array-like/Series, which is computed in one pass with numpy ufuncs; Series
+    results keep the input's index. Missing values in arrays propagate as NaN.
+    """
+
+    def __init__(self, registry: UnitRegistry = None):
+        """
+        Args:
+            registry: Units to convert with (default: the shared built-in registry).
+        """
+        self.registry = registry if registry is not None else get_default_registry()
+
+    def sin(self, value):
         """Calculate sine of value (in radians)."""
+        if _is_array(value):
+            return _like(np.sin(_as_array(value)), value)
         return math.sin(value)
 
-    def cos(self, value: float) -> float:
+    def cos(self, value):
         """Calculate cosine of value (in radians)."""
+        if _is_array(value):
+            return _like(np.cos(_as_array(value)), value)
         return math.cos(value)
 
-    def tan(self, value: float) -> float:
+    def tan(self, value):
         """Calculate tangent of value (in radians)."""
+        if _is_array(value):
+            return _like(np.tan(_as_array(value)), value)
         return math.tan(value)
 
-    def log(self, value: float, base: float = None) -> float:
+    def log(self, value, base: float = None):
         """Calculate logarithm. Natural log if base is None."""
+        if base is not None and (base <= 0 or base == 1):
+            raise ValueError("Logarithm base must be positive and not equal to 1")
+        if _is_array(value):
+            values = _as_array(value)
+            if (values <= 0).any():
+                raise ValueError("Logarithm input must be positive")
+            result = np.log(values) if base is None else np.log(values) / math.log(base)
+            return _like(result, value)
         if value <= 0:
             raise ValueError("Logarithm input must be positive")
         if base is None:
             return math.log(value)
-        if base <= 0 or base == 1:
-            raise ValueError("Logarithm base must be positive and not equal to 1")
         return math.log(value, base)
 
-    def sqrt(self, value: float) -> float:
+    def sqrt(self, value):
         """Calculate square root of value."""
+        if _is_array(value):
+            values = _as_array(value)
+            if (values < 0).any():
+                raise ValueError("Square root input must be non-negative")
+            return _like(np.sqrt(values), value)
         if value < 0:
             raise ValueError("Square root input must be non-negative")
         return math.sqrt(value)
 
-    def convert_unit(self, value: float, from_unit: str, to_unit: str, category: str) -> float:
-        """Convert value between units within a category."""
-        if category == "temperature":
-            # Convert to Celsius first
-            if from_unit == "F":
-                celsius = (value - 32) * 5/9
-            elif from_unit == "K":
-                celsius = value - 273.15
-            elif from_unit == "C":
-                celsius = value
-            else:
-                raise ValueError(f"Unknown temperature unit: {from_unit}")
-
-            # Convert from Celsius to target
-            if to_unit == "F":
-                return (celsius * 9/5) + 32
-            elif to_unit == "K":
-                return celsius + 273.15
-            elif to_unit == "C":
-                return celsius
-            else:
-                raise ValueError(f"Unknown temperature unit: {to_unit}")
-
-        # Length and weight conversions
-        conversions = {
-            "length": {"m": 1.0, "km": 1000.0, "ft": 0.3048, "mile": 1609.34},
-            "weight": {"kg": 1.0, "g": 0.001, "lb": 0.453592, "oz": 0.0283495}
-        }
-
-        if category not in conversions:
-            raise ValueError(f"Unknown category: {category}")
-
-        units = conversions[category]
-        if from_unit not in units or to_unit not in units:
-            raise ValueError(f"Unknown units in {category}: {from_unit}, {to_unit}")
-
-        # Convert via base unit
-        base_value = value * units[from_unit]
-        return base_value / units[to_unit]
+    def conversion_factors(self, from_unit: str, to_unit: str, category: str) -> tuple:
+        """
+        Returns (scale, offset) such that converted = value * scale + offset.
+
+        Every supported conversion is affine, so whole columns convert with a
+        single multiply-add.
+        """
+        return self.registry.factors(from_unit, to_unit, category)
+
+    def convert_unit(self, value, from_unit: str, to_unit: str, category: str):
+        """
+        Convert value (a number or array-like/Series) between units within a category.
+
+        Units may be compound (m/s, km/h, kg/m^3); see plugins.units.UnitRegistry.
+        """
+        return self.registry.convert(value, from_unit, to_unit, category)
 
+    def evaluate(self, expression: str, data=None):
+        """
+        Evaluate an arithmetic expression over columns of `data` (vectorized).
 
+        See core.expressions.Expression for the allowed syntax.
+        """
+        return Expression(expression).evaluate(data)
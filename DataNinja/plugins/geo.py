@@ -1,4 +1,314 @@
+import hashlib
 import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS = {"km": 6371.0, "miles": 3959.0}
+
+
+def _earth_radius(unit: str) -> float:
+    if unit not in EARTH_RADIUS:
+        raise ValueError("Unit must be 'km' or 'miles'")
+    return EARTH_RADIUS[unit]
+
+
+def _as_points(points) -> np.ndarray:
+    """(lat, lon) pairs in degrees as an (n, 2) float array."""
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1 and len(points) == 2:
+        points = points.reshape(1, 2)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Points must be an (n, 2) array of (latitude, longitude) pairs")
+    return points
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    """(lat, lon) in degrees as (n, 3) points on the unit sphere."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _read_table(path: str, columns: list, table: str = None) -> pd.DataFrame:
+    """Reads `columns` from a CSV file or a SQLite database (first table unless `table` is given)."""
+    if not path.lower().endswith((".sqlite", ".db")):
+        return pd.read_csv(path, usecols=columns)
+    with sqlite3.connect(path) as conn:
+        if table is None:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"No tables found in '{path}'")
+            table = row[0]
+        if not table.replace("_", "").isalnum():
+            raise ValueError(f"Invalid table_name: '{table}'")
+        return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {table}", conn)
+
+
+class GeoIndex:
+    """
+    Nearest-neighbour index over reference points (e.g. stores or towns).
+
+    tree='ball' is a BallTree on radians with the haversine metric. tree='kd'
+    is a KD-tree over 3D unit vectors: the straight-line (chord) distance
+    orders neighbours the same way as the great-circle distance, so cheap
+    Euclidean queries give exact results, several times faster, and can run on
+    multiple threads.
+
+    Reference points with missing coordinates are left out of the tree; query
+    results always refer to positions in the original reference arrays. The
+    index is saved with joblib and loaded memory-mapped, so large references are
+    built once and reused across runs (see `cached`).
+    """
+
+    TREES = ("ball", "kd")
+
+    def __init__(self, lat, lon, leaf_size: int = 40, tree: str = "ball"):
+        """
+        Args:
+            lat, lon: Reference coordinates in degrees.
+            leaf_size: Tree leaf size.
+            tree: 'ball' (haversine BallTree) or 'kd' (KD-tree over unit vectors).
+        """
+        if tree not in self.TREES:
+            raise ValueError(f"Unsupported tree: {tree}. Use 'ball' or 'kd'.")
+        points = np.column_stack([np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)])
+        valid = np.isfinite(points).all(axis=1)
+        if not valid.any():
+            raise ValueError("Reference data has no valid coordinates")
+        self.ids = np.flatnonzero(valid)
+        self.size = len(points)
+        self.kind = tree
+        if tree == "kd":
+            self.tree = cKDTree(_unit_vectors(points[valid, 0], points[valid, 1]), leafsize=leaf_size)
+        else:
+            self.tree = BallTree(np.radians(points[valid]), leaf_size=leaf_size, metric="haversine")
+
+    def _query_batch(self, points: np.ndarray, k: int, workers: int):
+        if self.kind == "ball":
+            return self.tree.query(np.radians(points), k=k)
+        chord, idx = self.tree.query(_unit_vectors(points[:, 0], points[:, 1]), k=k, workers=workers)
+        chord, idx = chord.reshape(len(points), k), idx.reshape(len(points), k)
+        return 2 * np.arcsin(np.clip(chord / 2, 0.0, 1.0)), idx
+
+    def query(self, lat, lon, k: int = 1, unit: str = "km", batch_size: int = 100_000, workers: int = 1):
+        """
+        Finds the `k` nearest reference points for every query point.
+
+        Args:
+            lat, lon: Query coordinates in degrees.
+            k: Number of neighbours per point.
+            unit: 'km' or 'miles'
+            batch_size: Query points per tree call, bounding the memory of the results.
+            workers: Threads per query for tree='kd' (-1: all cores).
+
+        Returns:
+            tuple: (distances, indices), both of shape (n, k) and sorted by distance.
+                   Rows with missing coordinates get NaN distances and index -1.
+        """
+        R = _earth_radius(unit)
+        if not 1 <= k <= len(self.ids):
+            raise ValueError(f"k must be between 1 and {len(self.ids)}")
+        points = np.column_stack([np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)])
+        distances = np.full((len(points), k), np.nan)
+        indices = np.full((len(points), k), -1, dtype=np.int64)
+        valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+        for start in range(0, len(valid), batch_size):
+            rows = valid[start : start + batch_size]
+            angle, idx = self._query_batch(points[rows], k, workers)
+            distances[rows] = angle * R
+            indices[rows] = self.ids[idx]
+        return distances, indices
+
+    def save(self, path: str) -> None:
+        joblib.dump(self, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def load(path: str, mmap_mode: str = "r") -> "GeoIndex":
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    @classmethod
+    def cached(cls, lat, lon, cache_dir: str = ".dataninja_geo", leaf_size: int = 40,
+               tree: str = "ball") -> "GeoIndex":
+        """
+        Loads the index for these reference coordinates from `cache_dir`, building
+        and saving it on the first call. Entries are keyed by a hash of the
+        coordinates and the tree settings.
+        """
+        lat = np.ascontiguousarray(lat, dtype=np.float64)
+        lon = np.ascontiguousarray(lon, dtype=np.float64)
+        digest = hashlib.sha256()
+        for values in (lat, lon):
+            digest.update(values.tobytes())
+        digest.update(f"{leaf_size}:{tree}".encode("utf-8"))
+        path = os.path.join(cache_dir, f"{digest.hexdigest()[:32]}.{tree}tree.joblib")
+        if os.path.exists(path):
+            try:
+                return cls.load(path)
+            except Exception as e:
+                print(f"Warning: Could not read geo index '{path}': {e}. Rebuilding it.")
+        index = cls(lat, lon, leaf_size=leaf_size, tree=tree)
+        os.makedirs(cache_dir, exist_ok=True)
+        index.save(path)
+        return index
+
+
+# Token rewrites applied by normalize_address so common spellings share a key.
+ADDRESS_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "av": "ave", "road": "rd", "boulevard": "blvd",
+    "drive": "dr", "lane": "ln", "court": "ct", "place": "pl", "square": "sq",
+    "highway": "hwy", "parkway": "pkwy", "terrace": "ter", "suite": "ste",
+    "apartment": "apt", "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+    "mount": "mt", "saint": "st", "fort": "ft",
+}
+
+
+def normalize_address(address: str) -> str:
+    """Lowercases, strips punctuation and abbreviates common tokens ('North Main Street' -> 'n main st')."""
+    tokens = re.sub(r"[^\w\s]", " ", str(address).lower()).split()
+    return " ".join(ADDRESS_ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+class Gazetteer:
+    """
+    A local address -> coordinates table (CSV or SQLite) indexed by normalized address.
+    """
+
+    def __init__(self, path: str, address_col: str = "address", lat_col: str = "latitude",
+                 lon_col: str = "longitude", table: str = None):
+        """
+        Args:
+            path: CSV file or SQLite database (.sqlite/.db).
+            address_col, lat_col, lon_col: Column names in the gazetteer.
+            table: SQLite table (default: the first table).
+        """
+        self.path = path
+        data = _read_table(path, [address_col, lat_col, lon_col], table)
+
+        self.addresses = data[address_col].astype(str).to_numpy()
+        self.lat = pd.to_numeric(data[lat_col], errors="coerce").to_numpy(dtype=np.float64)
+        self.lon = pd.to_numeric(data[lon_col], errors="coerce").to_numpy(dtype=np.float64)
+        self.index = {}
+        for position, key in enumerate(map(normalize_address, self.addresses)):
+            self.index.setdefault(key, position)  # first occurrence wins
+        stat = os.stat(path)
+        # Identifies this gazetteer version in the geocode cache.
+        self.version = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def __len__(self):
+        return len(self.index)
+
+    def lookup(self, address: str):
+        """Returns a geocode result dict for `address`, or None if it is not in the gazetteer."""
+        position = self.index.get(normalize_address(address))
+        if position is None:
+            return None
+        return {
+            "latitude": float(self.lat[position]),
+            "longitude": float(self.lon[position]),
+            "address_found": self.addresses[position],
+            "confidence": "exact",
+        }
+
+
+class GeocodeCache:
+    """
+    Persistent geocode results in a SQLite file with least-recently-used eviction.
+
+    Misses are cached too, so unresolvable addresses are not looked up again
+    until the gazetteer changes (its version is part of every key). The cache
+    is safe to share between threads.
+    """
+
+    def __init__(self, path: str = ".dataninja_geocode.sqlite", max_entries: int = 1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._last_tick = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "key TEXT PRIMARY KEY, latitude REAL, longitude REAL, address_found TEXT, "
+            "confidence TEXT, last_used INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS geocode_lru ON geocode(last_used)")
+        self._conn.commit()
+
+    def _tick(self) -> int:
+        # Strictly increasing, so LRU order holds even on coarse clocks.
+        self._last_tick = max(time.time_ns(), self._last_tick + 1)
+        return self._last_tick
+
+    @staticmethod
+    def key(namespace: str, address: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{normalize_address(address)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list) -> dict:
+        """Cached results for `keys` (None for cached misses); absent keys are not in the cache."""
+        found = {}
+        with self._lock:
+            now = self._tick()
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                rows = self._conn.execute(
+                    "SELECT key, latitude, longitude, address_found, confidence FROM geocode "
+                    f"WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, lat, lon, found_address, confidence in rows:
+                    found[key] = None if confidence is None else {
+                        "latitude": lat,
+                        "longitude": lon,
+                        "address_found": found_address,
+                        "confidence": confidence,
+                    }
+            self._conn.executemany(
+                "UPDATE geocode SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self._conn.commit()
+        return found
+
+    def put_many(self, results: dict) -> None:
+        """Stores {key: result or None} and evicts the least recently used entries over the limit."""
+        with self._lock:
+            now = self._tick()
+        rows = [
+            (key, *((r["latitude"], r["longitude"], r["address_found"], r["confidence"]) if r else (None,) * 4), now)
+            for key, r in results.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)", rows)
+            excess = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM geocode WHERE key IN "
+                    "(SELECT key FROM geocode ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
 
 
 class GeoProcessor:
@@ -40,18 +350,156 @@ class GeoProcessor:
         
         return R * c
 
-    def geocode_address(self, address: str, api_key: str = None) -> dict:
+    def distance_array(self, lat1, lon1, lat2, lon2, unit: str = "km") -> np.ndarray:
         """
-        Placeholder geocoding function (returns mock data).
-        
+        Vectorized Haversine distance between pairs of points.
+
+        Args:
+            lat1, lon1, lat2, lon2: Coordinates in degrees; arrays, Series or scalars
+                                    that broadcast against each other.
+            unit: 'km' or 'miles'
+
+        Returns:
+            np.ndarray of distances; NaN where any coordinate is missing.
+        """
+        R = _earth_radius(unit)
+        lat1, lon1, lat2, lon2 = (
+            np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2)
+        )
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def distance_matrix(self, points_a, points_b, unit: str = "km", block_size: int = None,
+                        max_block_bytes: int = 64 * 1024**2, out=None, dtype=np.float64) -> np.ndarray:
+        """
+        Haversine distances between every point of `points_a` and every point of `points_b`.
+
+        Rows are computed in blocks so the temporaries never exceed
+        `max_block_bytes`; pass a preallocated `out` (e.g. an np.memmap) to keep
+        the result itself out of memory as well.
+
+        Args:
+            points_a: (n, 2) array-like of (lat, lon) in degrees.
+            points_b: (m, 2) array-like of (lat, lon) in degrees.
+            unit: 'km' or 'miles'
+            block_size: Rows of `points_a` per block (default: derived from max_block_bytes).
+            max_block_bytes: Memory budget for one block's temporaries.
+            out: Optional (n, m) array to write into.
+            dtype: dtype of the result when `out` is not given.
+
+        Returns:
+            np.ndarray of shape (n, m).
+        """
+        R = _earth_radius(unit)
+        a, b = np.radians(_as_points(points_a)), np.radians(_as_points(points_b))
+        n, m = len(a), len(b)
+        if out is None:
+            out = np.empty((n, m), dtype=dtype)
+        elif out.shape != (n, m):
+            raise ValueError(f"'out' must have shape {(n, m)}, got {out.shape}")
+        if block_size is None:
+            # About four float64 temporaries of shape (block, m) are alive at once.
+            block_size = max(1, int(max_block_bytes // (4 * 8 * max(m, 1))))
+
+        lat_b, lon_b = b[:, 0], b[:, 1]
+        cos_b = np.cos(lat_b)
+        for start in range(0, n, block_size):
+            lat_a = a[start : start + block_size, 0:1]
+            lon_a = a[start : start + block_size, 1:2]
+            h = np.sin((lat_b - lat_a) / 2) ** 2
+            h += np.cos(lat_a) * cos_b * np.sin((lon_b - lon_a) / 2) ** 2
+            np.clip(h, 0.0, 1.0, out=h)
+            out[start : start + block_size] = 2 * R * np.arcsin(np.sqrt(h, out=h), out=h)
+        return out
+
+    def nearest(self, lat, lon, ref_lat, ref_lon, k: int = 1, unit: str = "km", cache_dir: str = None):
+        """
+        For every point, the `k` closest reference points.
+
+        Args:
+            lat, lon: Query coordinates in degrees.
+            ref_lat, ref_lon: Reference coordinates in degrees.
+            k: Number of neighbours per point.
+            unit: 'km' or 'miles'
+            cache_dir: Directory to persist the reference index in (None: build in memory).
+
+        Returns:
+            tuple: (distances, indices) of shape (n, k); indices are reference positions.
+        """
+        if cache_dir:
+            index = GeoIndex.cached(ref_lat, ref_lon, cache_dir=cache_dir)
+        else:
+            index = GeoIndex(ref_lat, ref_lon)
+        return index.query(lat, lon, k=k, unit=unit)
+
+    def reverse_geocode_array(self, lat, lon, places, name_col: str = "name", lat_col: str = "latitude",
+                              lon_col: str = "longitude", columns: list = None, unit: str = "km",
+                              max_distance: float = None, cache_dir: str = ".dataninja_geo",
+                              workers: int = -1) -> pd.DataFrame:
+        """
+        Tags every point with its nearest place (town, region, ...).
+
+        The places are indexed with a KD-tree over unit vectors that is built
+        once per place dataset, persisted in `cache_dir` and memory-mapped on
+        later calls; whole columns are queried at once on `workers` threads.
+
+        Args:
+            lat, lon: Point coordinates in degrees.
+            places: DataFrame or path (csv/sqlite) of places.
+            name_col, lat_col, lon_col: Columns of `places`.
+            columns: Extra place columns to return (e.g. ['region', 'country']).
+            unit: 'km' or 'miles'
+            max_distance: Points farther than this from every place stay untagged.
+            cache_dir: Directory for the persisted index (None: build in memory).
+            workers: Query threads (-1: all cores).
+
+        Returns:
+            pd.DataFrame with the name column, the extra columns and 'distance',
+            one row per point; untagged rows hold missing values.
+        """
+        wanted = [name_col, *(columns or [])]
+        if isinstance(places, str):
+            places = _read_table(places, list(dict.fromkeys([*wanted, lat_col, lon_col])))
+        ref_lat = pd.to_numeric(places[lat_col], errors="coerce").to_numpy(dtype=np.float64)
+        ref_lon = pd.to_numeric(places[lon_col], errors="coerce").to_numpy(dtype=np.float64)
+        if cache_dir:
+            index = GeoIndex.cached(ref_lat, ref_lon, cache_dir=cache_dir, tree="kd")
+        else:
+            index = GeoIndex(ref_lat, ref_lon, tree="kd")
+
+        distances, indices = index.query(lat, lon, k=1, unit=unit, batch_size=1_000_000, workers=workers)
+        distances, indices = distances[:, 0], indices[:, 0]
+        hit = indices >= 0
+        if max_distance is not None:
+            hit &= distances <= max_distance
+        safe = np.where(hit, indices, 0)
+        result = pd.DataFrame(
+            {col: pd.Series(places[col].to_numpy()[safe]).where(hit) for col in wanted}
+        )
+        result["distance"] = np.where(hit, distances, np.nan)
+        return result
+
+    def geocode_address(self, address: str, api_key: str = None, gazetteer: Gazetteer = None) -> dict:
+        """
+        Geocode a single address.
+
+        With a gazetteer the address is resolved against it (None if it is not
+        found); otherwise mock data is returned.
+
         Args:
             address: Address to geocode
             api_key: API key (unused in mock)
+            gazetteer: Optional Gazetteer to resolve against
         """
         if not isinstance(address, str):
             raise TypeError("Address must be a string")
         if not address.strip():
             raise ValueError("Address cannot be empty")
+        if gazetteer is not None:
+            return gazetteer.lookup(address)
 
         # Return mock coordinates
         return {
@@ -60,3 +508,65 @@ class GeoProcessor:
             "address_found": "Mock Address",
             "confidence": "high"
         }
+
+    def geocode_batch(self, addresses, gazetteer: Gazetteer = None, cache: GeocodeCache = None,
+                      resolver=None, max_workers: int = 8) -> pd.DataFrame:
+        """
+        Geocode many addresses at once.
+
+        Addresses are deduplicated by their normalized form, looked up in the
+        cache in bulk, and only the misses are resolved, concurrently in a thread
+        pool (useful when `resolver` does I/O). New results are written back to
+        the cache in one transaction.
+
+        Args:
+            addresses: Iterable of address strings (missing values stay unresolved).
+            gazetteer: Gazetteer used when no `resolver` is given.
+            cache: Optional GeocodeCache.
+            resolver: Callable address -> result dict or None (default: gazetteer.lookup).
+            max_workers: Threads used for resolving cache misses.
+
+        Returns:
+            pd.DataFrame with latitude, longitude, address_found and confidence,
+            one row per input address in the same order.
+        """
+        if resolver is None:
+            if gazetteer is None:
+                raise ValueError("geocode_batch needs a gazetteer or a resolver")
+            resolver = gazetteer.lookup
+        namespace = gazetteer.version if gazetteer is not None else getattr(resolver, "__qualname__", "resolver")
+
+        addresses = pd.Series(list(addresses), dtype=object)
+        valid = addresses.map(lambda a: isinstance(a, str) and bool(a.strip()))
+        normalized = addresses[valid].map(normalize_address)
+        unique = {}
+        for address, key in zip(addresses[valid], normalized):
+            unique.setdefault(key, address)
+
+        keys = {key: GeocodeCache.key(namespace, key) for key in unique}
+        results = {}
+        if cache is not None:
+            cached = cache.get_many(list(keys.values()))
+            for key, cache_key in keys.items():
+                if cache_key in cached:
+                    results[key] = cached[cache_key]
+
+        misses = [key for key in unique if key not in results]
+        if misses:
+            if max_workers and max_workers > 1 and len(misses) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    resolved = list(executor.map(resolver, (unique[key] for key in misses)))
+            else:
+                resolved = [resolver(unique[key]) for key in misses]
+            results.update(zip(misses, resolved))
+            if cache is not None:
+                cache.put_many({keys[key]: results[key] for key in misses})
+
+        columns = ["latitude", "longitude", "address_found", "confidence"]
+        rows = [
+            results.get(key) or dict.fromkeys(columns)
+            for key in normalized.reindex(addresses.index)
+        ]
+        out = pd.DataFrame(rows, columns=columns, index=addresses.index)
+        out[["latitude", "longitude"]] = out[["latitude", "longitude"]].astype(np.float64)
+        return out
@@ -1,21 +1,408 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score
+import pandas as pd
+from sklearn.base import is_classifier, is_clusterer
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import (
+    LinearRegression,
+    LogisticRegression,
+    Ridge,
+    SGDClassifier,
+    SGDRegressor,
+)
+from sklearn.metrics import accuracy_score, get_scorer, precision_score, recall_score
+from sklearn.model_selection import (
+    KFold,
+    ParameterGrid,
+    ParameterSampler,
+    StratifiedKFold,
+    train_test_split,
+)
+from sklearn.naive_bayes import BernoulliNB, GaussianNB, MultinomialNB
+from sklearn.neighbors import KNeighborsClassifier
+
+from ..core.utils import fingerprint_dataframe
+
+# name -> (estimator class, whether it accepts n_jobs)
+MODEL_REGISTRY = {
+    "logistic_regression": (LogisticRegression, False),
+    "random_forest": (RandomForestClassifier, True),
+    "extra_trees": (ExtraTreesClassifier, True),
+    "gradient_boosting": (GradientBoostingClassifier, False),
+    "hist_gradient_boosting": (HistGradientBoostingClassifier, False),
+    "knn": (KNeighborsClassifier, True),
+    "linear_regression": (LinearRegression, True),
+    "ridge": (Ridge, False),
+    "random_forest_regressor": (RandomForestRegressor, True),
+    # Estimators below support partial_fit and can be trained out of core.
+    "sgd": (SGDClassifier, True),
+    "sgd_regressor": (SGDRegressor, False),
+    "gaussian_nb": (GaussianNB, False),
+    "multinomial_nb": (MultinomialNB, False),
+    "bernoulli_nb": (BernoulliNB, False),
+    "minibatch_kmeans": (MiniBatchKMeans, False),
+}
+
+
+def create_estimator(model_type: str, params: dict = None, n_jobs: int = None):
+    """Instantiate a registered estimator, passing n_jobs where the estimator supports it."""
+    if model_type not in MODEL_REGISTRY:
+        raise ValueError(f"Unsupported model_type: {model_type}")
+    cls, supports_n_jobs = MODEL_REGISTRY[model_type]
+    params = dict(params or {})
+    if n_jobs is not None and supports_n_jobs:
+        params.setdefault("n_jobs", n_jobs)
+    return cls(**params)
+
+
+def shuffle_batches(chunks, buffer_size: int = 10_000, batch_size: int = 1_000, random_state=None):
+    """
+    Approximately shuffles a stream of DataFrames using a bounded buffer.
+
+    Rows are pooled until `buffer_size` is reached; the pool is permuted, all but
+    half a buffer is emitted in batches of `batch_size`, and the rest is kept to
+    mix with later chunks. Memory stays around `buffer_size` rows plus one chunk.
+    """
+    rng = np.random.default_rng(random_state)
+    pool = None
+    keep = buffer_size // 2
+    for chunk in chunks:
+        pool = chunk if pool is None else pd.concat([pool, chunk])
+        if len(pool) < buffer_size:
+            continue
+        pool = pool.iloc[rng.permutation(len(pool))]
+        emit, pool = pool.iloc[: len(pool) - keep], pool.iloc[len(pool) - keep :]
+        for start in range(0, len(emit), batch_size):
+            yield emit.iloc[start : start + batch_size]
+    if pool is not None and len(pool):
+        pool = pool.iloc[rng.permutation(len(pool))]
+        for start in range(0, len(pool), batch_size):
+            yield pool.iloc[start : start + batch_size]
+
+
+def predict_chunks(model, chunks, features=None, column: str = "prediction"):
+    """
+    Scores a stream of DataFrames, yielding each chunk with a prediction column.
+
+    Args:
+        model: A fitted estimator.
+        chunks: Iterable of DataFrames.
+        features: Columns passed to the model (default: all columns of the chunk).
+        column: Name of the added prediction column.
+    """
+    for chunk in chunks:
+        X = chunk if features is None else chunk[features]
+        scored = chunk.copy(deep=False)
+        scored[column] = model.predict(X)
+        yield scored
+
+
+class ModelCache:
+    """
+    Keeps loaded models as uncompressed joblib files so large numpy arrays are
+    memory-mapped instead of deserialized.
+
+    The first load of a pickled model converts it into the cache; later loads
+    map the cached file read-only, and repeated loads in the same process reuse
+    the already loaded model. Entries are keyed by the model file's path, size
+    and modification time; when a model file is retrained, the entry for its
+    previous version is removed.
+
+    Only estimators that keep their fitted state in plain numpy attributes are
+    mapped: linear models (coef_), nearest neighbours (_fit_X), SVMs (support
+    vectors), naive Bayes, k-means and the like. Tree ensembles (random forest,
+    gradient boosting) do not benefit across processes: sklearn's Tree copies
+    its node arrays into its own buffers when unpickled, so each process still
+    pays for a full copy; for them the cache only helps by skipping
+    decompression and by reusing the model within a process.
+    """
+
+    def __init__(self, cache_dir: str = ".dataninja_models", mmap_mode: str = "r"):
+        self.cache_dir = cache_dir
+        self.mmap_mode = mmap_mode
+        self._loaded = {}
+
+    def _keys(self, model_path: str) -> tuple:
+        """(key of the path, key of this version of the file)"""
+        path = os.path.abspath(model_path)
+        stat = os.stat(model_path)
+        path_key = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+        ident = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        return path_key, hashlib.sha256(ident.encode("utf-8")).hexdigest()[:16]
+
+    def _evict(self, path_key: str, keep: str) -> None:
+        """Remove cached versions of a model file other than `keep`."""
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(path_key + "-") and name != keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass  # e.g. still mapped by another process on Windows
+
+    def load(self, model_path: str):
+        """Load a pickled or joblib model, going through the mmap cache."""
+        path_key, version_key = self._keys(model_path)
+        loaded = self._loaded.get(path_key)
+        if loaded is not None and loaded[0] == version_key:
+            return loaded[1]
+
+        filename = f"{path_key}-{version_key}.joblib"
+        cached_path = os.path.join(self.cache_dir, filename)
+        if not os.path.exists(cached_path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            try:
+                with open(model_path, "rb") as f:
+                    model = pickle.load(f)
+            except pickle.UnpicklingError:
+                model = joblib.load(model_path)
+            joblib.dump(model, cached_path + ".tmp")
+            os.replace(cached_path + ".tmp", cached_path)
+            self._evict(path_key, keep=filename)
+
+        model = joblib.load(cached_path, mmap_mode=self.mmap_mode)
+        self._loaded[path_key] = (version_key, model)
+        return model
+
+
+class FeatureCache:
+    """
+    Stores model-ready feature matrices as contiguous `.npy` files and maps them
+    back read-only.
+
+    Building X from a DataFrame (select columns, encode/scale, convert dtypes)
+    and letting sklearn copy it into a contiguous float array is repeated on
+    every run. The cache does that conversion once per (data fingerprint,
+    features, target, transform, dtype) and later runs memory-map the result.
+    X is returned as a DataFrame viewing the mapped array, so sklearn keeps the
+    feature names and `check_array` uses the mapping without copying. float32
+    halves the file size and is what tree ensembles use internally.
+
+    At most `max_entries` matrices are kept; the least recently used ones are
+    removed when a new entry is written.
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, cache_dir: str = ".dataninja_features", dtype: str = "float64", mmap_mode: str = "r",
+                 max_entries: int = 8):
+        """
+        Args:
+            cache_dir: Directory holding the cached matrices.
+            dtype: float32 or float64.
+            mmap_mode: Mode the matrices are mapped with.
+            max_entries: Most matrices kept on disk (None: unbounded).
+        """
+        self.cache_dir = cache_dir
+        self.dtype = np.dtype(dtype)
+        self.mmap_mode = mmap_mode
+        self.max_entries = max_entries
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"Unsupported feature dtype: {dtype}")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+    def key(self, fingerprint: str, features: list, target: str = None, transform=None) -> str:
+        # joblib.hash covers the transformer's parameters and fitted state, so a
+        # different encoder/scaler, or the same one refit, gets its own entry.
+        spec = json.dumps(
+            [
+                self.FORMAT_VERSION,
+                fingerprint,
+                list(features),
+                target,
+                joblib.hash(transform) if transform is not None else None,
+                self.dtype.name,
+            ],
+            default=str,
+        )
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:32]
+
+    def _save(self, path: str, array: np.ndarray) -> None:
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(path + ".tmp", path)
+
+    def _build(self, df: pd.DataFrame, features: list, transform) -> tuple:
+        """Returns (matrix, column names) for `df[features]`, transformed if given."""
+        if transform is None:
+            return df[features].to_numpy(dtype=self.dtype), features
+        values = transform.transform(df[features])
+        if hasattr(values, "toarray"):
+            values = values.toarray()  # sparse output, e.g. OneHotEncoder
+        values = np.asarray(values, dtype=self.dtype)
+        if hasattr(transform, "get_feature_names_out"):
+            columns = [str(c) for c in transform.get_feature_names_out()]
+        else:
+            columns = [f"x{i}" for i in range(values.shape[1])]
+        return values, columns
+
+    def _evict(self, keep: str) -> None:
+        """Removes the least recently used entries beyond `max_entries`, never `keep`."""
+        if self.max_entries is None:
+            return
+        metas = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(".json") and name != keep
+        ]
+        metas.sort(key=os.path.getmtime, reverse=True)
+        for meta in metas[self.max_entries - 1:]:
+            base = meta[: -len(".json")]
+            # The metadata goes first, so a partly removed entry is never read.
+            for path in (meta, base + ".X.npy", base + ".y.npy"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def load(self, df: pd.DataFrame, target: str = None, features: list = None, fingerprint: str = None,
+             transform=None):
+        """
+        Returns the feature matrix (and target) of `df`, building the cache entry on a miss.
+
+        Args:
+            df: Source data.
+            target: Target column, or None to only build X (e.g. for prediction).
+            features: Feature columns (default: all columns except the target).
+            fingerprint: Precomputed `fingerprint_dataframe(df)`.
+            transform: Fitted sklearn transformer (encoder, scaler, ColumnTransformer,
+                       ...) applied to the feature columns before caching.
+
+        Returns:
+            tuple: (X, y) where X is a DataFrame over the memory-mapped matrix and
+                   y a memory-mapped array (None without a target).
+        """
+        if features is None:
+            features = [col for col in df.columns if col != target]
+        features = list(features)
+        key = self.key(fingerprint or fingerprint_dataframe(df), features, target, transform)
+        base = os.path.join(self.cache_dir, key)
+
+        # The JSON metadata is written last and marks a complete entry.
+        if os.path.exists(base + ".json"):
+            os.utime(base + ".json")  # most recently used
+        else:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            values, columns = self._build(df, features, transform)
+            self._save(base + ".X.npy", np.ascontiguousarray(values))
+            if target is not None:
+                y = df[target].to_numpy()
+                if y.dtype == object:
+                    y = y.astype(str)  # object arrays cannot be memory-mapped
+                self._save(base + ".y.npy", y)
+            with open(base + ".json", "w") as f:
+                json.dump(
+                    {"features": features, "columns": columns, "target": target, "dtype": self.dtype.name,
+                     "rows": len(df)},
+                    f,
+                )
+            self._evict(keep=key + ".json")
+
+        with open(base + ".json") as f:
+            columns = json.load(f)["columns"]
+        X = pd.DataFrame(np.load(base + ".X.npy", mmap_mode=self.mmap_mode), columns=columns, copy=False)
+        X.attrs["npy_path"] = base + ".X.npy"
+        y = np.load(base + ".y.npy", mmap_mode=self.mmap_mode) if target is not None else None
+        return X, y
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".npy", ".json", ".tmp")):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+class _MappedArray:
+    """A memory-mapped `.npy` that pickles as its path, so pool workers map it instead of copying."""
+
+    def __init__(self, path: str, columns: list = None):
+        self.path = path
+        self.columns = columns
+
+    def open(self):
+        array = np.load(self.path, mmap_mode="r")
+        if self.columns is None:
+            return array
+        return pd.DataFrame(array, columns=self.columns, copy=False)
+
+
+def _shareable(data):
+    """Whole memory-mapped `.npy` files, or FeatureCache frames viewing one, travel to workers by path."""
+    columns = None
+    values = data
+    if isinstance(data, pd.DataFrame):
+        if not data.attrs.get("npy_path"):
+            return data
+        columns, values = list(data.columns), data.to_numpy()
+    root = values
+    while isinstance(root, np.ndarray) and not isinstance(root.base, mmap.mmap):
+        root = root.base
+    # A row subset or reordering of the mapping must not be replaced by the whole file.
+    if (
+        isinstance(root, np.memmap)
+        and root.filename
+        and values.shape == root.shape
+        and values.flags.c_contiguous
+        and values.ctypes.data == root.ctypes.data
+    ):
+        return _MappedArray(root.filename, columns)
+    return data
+
+
+# Training data shared with cross-validation workers through the pool
+# initializer, so each worker receives it once rather than once per fold.
+# Memory-mapped inputs are passed by path and mapped again in each worker.
+_cv_X = None
+_cv_y = None
+
+
+def _init_cv_worker(X, y):
+    global _cv_X, _cv_y
+    _cv_X = X.open() if isinstance(X, _MappedArray) else X
+    _cv_y = y.open() if isinstance(y, _MappedArray) else y
+
+
+def _take(data, idx):
+    return data.iloc[idx] if isinstance(data, (pd.DataFrame, pd.Series)) else data[idx]
+
+
+def _fit_fold(task):
+    """Fits one (params, fold) trial and returns its test score."""
+    model_type, params, n_jobs, train_idx, test_idx, scoring = task
+    estimator = create_estimator(model_type, params, n_jobs)
+    estimator.fit(_take(_cv_X, train_idx), _take(_cv_y, train_idx))
+    return float(get_scorer(scoring)(estimator, _take(_cv_X, test_idx), _take(_cv_y, test_idx)))
 
 
 class MLModel:
     """Machine learning model wrapper with training and evaluation."""
-    
-    def __init__(self, model_type: str = "logistic_regression", params: dict = None):
-        """Initialize ML model."""
+
+    def __init__(self, model_type: str = "logistic_regression", params: dict = None, n_jobs: int = None):
+        """
+        Initialize ML model.
+
+        Args:
+            model_type: A key of MODEL_REGISTRY.
+            params: Estimator hyperparameters.
+            n_jobs: Threads/processes used by the estimator itself, if it supports them.
+        """
         self.model_type = model_type
         self.params = params or {}
-        
-        if model_type == "logistic_regression":
-            self.model = LogisticRegression(**self.params)
-        else:
-            raise ValueError(f"Unsupported model_type: {model_type}")
+        self.n_jobs = n_jobs
+        self.model = create_estimator(model_type, self.params, n_jobs)
 
     def train(self, X: np.ndarray, y: np.ndarray) -> None:
         """Train the model with features X and target y."""
@@ -35,11 +422,230 @@ class MLModel:
         """Evaluate model performance on test data."""
         if not isinstance(X_test, np.ndarray) or not isinstance(y_test, np.ndarray):
             raise ValueError("Test data must be numpy arrays")
-        
+
         y_pred = self.predict(X_test)
-        
+
         return {
             "accuracy": accuracy_score(y_test, y_pred),
             "precision": precision_score(y_test, y_pred, average=average_method, zero_division=0),
             "recall": recall_score(y_test, y_pred, average=average_method, zero_division=0)
         }
+
+    # --- Out-of-core training ---
+
+    def train_stream(
+        self,
+        chunk_source,
+        target: str = None,
+        features: list = None,
+        epochs: int = 1,
+        buffer_size: int = 10_000,
+        batch_size: int = 1_000,
+        classes=None,
+        random_state: int = 0,
+    ):
+        """
+        Train a partial_fit estimator over data that does not fit in memory.
+
+        Args:
+            chunk_source: Callable returning a fresh iterable of DataFrames, called once
+                          per epoch (e.g. `lambda: CSVHandler(path).iter_chunks(50_000)`).
+            target: Target column; None for clustering models.
+            features: Feature columns (default: all columns except the target).
+            epochs: Passes over the data.
+            buffer_size: Rows held in the shuffle buffer.
+            batch_size: Rows per partial_fit call.
+            classes: All class labels; collected with an extra pass over the target if omitted.
+            random_state: Seed for the shuffle buffer.
+
+        Returns:
+            The fitted estimator.
+        """
+        if not hasattr(self.model, "partial_fit"):
+            raise ValueError(f"Model type '{self.model_type}' does not support partial_fit")
+        supervised = not is_clusterer(self.model)
+        if supervised and target is None:
+            raise ValueError("A target column is required for supervised models")
+        if is_classifier(self.model) and classes is None:
+            classes = np.unique(
+                np.concatenate([chunk[target].dropna().unique() for chunk in chunk_source()])
+            )
+
+        self.history = []
+        for epoch in range(epochs):
+            rows = 0
+            for batch in shuffle_batches(chunk_source(), buffer_size, batch_size, random_state + epoch):
+                if supervised:
+                    batch = batch.dropna(subset=[target])
+                if batch.empty:
+                    continue
+                if features is None:
+                    features = [col for col in batch.columns if col != target]
+                X = batch[features].to_numpy(dtype=np.float64)
+                if is_classifier(self.model):
+                    self.model.partial_fit(X, batch[target].to_numpy(), classes=classes)
+                elif supervised:
+                    self.model.partial_fit(X, batch[target].to_numpy())
+                else:
+                    self.model.partial_fit(X)
+                rows += len(batch)
+            self.history.append({"epoch": epoch + 1, "rows": rows})
+            print(f"Epoch {epoch + 1}/{epochs}: trained on {rows} rows")
+        return self.model
+
+    # --- Cross-validation and hyperparameter search ---
+
+    def _folds(self, X, y, cv: int, random_state: int) -> list:
+        splitter = (
+            StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+            if is_classifier(self.model)
+            else KFold(n_splits=cv, shuffle=True, random_state=random_state)
+        )
+        return list(splitter.split(np.zeros(len(y)), y))
+
+    @staticmethod
+    def _iter_tasks(X, y, tasks: list, n_jobs: int):
+        """
+        Yields (task index, score, error) as trials finish, in completion order.
+        A failing trial yields its exception instead of stopping the others.
+        """
+        if n_jobs and n_jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                initializer=_init_cv_worker,
+                initargs=(_shareable(X), _shareable(y)),
+            ) as executor:
+                futures = {executor.submit(_fit_fold, task): i for i, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    error = future.exception()
+                    yield futures[future], (None if error else future.result()), error
+            return
+        _init_cv_worker(X, y)
+        try:
+            for i, task in enumerate(tasks):
+                try:
+                    yield i, _fit_fold(task), None
+                except Exception as e:
+                    yield i, None, e
+        finally:
+            _init_cv_worker(None, None)
+
+    def cross_validate(self, X, y, cv: int = 5, scoring: str = None, n_jobs: int = None, random_state: int = 0) -> dict:
+        """
+        K-fold cross-validation with folds fitted in a process pool.
+
+        Args:
+            X, y: Features and target (numpy arrays or pandas objects).
+            cv: Number of folds (stratified for classifiers).
+            scoring: sklearn scorer name; defaults to accuracy (classifiers) or r2.
+            n_jobs: Worker processes for the folds. None or 1 runs serially.
+            random_state: Seed for the fold shuffling.
+
+        Returns:
+            dict: {'scores': [...], 'mean': float, 'std': float}
+        """
+        scoring = scoring or self._default_scoring()
+        tasks = [
+            (self.model_type, self.params, self.n_jobs, train_idx, test_idx, scoring)
+            for train_idx, test_idx in self._folds(X, y, cv, random_state)
+        ]
+        scores = [None] * len(tasks)
+        for i, score, error in self._iter_tasks(X, y, tasks, n_jobs):
+            if error is not None:
+                raise error
+            scores[i] = score
+        return {"scores": scores, "mean": float(np.mean(scores)), "std": float(np.std(scores))}
+
+    def _default_scoring(self) -> str:
+        return "accuracy" if is_classifier(self.model) else "r2"
+
+    def search(
+        self,
+        X,
+        y,
+        param_grid: dict,
+        cv: int = 5,
+        n_iter: int = None,
+        scoring: str = None,
+        n_jobs: int = None,
+        cache_dir: str = None,
+        random_state: int = 0,
+    ) -> dict:
+        """
+        Grid (or random, if `n_iter` is set) hyperparameter search with k-fold CV.
+
+        Every (candidate, fold) trial is cached as a small JSON file in `cache_dir`
+        as soon as it finishes, keyed by the data fingerprint, model type,
+        parameters, fold and scoring, so re-running an interrupted search only fits
+        the trials that have not finished yet. A trial that raises is reported and
+        scored NaN (and not cached); its candidate cannot be chosen. The best
+        candidate is refit on all data and becomes `self.model`.
+
+        Returns:
+            dict: {'best_params': dict, 'best_score': float, 'results': pd.DataFrame}
+        """
+        scoring = scoring or self._default_scoring()
+        if n_iter:
+            candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=random_state))
+        else:
+            candidates = list(ParameterGrid(param_grid))
+        folds = self._folds(X, y, cv, random_state)
+
+        data_key = fingerprint_dataframe(pd.DataFrame(X)) + fingerprint_dataframe(pd.DataFrame(y))
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        scores = {}
+        pending, pending_keys = [], []
+        for c, candidate in enumerate(candidates):
+            params = {**self.params, **candidate}
+            for f, (train_idx, test_idx) in enumerate(folds):
+                key = hashlib.sha256(
+                    json.dumps(
+                        [data_key, self.model_type, params, cv, f, scoring, random_state],
+                        sort_keys=True,
+                        default=str,
+                    ).encode("utf-8")
+                ).hexdigest()
+                path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+                if path and os.path.exists(path):
+                    with open(path, "r") as fh:
+                        scores[(c, f)] = json.load(fh)["score"]
+                    continue
+                pending.append((self.model_type, params, self.n_jobs, train_idx, test_idx, scoring))
+                pending_keys.append(((c, f), path))
+
+        if pending:
+            print(f"Running {len(pending)} trials ({len(scores)} cached)...")
+        for i, score, error in self._iter_tasks(X, y, pending, n_jobs):
+            (c, f), path = pending_keys[i]
+            if error is not None:
+                print(f"Warning: trial {candidates[c]} (fold {f}) failed: {error}")
+                scores[(c, f)] = np.nan
+                continue
+            scores[(c, f)] = score
+            if path:
+                with open(path + ".tmp", "w") as fh:
+                    json.dump({"params": candidates[c], "fold": f, "score": score}, fh, default=str)
+                os.replace(path + ".tmp", path)
+
+        rows = []
+        for c, candidate in enumerate(candidates):
+            fold_scores = [scores[(c, f)] for f in range(len(folds))]
+            rows.append(
+                {"params": candidate, "mean_score": np.mean(fold_scores), "std_score": np.std(fold_scores)}
+            )
+        results = pd.DataFrame(rows)
+        if results["mean_score"].isna().all():
+            raise ValueError("Every search trial failed; see the warnings above")
+        best = int(results["mean_score"].idxmax())
+
+        self.params = {**self.params, **candidates[best]}
+        self.model = create_estimator(self.model_type, self.params, self.n_jobs)
+        self.model.fit(X, y)
+        return {
+            "best_params": candidates[best],
+            "best_score": float(results.loc[best, "mean_score"]),
+            "results": results,
+        }
+
@@ -0,0 +1,279 @@
+import json
+import logging
+import os
+import queue
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+
+def _is_socket(path: str) -> bool:
+    """True if `path` itself (not a symlink target) is a Unix socket."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+class _PendingRequest:
+    """Records of one client request waiting for their predictions."""
+
+    __slots__ = ("records", "enqueued", "done", "result", "error")
+
+    def __init__(self, records: list):
+        self.records = records
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent prediction requests into micro-batches.
+
+    A background thread takes the first waiting request, keeps collecting
+    requests until `max_batch_size` records are queued or `max_latency_ms` has
+    passed since that first request arrived, then scores the whole batch with a
+    single vectorized `predict` call and hands each caller its slice.
+    """
+
+    def __init__(self, model, max_batch_size: int = 256, max_latency_ms: float = 5.0, features: list = None):
+        """
+        Args:
+            model: A fitted estimator with a `predict` method.
+            max_batch_size: Maximum records scored per `predict` call.
+            max_latency_ms: Longest a request waits for more requests to join its batch.
+            features: Columns passed to the model, in order (default: the model's
+                `feature_names_in_`, else the record keys).
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        if features is None and hasattr(model, "feature_names_in_"):
+            features = list(model.feature_names_in_)
+        self.features = features
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=10_000)
+        self._started = time.perf_counter()
+        self._counters = {"requests": 0, "records": 0, "batches": 0, "errors": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="dataninja-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, records: list, timeout: float = 30.0) -> list:
+        """Queues records (a list of dicts) and blocks until their predictions are ready."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        request = _PendingRequest(records)
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("Prediction timed out")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _collect(self, first: _PendingRequest) -> list:
+        batch, size = [first], len(first.records)
+        deadline = first.enqueued + self.max_latency
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:  # close() sentinel
+                self._queue.put(None)
+                break
+            batch.append(request)
+            size += len(request.records)
+        return batch
+
+    def _score(self, batch: list) -> None:
+        records = [record for request in batch for record in request.records]
+        try:
+            frame = pd.DataFrame.from_records(records, columns=self.features)
+            predictions = np.asarray(self.model.predict(frame)).tolist()
+        except Exception as e:
+            if len(batch) > 1:
+                # One malformed request must not fail the others: score each on its own.
+                for request in batch:
+                    self._score([request])
+                return
+            batch[0].error = e
+            batch[0].done.set()
+            with self._lock:
+                self._counters["errors"] += 1
+            return
+
+        now = time.perf_counter()
+        start = 0
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["requests"] += len(batch)
+            self._counters["records"] += len(records)
+            for request in batch:
+                end = start + len(request.records)
+                request.result = predictions[start:end]
+                start = end
+                self._latencies.append(now - request.enqueued)
+        for request in batch:
+            request.done.set()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            self._score(self._collect(first))
+
+    def stats(self) -> dict:
+        """Latency (ms, over recent requests) and throughput counters."""
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = np.array(self._latencies) * 1000.0
+        elapsed = time.perf_counter() - self._started
+        stats = {
+            **counters,
+            "uptime_s": elapsed,
+            "mean_batch_size": counters["records"] / counters["batches"] if counters["batches"] else 0.0,
+            "records_per_s": counters["records"] / elapsed if elapsed > 0 else 0.0,
+            "queue_depth": self._queue.qsize(),
+        }
+        if len(latencies):
+            stats.update(
+                latency_ms_mean=float(latencies.mean()),
+                latency_ms_p50=float(np.percentile(latencies, 50)),
+                latency_ms_p95=float(np.percentile(latencies, 95)),
+                latency_ms_p99=float(np.percentile(latencies, 99)),
+            )
+        return stats
+
+    def close(self) -> None:
+        """Stops the batching thread after the queued requests are scored."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+class _PredictionHandler(BaseHTTPRequestHandler):
+    """
+    POST /predict  body: a record, a list of records or {"records": [...]}
+                   reply: {"predictions": [...]}
+    GET  /stats    latency/throughput counters
+    GET  /health   {"status": "ok"}
+    """
+
+    batcher = None  # set on the per-server subclass
+    logger = logging.getLogger(__name__)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, self.batcher.stats())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+            if isinstance(payload, dict) and "records" in payload:
+                payload = payload["records"]
+            records = payload if isinstance(payload, list) else [payload]
+            if not records or not all(isinstance(r, dict) for r in records):
+                raise ValueError("Expected a record object or a list of record objects")
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        try:
+            self._send_json(200, {"predictions": self.batcher.submit(records)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def address_string(self):
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        self.logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class PredictionServer:
+    """Serves a fitted model over HTTP (TCP or a Unix socket) with micro-batching."""
+
+    def __init__(
+        self,
+        model,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_socket: str = None,
+        max_batch_size: int = 256,
+        max_latency_ms: float = 5.0,
+        features: list = None,
+    ):
+        self.batcher = MicroBatcher(model, max_batch_size, max_latency_ms, features)
+        handler = type("PredictionHandler", (_PredictionHandler,), {"batcher": self.batcher})
+        self.unix_socket = unix_socket
+        try:
+            if unix_socket:
+                if os.path.lexists(unix_socket):
+                    if not _is_socket(unix_socket):
+                        raise FileExistsError(f"{unix_socket} exists and is not a Unix socket")
+                    os.remove(unix_socket)  # left over from an earlier server
+                self.httpd = _UnixHTTPServer(unix_socket, handler)
+            else:
+                self.httpd = ThreadingHTTPServer((host, port), handler)
+                self.httpd.daemon_threads = True
+        except Exception:
+            self.batcher.close()  # don't leak the batching thread when the bind fails
+            raise
+
+    @property
+    def address(self) -> str:
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stops `serve_forever` from another thread."""
+        self.httpd.shutdown()
+
+    def close(self) -> None:
+        self.httpd.server_close()
+        self.batcher.close()
+        if self.unix_socket and _is_socket(self.unix_socket):
+            os.remove(self.unix_socket)
@@ -0,0 +1,379 @@
+import json
+import math
+import os
+import re
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+SI_PREFIXES = {
+    "Y": "1e24", "Z": "1e21", "E": "1e18", "P": "1e15", "T": "1e12", "G": "1e9", "M": "1e6",
+    "k": "1e3", "h": "1e2", "da": "1e1", "d": "1e-1", "c": "1e-2", "m": "1e-3", "u": "1e-6",
+    "µ": "1e-6", "n": "1e-9", "p": "1e-12", "f": "1e-15",
+}
+BINARY_PREFIXES = {"Ki": "1024", "Mi": "1048576", "Gi": "1073741824", "Ti": "1099511627776"}
+
+# Built-in definitions, in the same format `UnitRegistry.load` reads from a file:
+# a unit is a base unit of a dimension, "<factor> <unit expression>", or a dict
+# with factor/unit and optionally offset (affine units), prefixes and aliases.
+DEFAULT_UNITS = {
+    "units": {
+        # SI base units
+        "m": {"base": "length", "prefixes": "si"},
+        "kg": {"base": "mass"},
+        "s": {"base": "time", "prefixes": "si"},
+        "K": {"base": "temperature"},
+        "A": {"base": "current", "prefixes": "si"},
+        "mol": {"base": "amount", "prefixes": "si"},
+        "cd": {"base": "luminosity"},
+        "B": {"base": "information", "prefixes": "si+binary", "aliases": ["byte"]},
+        # length
+        "ft": "0.3048 m",
+        "in": "0.0254 m",
+        "yd": "0.9144 m",
+        "mile": {"factor": "1609.34", "unit": "m", "aliases": ["mi"]},
+        "nmi": "1852 m",
+        # mass
+        "g": {"factor": "0.001", "unit": "kg", "prefixes": "si"},
+        "t": "1000 kg",
+        "lb": "0.453592 kg",
+        "oz": "0.0283495 kg",
+        # time
+        "min": "60 s",
+        "h": {"factor": "3600", "unit": "s", "aliases": ["hr"]},
+        "day": "86400 s",
+        "week": "604800 s",
+        # temperature: value_in_K = value * factor + offset
+        "C": {"factor": "1", "unit": "K", "offset": "273.15", "aliases": ["degC"]},
+        "F": {"factor": "5/9", "unit": "K", "offset": "45967/180", "aliases": ["degF"]},
+        # area and volume
+        "ha": "10000 m^2",
+        "acre": "4046.8564224 m^2",
+        "L": {"factor": "0.001", "unit": "m^3", "prefixes": "si", "aliases": ["l"]},
+        "gal": "0.003785411784 m^3",
+        # speed
+        "mph": "0.44704 m/s",
+        "kn": {"factor": "1852/3600", "unit": "m/s", "aliases": ["knot"]},
+        # derived SI units
+        "Hz": {"factor": "1", "unit": "s^-1", "prefixes": "si"},
+        "N": {"factor": "1", "unit": "kg*m/s^2", "prefixes": "si"},
+        "Pa": {"factor": "1", "unit": "N/m^2", "prefixes": "si"},
+        "bar": "100000 Pa",
+        "atm": "101325 Pa",
+        "psi": "6894.757293168 Pa",
+        "J": {"factor": "1", "unit": "N*m", "prefixes": "si"},
+        "cal": {"factor": "4.184", "unit": "J", "prefixes": "si"},
+        "Wh": {"factor": "3600", "unit": "J", "prefixes": "si"},
+        "W": {"factor": "1", "unit": "J/s", "prefixes": "si"},
+        "hp": "745.69987158227 W",
+        "bit": {"factor": "1/8", "unit": "B", "prefixes": "si+binary"},
+    },
+    # category name -> a unit of that category (defines its dimension)
+    "categories": {
+        "length": "m", "weight": "kg", "mass": "kg", "time": "s", "temperature": "K",
+        "area": "m^2", "volume": "m^3", "speed": "m/s", "acceleration": "m/s^2",
+        "density": "kg/m^3", "force": "N", "pressure": "Pa", "energy": "J", "power": "W",
+        "frequency": "Hz", "data": "B", "flow": "m^3/s", "current": "A", "amount": "mol",
+    },
+}
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_TERM = re.compile(r"^(?P<name>[^\s^*/·]+?)(?:\^?(?P<exp>-?\d+))?$")
+
+
+def _fraction(value) -> Fraction:
+    """Exact Fraction from a number or a decimal/ratio string ('0.3048', '5/9', '1e-3')."""
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if "e" in value.lower() and "/" not in value:
+            mantissa, exponent = value.lower().split("e")
+            return Fraction(mantissa or "1") * Fraction(10) ** int(exponent)
+        return Fraction(value)
+    return Fraction(value)
+
+
+def _is_array(value) -> bool:
+    return isinstance(value, (np.ndarray, pd.Series, list, tuple))
+
+
+def _as_array(value) -> np.ndarray:
+    return np.asarray(value.to_numpy() if isinstance(value, pd.Series) else value, dtype=np.float64)
+
+
+def _like(result, value):
+    """Returns a Series with `value`'s index and name when `value` is a Series."""
+    if isinstance(value, pd.Series):
+        return pd.Series(result, index=value.index, name=value.name)
+    return result
+
+
+class UnitRegistry:
+    """
+    Units and categories, resolved through a graph of definitions.
+
+    Every unit is defined relative to another unit expression (`1 mile = 1609.34 m`,
+    `1 N = 1 kg*m/s^2`) or is the base unit of a dimension. Resolving a unit
+    walks this graph down to base units, giving an exact affine map
+    `base = value * scale + offset` and a dimension vector, so compound units
+    such as m/s, km/h, kg/m³ or kWh are understood without being listed.
+    Conversions between units of equal dimension are memoized as float
+    (scale, offset) pairs, so a column converts with one multiply-add.
+    """
+
+    def __init__(self, definitions: dict = None):
+        """
+        Args:
+            definitions: Unit data in the DEFAULT_UNITS format (default: DEFAULT_UNITS).
+        """
+        self._definitions = {}
+        self._categories = {}
+        self._resolved = {}
+        self._factors = {}
+        self.update(DEFAULT_UNITS if definitions is None else definitions)
+
+    # --- definitions ---
+
+    def define(self, name: str, factor=1, unit: str = None, offset=0, base: str = None,
+               prefixes: str = None, aliases: list = None) -> None:
+        """
+        Define `name` as `factor * unit + offset`, or as the base unit of dimension `base`.
+
+        Args:
+            prefixes: 'si', 'binary' or 'si+binary' to also define prefixed forms
+                      (km, mm, KiB, ...); explicitly defined names take precedence.
+            aliases: Other names for the same unit.
+        """
+        if (unit is None) == (base is None):
+            raise ValueError(f"Unit '{name}' needs either a reference unit or a base dimension")
+        definition = {"base": base} if base else {
+            "factor": _fraction(factor), "unit": unit, "offset": _fraction(offset)
+        }
+        for alias in [name, *(aliases or [])]:
+            self._definitions[alias] = definition
+        if prefixes:
+            if definition.get("offset"):
+                raise ValueError(f"Affine unit '{name}' cannot take prefixes")
+            table = {}
+            for kind in prefixes.split("+"):
+                table.update({"si": SI_PREFIXES, "binary": BINARY_PREFIXES}[kind])
+            for prefix, scale in table.items():
+                prefixed = prefix + name
+                if prefixed not in self._definitions or self._definitions[prefixed].get("prefixed"):
+                    self._definitions[prefixed] = {
+                        "factor": _fraction(scale), "unit": name, "offset": Fraction(0), "prefixed": True
+                    }
+        self._invalidate()
+
+    def define_category(self, category: str, unit: str) -> None:
+        """Name the dimension of `unit` (e.g. 'density' for 'kg/m^3')."""
+        self._categories[category] = unit
+        self._invalidate()
+
+    def update(self, data: dict) -> None:
+        """Adds units and categories from a dict in the DEFAULT_UNITS format."""
+        for name, spec in (data.get("units") or {}).items():
+            if isinstance(spec, str):
+                factor, _, unit = spec.strip().partition(" ")
+                self.define(name, factor, unit.strip())
+            elif isinstance(spec, dict):
+                self.define(
+                    name,
+                    factor=spec.get("factor", 1),
+                    unit=spec.get("unit"),
+                    offset=spec.get("offset", 0),
+                    base=spec.get("base"),
+                    prefixes=spec.get("prefixes"),
+                    aliases=spec.get("aliases"),
+                )
+            else:
+                raise ValueError(f"Invalid definition for unit '{name}': {spec!r}")
+        for category, unit in (data.get("categories") or {}).items():
+            self.define_category(category, unit)
+
+    def load(self, path: str) -> "UnitRegistry":
+        """Adds definitions from a JSON or YAML file; returns the registry."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            if path.lower().endswith((".yaml", ".yml")):
+                import yaml
+
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Unit file '{path}' must contain a mapping")
+        self.update(data)
+        return self
+
+    @classmethod
+    def from_file(cls, path: str, include_defaults: bool = True) -> "UnitRegistry":
+        registry = cls() if include_defaults else cls({})
+        return registry.load(path)
+
+    def _invalidate(self) -> None:
+        self._resolved.clear()
+        self._factors.clear()
+
+    # --- resolution ---
+
+    def _parse(self, expression: str) -> list:
+        """'kg/m^3' -> [('kg', 1), ('m', -3)]"""
+        text = expression.translate(_SUPERSCRIPTS).replace("**", "^").replace("·", "*").replace(" ", "")
+        if not text:
+            raise ValueError("Empty unit expression")
+        terms, sign = [], 1
+        for token in re.split(r"([*/])", text):
+            if token in ("*", "/"):
+                sign = -1 if token == "/" else 1
+                continue
+            match = _TERM.match(token)
+            if not token or not match:
+                raise ValueError(f"Invalid unit expression: '{expression}'")
+            name, exp = match.group("name"), int(match.group("exp") or 1)
+            # Names that end in digits (unlikely, but allowed) win over exponents.
+            if match.group("exp") and token in self._definitions:
+                name, exp = token, 1
+            if name == "1":
+                continue
+            terms.append((name, sign * exp))
+        return terms
+
+    def _resolve_name(self, name: str, seen: tuple) -> tuple:
+        if name not in self._definitions:
+            raise ValueError(f"Unknown unit: '{name}'")
+        if name in seen:
+            raise ValueError(f"Circular unit definition: {' -> '.join((*seen, name))}")
+        definition = self._definitions[name]
+        if "base" in definition:
+            return Fraction(1), Fraction(0), ((definition["base"], 1),)
+        scale, offset, dims = self._resolve(definition["unit"], (*seen, name))
+        if offset:
+            raise ValueError(f"Unit '{name}' cannot be defined on the affine unit '{definition['unit']}'")
+        return definition["factor"] * scale, definition["offset"], dims
+
+    def _resolve(self, expression: str, seen: tuple = ()) -> tuple:
+        """Exact (scale, offset, dimension) with base = value * scale + offset."""
+        if expression in self._resolved:
+            return self._resolved[expression]
+        if expression in self._definitions:
+            result = self._resolve_name(expression, seen)
+        else:
+            terms = self._parse(expression)
+            if len(terms) == 1 and terms[0][1] == 1:
+                result = self._resolve_name(terms[0][0], seen)
+            else:
+                scale, dims = Fraction(1), {}
+                for name, exp in terms:
+                    term_scale, term_offset, term_dims = self._resolve_name(name, seen)
+                    if term_offset:
+                        raise ValueError(f"Affine unit '{name}' cannot be used in a compound unit")
+                    scale *= term_scale ** exp
+                    for dim, power in term_dims:
+                        dims[dim] = dims.get(dim, 0) + power * exp
+                result = scale, Fraction(0), tuple(sorted((d, p) for d, p in dims.items() if p))
+        self._resolved[expression] = result
+        return result
+
+    def dimension(self, unit: str) -> tuple:
+        """Dimension vector of `unit`, e.g. (('length', 1), ('time', -1)) for 'km/h'."""
+        return self._resolve(unit)[2]
+
+    def category_of(self, unit: str):
+        """The first category with the same dimension as `unit`, or None."""
+        dims = self.dimension(unit)
+        for category, reference in self._categories.items():
+            if self.dimension(reference) == dims:
+                return category
+        return None
+
+    @property
+    def categories(self) -> list:
+        return list(self._categories)
+
+    def reference_unit(self, category: str) -> str:
+        """The unit expression that defines `category`, e.g. 'kg/m^3' for density."""
+        if category not in self._categories:
+            raise ValueError(f"Unknown category: {category}")
+        return self._categories[category]
+
+    def units(self, category: str = None) -> list:
+        """Named units, optionally only those of `category` (prefixed forms excluded)."""
+        names = [name for name, d in self._definitions.items() if not d.get("prefixed")]
+        if category is None:
+            return names
+        dims = self._category_dimension(category)
+        return [name for name in names if self.dimension(name) == dims]
+
+    def _category_dimension(self, category: str) -> tuple:
+        return self.dimension(self.reference_unit(category))
+
+    def _exact_factors(self, from_unit: str, to_unit: str, category: str = None) -> tuple:
+        if category is not None:
+            dims = self._category_dimension(category)
+            try:
+                resolved = self._resolve(from_unit), self._resolve(to_unit)
+            except ValueError:
+                resolved = None
+            if resolved is None or resolved[0][2] != dims or resolved[1][2] != dims:
+                raise ValueError(f"Unknown units in {category}: {from_unit}, {to_unit}")
+            (scale_in, offset_in, dims_in), (scale_out, offset_out, dims_out) = resolved
+        else:
+            scale_in, offset_in, dims_in = self._resolve(from_unit)
+            scale_out, offset_out, dims_out = self._resolve(to_unit)
+        if dims_in != dims_out:
+            raise ValueError(f"Cannot convert '{from_unit}' to '{to_unit}': incompatible dimensions")
+        # value -> base -> target, where target = (base - offset_out) / scale_out
+        return scale_in / scale_out, (offset_in - offset_out) / scale_out
+
+    def factors(self, from_unit: str, to_unit: str, category: str = None) -> tuple:
+        """
+        Float (scale, offset) with converted = value * scale + offset (memoized).
+
+        Args:
+            category: If given, both units must belong to it.
+        """
+        key = (from_unit, to_unit, category)
+        if key not in self._factors:
+            scale, offset = self._exact_factors(from_unit, to_unit, category)
+            self._factors[key] = (float(scale), float(offset))
+        return self._factors[key]
+
+    # --- conversion ---
+
+    def convert(self, value, from_unit: str, to_unit: str, category: str = None):
+        """
+        Convert a number, array-like or Series between units.
+
+        Arrays and Series take one multiply-add with the memoized factors
+        (Series keep their index); finite scalars are computed exactly and
+        rounded once.
+        """
+        if _is_array(value):
+            scale, offset = self.factors(from_unit, to_unit, category)
+            result = _as_array(value) * scale
+            if offset:
+                result += offset
+            return _like(result, value)
+        key = (from_unit, to_unit, category)
+        if key not in self._factors:
+            self.factors(from_unit, to_unit, category)
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            scale, offset = self._exact_factors(from_unit, to_unit, category)
+            return float(Fraction(value) * scale + offset)
+        scale, offset = self._factors[key]
+        return value * scale + offset
+
+
+_default_registry = None
+
+
+def get_default_registry() -> UnitRegistry:
+    """The shared registry with the built-in units (created on first use)."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = UnitRegistry()
+    return _default_registry
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
 from pandas.testing import assert_frame_equal, assert_series_equal
@@ -455,5 +456,92 @@ class TestAnalyzeDataOrchestration(unittest.TestCase):
         self.assertIn("Warning: Column 'NonExistentColumnForError' not found.", output)
 
 
+class TestPartialAggregates(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "A": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0],
+                "B": [10, 20, 30, 40, 50, 60, 70],
+                "C": ["x", "y", "x", None, "z", "x", "y"],
+            }
+        )
+
+    def _chunks(self, sizes):
+        start = 0
+        for size in sizes:
+            yield self.data.iloc[start : start + size]
+            start += size
+
+    def test_merged_state_matches_full_data(self):
+        states = [DataAnalyzer.partial(chunk) for chunk in self._chunks([3, 1, 3])]
+        merged = states[0]
+        for state in states[1:]:
+            merged = DataAnalyzer.merge(merged, state)
+        result = DataAnalyzer.finalize(merged)
+
+        self.assertEqual(result["row_count"], 7)
+        stats = result["summary_statistics"]
+        expected = self.data[["A", "B"]].describe().loc[["count", "mean", "std", "min", "max"]]
+        assert_frame_equal(stats, expected, check_dtype=False)
+        self.assertEqual(result["null_counts"]["A"], 1)
+        self.assertEqual(result["null_counts"]["C"], 1)
+        self.assertEqual(result["value_counts"]["C"].to_dict(), {"x": 3, "y": 2, "z": 1})
+
+    def test_merge_with_empty_chunk(self):
+        empty = DataAnalyzer.partial(self.data.iloc[0:0])
+        full = DataAnalyzer.partial(self.data)
+        result = DataAnalyzer.finalize(DataAnalyzer.merge(empty, full))
+        self.assertAlmostEqual(result["summary_statistics"].loc["mean", "B"], 40.0)
+        self.assertEqual(result["summary_statistics"].loc["count", "A"], 6)
+
+    def test_merge_does_not_modify_inputs(self):
+        a = DataAnalyzer.partial(self.data.iloc[:3])
+        b = DataAnalyzer.partial(self.data.iloc[3:])
+        a_count = a["value_counts"]["C"]["x"]
+        DataAnalyzer.merge(a, b)
+        self.assertEqual(a["value_counts"]["C"]["x"], a_count)
+
+    def test_aggregate_chunks_in_process_pool(self):
+        result = DataAnalyzer.aggregate_chunks(self._chunks([2, 2, 3]), n_jobs=2)
+        self.assertAlmostEqual(
+            result["summary_statistics"].loc["std", "B"], self.data["B"].std()
+        )
+        self.assertEqual(result["value_counts"]["C"]["x"], 3)
+
+    def test_aggregate_chunks_bounds_chunks_in_flight(self):
+        in_flight = []
+
+        class Future:
+            def __init__(self, value):
+                self.value = value
+
+            def result(self):
+                in_flight.remove(self)
+                return self.value
+
+        class Executor:
+            peak = 0
+
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def submit(self, fn, *args, **kwargs):
+                in_flight.append(Future(fn(*args, **kwargs)))
+                Executor.peak = max(Executor.peak, len(in_flight))
+                return in_flight[-1]
+
+        with patch("DataNinja.core.analyzer.ProcessPoolExecutor", Executor):
+            result = DataAnalyzer.aggregate_chunks(self._chunks([1] * 7), n_jobs=2)
+        self.assertEqual(Executor.peak, 4)
+        self.assertEqual(in_flight, [])
+        self.assertEqual(result["row_count"], 7)
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from DataNinja.core import cache as cache_module
+from DataNinja.core.cache import StageCache
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = StageCache(self.tmpdir.name)
+        self.df = pd.DataFrame(
+            {"num": [1.0, None, 3.0, 4.0, 4.0], "cat": ["a", "b", "a", "c", "c"]}
+        )
+        self.stages = [
+            {"stage": "clean", "operations": [{"method": "remove_duplicates", "params": {}}]},
+            {
+                "stage": "transform",
+                "operations": [{"method": "scale_numerical_features", "params": {"columns": ["num"]}}],
+            },
+            {"stage": "analyze", "operations": [{"method": "get_summary_statistics"}]},
+        ]
+        self.calls = []
+        self.original_runners = dict(cache_module.STAGE_RUNNERS)
+        for name, runner in self.original_runners.items():
+            cache_module.STAGE_RUNNERS[name] = self._counting(name, runner)
+
+    def tearDown(self):
+        cache_module.STAGE_RUNNERS.update(self.original_runners)
+        self.tmpdir.cleanup()
+
+    def _counting(self, name, runner):
+        def wrapped(df, operations):
+            self.calls.append(name)
+            return runner(df, operations)
+
+        return wrapped
+
+    def test_rerun_skips_all_cached_stages(self):
+        first = self.cache.run(self.df, self.stages)
+        self.calls.clear()
+        second = self.cache.run(self.df, self.stages)
+        self.assertEqual(self.calls, [])
+        self.assertTrue(all(entry["cached"] for entry in self.cache.last_run))
+        assert_frame_equal(
+            first["get_summary_statistics"], second["get_summary_statistics"]
+        )
+
+    def test_changing_last_stage_reuses_prefix(self):
+        self.cache.run(self.df, self.stages)
+        self.calls.clear()
+        changed = self.stages[:2] + [
+            {"stage": "analyze", "operations": [{"method": "get_value_counts", "params": {"column": "cat"}}]}
+        ]
+        result = self.cache.run(self.df, changed)
+        self.assertEqual(self.calls, ["analyze"])
+        self.assertEqual(result["get_value_counts"]["a"], 2)
+
+    def test_changed_input_invalidates_chain(self):
+        self.cache.run(self.df, self.stages)
+        self.calls.clear()
+        modified = self.df.copy()
+        modified.loc[0, "num"] = 2.0
+        self.cache.run(modified, self.stages)
+        self.assertEqual(self.calls, ["clean", "transform", "analyze"])
+
+    def test_cached_dataframe_roundtrip(self):
+        key = StageCache.stage_key("root", "clean", [])
+        self.cache.put(key, self.df)
+        self.assertIn(key, self.cache)
+        assert_frame_equal(self.cache.get(key), self.df)
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_lru_eviction_respects_size_limit(self):
+        frame = pd.DataFrame({"x": np.arange(10_000, dtype=np.float64)})
+        self.cache.put("k1", frame)
+        entry_size = self.cache.size()
+        self.cache.max_bytes = int(entry_size * 2.5)
+        self.cache.put("k2", frame)
+        time.sleep(0.01)
+        self.cache.get("k1")  # k1 becomes most recently used
+        time.sleep(0.01)
+        self.cache.put("k3", frame)
+        self.assertIn("k1", self.cache)
+        self.assertNotIn("k2", self.cache)
+        self.assertIn("k3", self.cache)
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+
+    def test_writes_use_unique_temp_files(self):
+        replaced = []
+        real_replace = os.replace
+
+        def recording_replace(src, dst):
+            replaced.append(src)
+            real_replace(src, dst)
+
+        with unittest.mock.patch.object(cache_module.os, "replace", recording_replace):
+            self.cache.put("k", self.df)
+            self.cache.put("k", self.df)
+        self.assertEqual(len(set(replaced)), 2)
+        self.assertTrue(all(os.path.dirname(path) == self.tmpdir.name for path in replaced))
+
+        # A failed write leaves neither an entry nor a temp file behind.
+        with self.assertRaises(Exception):
+            self.cache.put("bad", lambda: None)
+        self.assertNotIn("bad", self.cache)
+        self.assertFalse([name for name in os.listdir(self.tmpdir.name) if name.endswith(".tmp")])
+
+    def test_invalid_stage_order_raises(self):
+        with self.assertRaises(ValueError):
+            self.cache.run(self.df, [self.stages[2], self.stages[0]])
+        with self.assertRaises(ValueError):
+            self.cache.run(self.df, [{"stage": "unknown"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from DataNinja.plugins.calculator import CalculatorProcessor
+
+
+class TestVectorizedCalculator(unittest.TestCase):
+    def setUp(self):
+        self.calc = CalculatorProcessor()
+
+    def test_scalar_results_unchanged(self):
+        self.assertEqual(self.calc.sin(0.5), math.sin(0.5))
+        self.assertEqual(self.calc.log(8, 2), math.log(8, 2))
+        self.assertEqual(self.calc.convert_unit(100, "C", "F", "temperature"), 212.0)
+        self.assertEqual(self.calc.convert_unit(98.6, "F", "C", "temperature"), (98.6 - 32) * 5 / 9)
+
+    def test_series_in_series_out(self):
+        values = pd.Series([0.0, math.pi / 2, np.nan], index=["x", "y", "z"], name="angle")
+        result = self.calc.sin(values)
+        self.assertIsInstance(result, pd.Series)
+        self.assertEqual(list(result.index), ["x", "y", "z"])
+        self.assertEqual(result.name, "angle")
+        np.testing.assert_allclose(result, [0.0, 1.0, np.nan])
+
+    def test_array_functions_match_math(self):
+        values = np.array([0.5, 1.0, 2.0, 10.0])
+        np.testing.assert_allclose(self.calc.sqrt(values), [math.sqrt(v) for v in values])
+        np.testing.assert_allclose(self.calc.log(values, base=10), [math.log(v, 10) for v in values])
+        np.testing.assert_allclose(self.calc.tan(list(values)), [math.tan(v) for v in values])
+
+    def test_array_validation(self):
+        with self.assertRaisesRegex(ValueError, "Logarithm input must be positive"):
+            self.calc.log(np.array([1.0, 0.0]))
+        with self.assertRaisesRegex(ValueError, "Square root input must be non-negative"):
+            self.calc.sqrt([4.0, -1.0])
+
+    def test_convert_column_matches_scalar_conversion(self):
+        temps = pd.Series(np.linspace(-50, 150, 101))
+        for from_unit in "CFK":
+            for to_unit in "CFK":
+                with self.subTest(from_unit=from_unit, to_unit=to_unit):
+                    expected = [self.calc.convert_unit(t, from_unit, to_unit, "temperature") for t in temps]
+                    np.testing.assert_allclose(
+                        self.calc.convert_unit(temps, from_unit, to_unit, "temperature"), expected
+                    )
+        np.testing.assert_allclose(self.calc.convert_unit([1.0, 2.0], "mile", "km", "length"), [1.60934, 3.21868])
+
+    def test_unknown_units_raise_for_arrays(self):
+        with self.assertRaisesRegex(ValueError, "Unknown units in temperature: X, C"):
+            self.calc.convert_unit(np.zeros(2), "X", "C", "temperature")
+        with self.assertRaisesRegex(ValueError, "Unknown category: luminance"):
+            self.calc.convert_unit(np.zeros(2), "cd", "cd", "luminance")
+
+    def test_evaluate_expression(self):
+        df = pd.DataFrame({"temp_f": [212.0, 32.0]})
+        np.testing.assert_allclose(self.calc.evaluate("(temp_f - 32) * 5 / 9", df), [100.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
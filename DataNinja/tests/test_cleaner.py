@@ -309,6 +309,27 @@ class TestRemoveDuplicates(unittest.TestCase):
             cleaned_df.reset_index(drop=True), expected_df.reset_index(drop=True)
         )
 
+    def test_remove_duplicates_partitioned_strategy(self):
+        with Capturing():
+            cleaned_df = self.cleaner_instance.remove_duplicates(
+                self.data_with_duplicates.copy(),
+                subset=["A", "B"],
+                strategy="partitioned",
+                chunksize=2,
+                n_partitions=3,
+            )
+        assert_frame_equal(
+            cleaned_df, self.data_with_duplicates.drop_duplicates(subset=["A", "B"])
+        )
+
+    def test_remove_duplicates_approx_strategy(self):
+        with Capturing() as output:
+            cleaned_df = self.cleaner_instance.remove_duplicates(
+                self.data_with_duplicates.copy(), strategy="approx", fp_rate=1e-6
+            )
+        assert_frame_equal(cleaned_df, self.data_with_duplicates.drop_duplicates())
+        self.assertTrue(any("estimated false-positive drops" in line for line in output))
+
     def test_no_duplicates(self):
         df_no_duplicates = pd.DataFrame({"X": [1, 2, 3], "Y": ["a", "b", "c"]})
         cleaned_df = self.cleaner_instance.remove_duplicates(df_no_duplicates.copy())
@@ -436,5 +457,109 @@ class TestCleanDataOrchestration(unittest.TestCase):
         )  # Should return original non-DataFrame data
 
 
+class TestCleanDataLowMemory(unittest.TestCase):
+    def setUp(self):
+        self.initial_data = pd.DataFrame(
+            {
+                "ID": [1, 2, 3, 4, 5, 5],
+                "Age": ["28", "35", np.nan, "22", "30", "30"],
+                "Score": ["1.5", "2.5", "3.5", None, "5.5", "5.5"],
+                "City": ["NY", "LA", "CH", "NY", "LA", "LA"],
+            }
+        )
+        self.operations = [
+            {"method": "remove_missing_values", "params": {"subset": ["Age"]}},
+            {"method": "remove_missing_values", "params": {"subset": ["Score"]}},
+            {"method": "convert_column_type", "params": {"column": "Age", "new_type": float}},
+            {"method": "convert_column_type", "params": {"column": "Score", "new_type": float}},
+            {"method": "remove_duplicates", "params": {"subset": ["ID"]}},
+        ]
+
+    def test_low_memory_matches_default_mode(self):
+        with Capturing():
+            expected = DataCleaner(self.initial_data.copy()).clean_data(self.operations)
+            result = DataCleaner(self.initial_data.copy()).clean_data(
+                self.operations, low_memory=True
+            )
+        assert_frame_equal(result, expected)
+
+    def test_low_memory_does_not_modify_input(self):
+        original = self.initial_data.copy()
+        cleaner = DataCleaner(self.initial_data)
+        with Capturing():
+            cleaner.clean_data(self.operations, low_memory=True)
+        assert_frame_equal(self.initial_data, original)
+
+    def test_fuse_operations(self):
+        fused = DataCleaner._fuse_operations(self.operations)
+        self.assertEqual(
+            [op["method"] for op in fused],
+            ["remove_missing_values", "convert_column_types", "remove_duplicates"],
+        )
+        self.assertEqual(fused[0]["params"]["subset"], ["Age", "Score"])
+        self.assertEqual(fused[1]["params"]["mapping"], {"Age": float, "Score": float})
+
+    def test_fused_conversion_falls_back_per_column(self):
+        df = pd.DataFrame({"A": ["1", "2"], "B": ["x", "3"]})
+        cleaner = DataCleaner(df)
+        with Capturing() as output:
+            result = cleaner.convert_column_types(df, {"A": float, "B": float})
+        self.assertEqual(result["A"].dtype, float)
+        self.assertEqual(result["B"].tolist(), ["x", "3"])
+        self.assertTrue(any("Error converting column 'B'" in line for line in output))
+
+    def test_track_memory_reports_each_operation(self):
+        cleaner = DataCleaner(self.initial_data.copy())
+        with Capturing() as output:
+            cleaner.clean_data(self.operations, track_memory=True)
+        self.assertEqual(len(cleaner.memory_report), len(self.operations))
+        self.assertTrue(all(entry["peak_bytes"] >= 0 for entry in cleaner.memory_report))
+        self.assertTrue(any(line.startswith("Memory: remove_duplicates") for line in output))
+
+
+class TestFuzzyDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "name": ["John Smith", "Jon Smith", "Mary Jones", "Mary Jone", "Bob Stone"],
+                "address": ["1 Main St", "1 Main St.", "5 Oak Ave", "5 Oak Ave", "9 Elm Rd"],
+            }
+        )
+        self.cleaner = DataCleaner(self.data.copy())
+
+    def test_assign_fuzzy_clusters(self):
+        with Capturing():
+            result = self.cleaner.assign_fuzzy_clusters(
+                self.data, columns=["name", "address"], threshold=0.6
+            )
+        self.assertEqual(result["cluster_id"].tolist(), [0, 0, 1, 1, 2])
+
+    def test_clean_data_collapses_clusters(self):
+        operations = [
+            {
+                "method": "assign_fuzzy_clusters",
+                "params": {"columns": ["name", "address"], "threshold": 0.6},
+            },
+            {"method": "remove_duplicates", "params": {"subset": ["cluster_id"]}},
+        ]
+        with Capturing():
+            result = self.cleaner.clean_data(operations)
+        self.assertEqual(result["name"].tolist(), ["John Smith", "Mary Jones", "Bob Stone"])
+
+    def test_remove_fuzzy_duplicates(self):
+        with Capturing():
+            result = self.cleaner.remove_fuzzy_duplicates(
+                self.data, columns=["name", "address"], threshold=0.6, keep="last"
+            )
+        self.assertEqual(result["name"].tolist(), ["Jon Smith", "Mary Jone", "Bob Stone"])
+        self.assertEqual(list(result.columns), ["name", "address"])
+
+    def test_missing_column_is_skipped(self):
+        with Capturing() as output:
+            result = self.cleaner.assign_fuzzy_clusters(self.data, columns=["missing"])
+        assert_frame_equal(result, self.data)
+        self.assertTrue(any("Skipping fuzzy clustering" in line for line in output))
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
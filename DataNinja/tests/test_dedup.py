@@ -0,0 +1,209 @@
+import unittest
+import os
+import tempfile
+import shutil
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from DataNinja.core.dedup import (
+    BloomDeduplicator,
+    PartitionedDeduplicator,
+    ScalableBloomFilter,
+)
+
+
+def chunked(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start : start + size]
+
+
+class TestPartitionedDeduplicator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame(
+            {
+                "key": rng.integers(0, 50, size=400),
+                "name": rng.choice(["a", "b", "c"], size=400),
+                "value": np.arange(400),
+            }
+        )
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, **kwargs):
+        with PartitionedDeduplicator(n_partitions=7, spill_dir=self.temp_dir, **kwargs) as engine:
+            return engine.run(chunked(self.data, 37)).to_frame()
+
+    def test_keep_first_matches_drop_duplicates(self):
+        result = self._run(subset=["key", "name"], keep="first")
+        expected = self.data.drop_duplicates(subset=["key", "name"], keep="first")
+        assert_frame_equal(result, expected)
+
+    def test_keep_last_matches_drop_duplicates(self):
+        result = self._run(subset=["key"], keep="last")
+        assert_frame_equal(result, self.data.drop_duplicates(subset=["key"], keep="last"))
+
+    def test_keep_false_matches_drop_duplicates(self):
+        result = self._run(subset=["key", "name"], keep=False)
+        expected = self.data.drop_duplicates(subset=["key", "name"], keep=False)
+        assert_frame_equal(result, expected)
+
+    def test_all_columns_subset(self):
+        data = pd.concat([self.data, self.data.iloc[:10]], ignore_index=True)
+        with PartitionedDeduplicator(n_partitions=3, spill_dir=self.temp_dir) as engine:
+            result = engine.run(chunked(data, 50)).to_frame()
+        assert_frame_equal(result, data.drop_duplicates())
+
+    def test_parallel_partitions(self):
+        result = self._run(subset=["key"], n_jobs=2)
+        assert_frame_equal(result, self.data.drop_duplicates(subset=["key"]))
+
+    def test_iter_chunks_in_input_order_and_cleanup(self):
+        engine = PartitionedDeduplicator(subset=["key"], n_partitions=4)
+        engine.run(chunked(self.data, 100))
+        chunks = list(engine.iter_chunks())
+        engine.cleanup()
+        self.assertGreater(len(chunks), 1)
+        assert_frame_equal(pd.concat(chunks), self.data.drop_duplicates(subset=["key"]))
+        self.assertFalse(os.path.exists(engine.work_dir))
+
+    def test_numeric_looking_text_is_not_reinterpreted(self):
+        ids = pd.DataFrame({"id": ["01234", "1234", "007", "7", " 7", "1e3", "1000", "007", "7"]})
+        with PartitionedDeduplicator(subset=["id"], n_partitions=3, spill_dir=self.temp_dir) as engine:
+            result = engine.run(chunked(ids, 4)).to_frame()
+        assert_frame_equal(result, ids.drop_duplicates())
+        self.assertEqual(len(result), 7)
+
+    def test_chunks_with_different_dtypes(self):
+        # As read_csv chunks drift: int64, then float64 (a missing value), then object (a stray string).
+        chunks = [
+            pd.DataFrame({"key": [1, 2], "row": [0, 1]}),
+            pd.DataFrame({"key": [1.0, np.nan, 3.5], "row": [2, 3, 4]}),
+            pd.DataFrame({"key": ["2", "x", np.nan, "3.5"], "row": [5, 6, 7, 8]}),
+        ]
+        with PartitionedDeduplicator(subset=["key"], n_partitions=5, spill_dir=self.temp_dir) as engine:
+            result = engine.run(chunks).to_frame()
+        self.assertEqual(result["row"].tolist(), [0, 1, 3, 4, 6])
+
+    def test_invalid_keep_raises_valueerror(self):
+        with self.assertRaisesRegex(ValueError, "keep must be"):
+            PartitionedDeduplicator(keep="middle")
+
+    def test_cannot_add_after_run(self):
+        with PartitionedDeduplicator(subset=["key"], spill_dir=self.temp_dir) as engine:
+            engine.run(chunked(self.data, 100))
+            with self.assertRaises(RuntimeError):
+                engine.add_chunk(self.data)
+
+
+class TestScalableBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = ScalableBloomFilter(fp_rate=1e-3, initial_capacity=100)
+        hashes = np.arange(1000, dtype=np.uint64) * np.uint64(2654435761)
+        bloom.add(hashes)
+        self.assertTrue(bloom.contains(hashes).all())
+        self.assertIn(hashes[5], bloom)
+
+    def test_grows_new_slices_beyond_capacity(self):
+        bloom = ScalableBloomFilter(fp_rate=1e-3, initial_capacity=100)
+        bloom.add(np.arange(1000, dtype=np.uint64))
+        self.assertGreater(len(bloom.slices), 1)
+        self.assertLess(bloom.slices[-1].target, bloom.slices[0].target)
+
+    def test_false_positive_rate_near_target(self):
+        bloom = ScalableBloomFilter(fp_rate=1e-2, initial_capacity=5000)
+        bloom.add(np.arange(5000, dtype=np.uint64))
+        others = np.arange(10_000, 30_000, dtype=np.uint64)
+        self.assertLess(bloom.contains(others).mean(), 0.02)
+        self.assertLess(bloom.estimated_fp_rate(), 0.02)
+
+    def test_fixed_filter_never_grows(self):
+        bloom = ScalableBloomFilter(fp_rate=1e-3, initial_capacity=100, fixed=True)
+        nbytes = bloom.nbytes
+        hashes = np.arange(1000, dtype=np.uint64) * np.uint64(2654435761)
+        bloom.add(hashes)
+        self.assertEqual(len(bloom.slices), 1)
+        self.assertEqual(bloom.nbytes, nbytes)
+        self.assertTrue(bloom.contains(hashes).all())
+        self.assertGreater(bloom.estimated_fp_rate(), 1e-3)
+
+    def test_invalid_fp_rate_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            ScalableBloomFilter(fp_rate=0)
+
+
+class TestBloomDeduplicator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.data = pd.DataFrame(
+            {"user": rng.integers(0, 300, size=2000), "page": rng.choice(["a", "b"], size=2000)}
+        )
+
+    def test_never_keeps_duplicates_and_keeps_first_occurrence(self):
+        engine = BloomDeduplicator(subset=["user", "page"], fp_rate=1e-6, initial_capacity=100)
+        result = pd.concat(engine.run(chunked(self.data, 250)))
+        self.assertFalse(result.duplicated(subset=["user", "page"]).any())
+        expected = self.data.drop_duplicates(subset=["user", "page"])
+        # With a tiny fp rate every unique row survives, in input order.
+        assert_frame_equal(result, expected)
+
+    def test_numeric_looking_text_is_not_reinterpreted(self):
+        ids = pd.DataFrame({"id": ["01234", "1234", "007", "7", " 7", "1e3", "1000", "007", "7"]})
+        engine = BloomDeduplicator(subset=["id"], fp_rate=1e-9)
+        result = pd.concat(engine.run(chunked(ids, 4)))
+        assert_frame_equal(result, ids.drop_duplicates())
+        self.assertEqual(engine.stats()["dropped"], 2)
+
+    def test_stats(self):
+        engine = BloomDeduplicator(subset=["user"], fp_rate=1e-4)
+        for _ in engine.run(chunked(self.data, 500)):
+            pass
+        stats = engine.stats()
+        self.assertEqual(stats["rows_in"], 2000)
+        self.assertEqual(stats["rows_in"] - stats["dropped"], stats["rows_out"])
+        self.assertGreaterEqual(stats["estimated_false_positive_drops"], 0.0)
+        self.assertGreater(stats["filter_bytes"], 0)
+
+
+class TestApproxDedupCli(unittest.TestCase):
+    def setUp(self):
+        from typer.testing import CliRunner
+        from DataNinja import cli
+
+        self.cli, self.runner = cli, CliRunner()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_rejects_keep_other_than_first(self):
+        result = self.runner.invoke(self.cli.app, ["dedup", "--approx", "--keep", "last"])
+        self.assertIn("--approx always keeps the first occurrence", result.output)
+
+    def test_empty_input_still_writes_output(self):
+        source = os.path.join(self.temp_dir, "empty.csv")
+        output = os.path.join(self.temp_dir, "out.csv")
+        open(source, "w").close()
+        self.runner.invoke(self.cli.app, ["dedup", "--approx", "--input", source, "--output", output])
+        self.assertTrue(os.path.exists(output))
+
+    def test_streamed_output_keeps_text_keys_format_and_order(self):
+        source = os.path.join(self.temp_dir, "ids.csv")
+        pd.DataFrame({"id": ["007", "7", "0100", "100", "007", "9", "7"], "n": range(7)}).to_csv(source, index=False)
+        for mode in (["--approx"], ["--partitions", "3"]):
+            with self.subTest(mode=mode):
+                output = os.path.join(self.temp_dir, "out.json")
+                result = self.runner.invoke(
+                    self.cli.app,
+                    ["dedup", *mode, "--subset", "id", "--input", source, "--output", output, "--chunksize", "2"],
+                )
+                self.assertEqual(result.exit_code, 0, result.output)
+                written = pd.read_json(output, lines=True, dtype={"id": str})
+                self.assertEqual(written["id"].tolist(), ["007", "7", "0100", "100", "9"])
+                self.assertEqual(written["n"].tolist(), [0, 1, 2, 3, 5])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=["first-arg-is-ignored"], exit=False)
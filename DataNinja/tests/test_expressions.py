@@ -0,0 +1,202 @@
+import subprocess
+import sys
+import textwrap
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from DataNinja.core import expressions
+from DataNinja.core.expressions import Expression, ExpressionError, MapExpression, evaluate
+
+
+def run_with_time_limit(code, seconds=30):
+    """Runs `code` in a fresh interpreter and returns its stdout; fails instead of hanging."""
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True, text=True, timeout=seconds, check=True,
+    ).stdout
+
+
+class TestExpression(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {"a": [1, 2, 3], "b": [4.0, 5.0, 6.0], "unit price": [1.5, 2.0, 2.5]},
+            index=[10, 11, 12],
+        )
+
+    def test_arithmetic_over_columns(self):
+        result = evaluate("(a + b) * 2 - b / 4", self.df)
+        np.testing.assert_allclose(result, (self.df["a"] + self.df["b"]) * 2 - self.df["b"] / 4)
+        self.assertEqual(list(result.index), [10, 11, 12])
+
+    def test_functions_constants_and_backticks(self):
+        result = evaluate("sqrt(b) + sin(pi / 2) + `unit price` * a", self.df)
+        np.testing.assert_allclose(result, np.sqrt(self.df["b"]) + 1 + self.df["unit price"] * self.df["a"])
+        self.assertEqual(Expression("a * `unit price`").columns, ["a", "unit price"])
+
+    def test_boolean_and_conditional_are_elementwise(self):
+        self.assertEqual(evaluate("1 < a <= 2 or b == 6", self.df).tolist(), [False, True, True])
+        self.assertEqual(evaluate("not a > 1", self.df).tolist(), [True, False, False])
+        self.assertEqual(evaluate("b if a > 1 else -1", self.df).tolist(), [-1.0, 5.0, 6.0])
+
+    def test_scalar_expressions(self):
+        self.assertAlmostEqual(evaluate("2 ** -1 + log10(100)"), 2.5)
+        self.assertEqual(evaluate("7", self.df).tolist(), [7, 7, 7])
+
+    def test_integer_constants_cannot_grow_unbounded(self):
+        self.assertTrue(np.isinf(evaluate("9 ** 9 ** 9")))
+
+    def test_nested_constant_powers_finish(self):
+        output = run_with_time_limit("""
+            import pandas as pd
+            from DataNinja.core.expressions import Expression
+            print(Expression("x + 9**9**9**9").evaluate(pd.DataFrame({"x": [1.0]})).tolist())
+        """)
+        self.assertEqual(output.strip(), "[inf]")
+
+    def test_mapping_input_returns_array(self):
+        result = evaluate("x * 2", {"x": np.arange(3)})
+        np.testing.assert_array_equal(result, [0, 2, 4])
+
+    def test_rejects_unsafe_or_invalid_expressions(self):
+        for source in [
+            "__import__('os').system('ls')",
+            "a.__class__",
+            "a[0]",
+            "lambda: 1",
+            "'text'",
+            "open(a)",
+            "sin",
+            "log(a, base=2)",
+            "a if",
+            "",
+        ]:
+            with self.subTest(source=source):
+                with self.assertRaises(ExpressionError):
+                    Expression(source)
+
+    def test_unknown_column_raises(self):
+        with self.assertRaisesRegex(ExpressionError, "Unknown column or name: 'missing'"):
+            evaluate("missing + 1", self.df)
+
+    def test_numexpr_only_for_supported_functions(self):
+        original = expressions.HAS_NUMEXPR
+        expressions.HAS_NUMEXPR = True
+        try:
+            self.assertTrue(Expression("sqrt(a) + b * 2").uses_numexpr)
+            self.assertFalse(Expression("floor(a)").uses_numexpr)
+            self.assertFalse(Expression("a // 2").uses_numexpr)
+        finally:
+            expressions.HAS_NUMEXPR = original
+
+    @unittest.skipUnless(expressions.HAS_NUMEXPR, "numexpr not installed")
+    def test_numexpr_matches_numpy(self):
+        expr = Expression("where(a > 1, sqrt(b), -b) + `unit price`")
+        self.assertTrue(expr.uses_numexpr)
+        expected = np.where(self.df["a"] > 1, np.sqrt(self.df["b"]), -self.df["b"]) + self.df["unit price"]
+        np.testing.assert_allclose(expr.evaluate(self.df), expected)
+
+
+class TestMapExpression(unittest.TestCase):
+    def assert_matches_eval(self, source, values, mode, dtype=None):
+        """The result must equal the old per-row eval() and come from the expected path."""
+        series = pd.Series(values, index=range(10, 10 + len(values)), name="col", dtype=dtype)
+        expr = MapExpression(source)
+        result = expr.apply(series)
+        self.assertEqual(expr.mode, mode)
+        self.assertEqual(result.name, "col")
+        self.assertEqual(list(result.index), list(series.index))
+        self.assertEqual(result.tolist(), [eval(source, {"x": v}) for v in values])
+
+    def test_vectorized_translations(self):
+        self.assert_matches_eval("x * 2 + 1", [1, 2, 3], "vectorized")
+        self.assert_matches_eval("x ** 2 if x > 1 else -x", [1, 2, 3], "vectorized")
+        self.assert_matches_eval("0 < x <= 2 and not x == 1", [0, 1, 2, 3], "vectorized")
+        self.assert_matches_eval("x.strip().upper()", [" a", "b ", "c"], "vectorized")
+        self.assert_matches_eval("x.split(',')[0]", ["a,b", "c,d", "e"], "vectorized")
+        self.assert_matches_eval("len(x[1:])", ["abc", "de", ""], "vectorized")
+        self.assert_matches_eval("x in ('a', 'c')", ["a", "b", "c"], "vectorized")
+        self.assert_matches_eval("'b' in x", ["abc", "xyz"], "vectorized")
+        self.assert_matches_eval("len(str(x))", [5, 50, 500], "vectorized")
+
+    def test_row_wise_fallback_keeps_python_semantics(self):
+        self.assert_matches_eval("x or 'n/a'", ["a", "", "c"], "row-wise")
+        self.assert_matches_eval("f'{x}!'", [1, 2], "row-wise")
+        self.assert_matches_eval("x ** 70", [1, 2, 3], "row-wise")  # would overflow int64
+        self.assert_matches_eval("round(x / 3, 2)", [1, 2, 4], "row-wise")
+        with self.assertRaises(ZeroDivisionError):
+            MapExpression("1 / x").apply(pd.Series([1, 0]))
+
+    def test_vectorizing_never_changes_types(self):
+        # Mixed branch types stay as they are instead of being coerced by numpy.
+        self.assert_matches_eval("x if x > 1 else 'small'", [1, 2, 3], "row-wise")
+        self.assert_matches_eval("x == None", ["a", None], "row-wise", dtype=object)
+        self.assert_matches_eval("x.split(',')[1]", ["a,b", "c,d"], "vectorized")
+        # Python raises on non-strings and short lists; so must map.
+        with self.assertRaises(AttributeError):
+            MapExpression("x.upper()").apply(pd.Series(["a", 1, "b"], dtype=object))
+        with self.assertRaises(IndexError):
+            MapExpression("x.split(',')[1]").apply(pd.Series(["a,b", "c"]))
+
+    def test_vectorized_arithmetic_matches_python_types(self):
+        cases = [
+            ("x + x", [True, False], None),
+            ("x * True", [True, False], None),
+            ("x + True", [True, False], None),
+            ("-x", [True, False], None),
+            ("+x", [True, False], None),
+            ("abs(x)", [True, False], None),
+            ("x ** 0.5", [-4.0, 9.0], None),
+            ("x ** 0.5", [4.0, 9.0], None),
+            ("x + 'a'", ["b", "c"], object),
+            ("x * 2 - 1", [1, 2], None),
+        ]
+        for source, values, dtype in cases:
+            with self.subTest(source=source, values=values):
+                result = MapExpression(source).apply(pd.Series(values, dtype=dtype)).tolist()
+                expected = [eval(source, {"x": v}) for v in values]
+                self.assertEqual(result, expected)
+                if len({type(v) for v in expected}) == 1:  # a Series of mixed results is upcast
+                    self.assertEqual([type(v) for v in result], [type(v) for v in expected])
+        # Python raises on str + NaN; pandas would quietly return NaN.
+        with self.assertRaises(TypeError):
+            MapExpression("x + 'a'").apply(pd.Series(["b", np.nan], dtype=object))
+
+    def test_size_limits(self):
+        output = run_with_time_limit("""
+            import pandas as pd
+            from DataNinja.core.expressions import MapExpression
+            for source in ["x + 9**9**9**9", "x * 10**10", "1 << 10**10", "'%100000000d' % x"]:
+                try:
+                    MapExpression(source).apply(pd.Series(["a"] if "* 10" in source else [1]))
+                except OverflowError:
+                    print("rejected")
+        """)
+        self.assertEqual(output.split(), ["rejected"] * 4)
+        for source in ["f'{x:>100000000}'", "f'{x:{x}}'", "x.zfill(10**9)", "x.center(len(x))"]:
+            with self.subTest(source=source), self.assertRaises(ExpressionError):
+                MapExpression(source)
+
+    def test_row_wise_process_pool(self):
+        expr = MapExpression("x or -1")
+        result = expr.apply(pd.Series(range(1000)), n_jobs=2, chunk_size=300)
+        self.assertEqual(expr.mode, "row-wise")
+        self.assertEqual(result.tolist(), [-1] + list(range(1, 1000)))
+
+    def test_rejects_unsafe_expressions(self):
+        for source in [
+            "__import__('os').system('true')",
+            "x.__class__",
+            "'{0.__class__}'.format(x)",
+            "(lambda: 1)()",
+            "[c for c in x]",
+            "y + 1",
+            "open('/etc/passwd')",
+        ]:
+            with self.subTest(source=source), self.assertRaises(ExpressionError):
+                MapExpression(source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,23 @@
 import unittest
 import math
 import logging  # For capturing log messages
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
 
 # Assuming DataNinja is in PYTHONPATH or structured correctly for this import
-from DataNinja.plugins.geo import GeoProcessor
+from DataNinja.plugins.geo import (
+    Gazetteer,
+    GeocodeCache,
+    GeoIndex,
+    GeoProcessor,
+    normalize_address,
+)
 import pandas as pd  # For testing initialization with data
+import numpy as np
 
 
 # Helper to capture log messages
@@ -230,5 +243,267 @@ class TestGeocodeAddress(unittest.TestCase):
             self.geo_proc.geocode_address("   ")  # Whitespace only
 
 
+class TestVectorizedDistance(unittest.TestCase):
+    def setUp(self):
+        self.geo_proc = GeoProcessor()
+        rng = np.random.default_rng(0)
+        self.a = np.column_stack([rng.uniform(-90, 90, 37), rng.uniform(-180, 180, 37)])
+        self.b = np.column_stack([rng.uniform(-90, 90, 11), rng.uniform(-180, 180, 11)])
+
+    def test_distance_array_matches_scalar_formula(self):
+        a, b = self.a[:10], self.b[:10]
+        result = self.geo_proc.distance_array(a[:, 0], a[:, 1], b[:, 0], b[:, 1], unit="miles")
+        expected = [
+            self.geo_proc.calculate_distance(*map(float, (p[0], p[1], q[0], q[1])), unit="miles")
+            for p, q in zip(a, b)
+        ]
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+    def test_distance_array_broadcasts_scalar_target_and_propagates_nan(self):
+        result = self.geo_proc.distance_array(
+            pd.Series([37.7749, np.nan]), pd.Series([-122.4194, 0.0]), 34.0522, -118.2437
+        )
+        self.assertAlmostEqual(result[0], 559.0, delta=1.0)
+        self.assertTrue(np.isnan(result[1]))
+
+    def test_distance_matrix_blocks_match_full_computation(self):
+        full = self.geo_proc.distance_array(
+            self.a[:, None, 0], self.a[:, None, 1], self.b[None, :, 0], self.b[None, :, 1]
+        )
+        for block_size in (1, 5, 100):
+            np.testing.assert_allclose(
+                self.geo_proc.distance_matrix(self.a, self.b, block_size=block_size), full
+            )
+
+    def test_distance_matrix_writes_into_out(self):
+        out = np.zeros((len(self.a), len(self.b)), dtype=np.float32)
+        result = self.geo_proc.distance_matrix(self.a, self.b, out=out, max_block_bytes=1)
+        self.assertIs(result, out)
+        self.assertTrue((out > 0).all())
+        with self.assertRaisesRegex(ValueError, "'out' must have shape"):
+            self.geo_proc.distance_matrix(self.a, self.b, out=np.zeros((2, 2)))
+
+    def test_vectorized_invalid_unit_raises(self):
+        with self.assertRaisesRegex(ValueError, "Unit must be 'km' or 'miles'"):
+            self.geo_proc.distance_array(0, 0, 1, 1, unit="meters")
+        with self.assertRaisesRegex(ValueError, "Points must be an"):
+            self.geo_proc.distance_matrix([[1, 2, 3]], self.b)
+
+
+class TestNearest(unittest.TestCase):
+    def setUp(self):
+        self.geo_proc = GeoProcessor()
+        self.cache_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(1)
+        self.ref = np.column_stack([rng.uniform(-60, 60, 200), rng.uniform(-180, 180, 200)])
+        self.ref[5] = np.nan  # skipped by the index
+        self.points = np.column_stack([rng.uniform(-60, 60, 50), rng.uniform(-180, 180, 50)])
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_matches_brute_force(self):
+        dist, idx = self.geo_proc.nearest(
+            self.points[:, 0], self.points[:, 1], self.ref[:, 0], self.ref[:, 1], k=3
+        )
+        full = self.geo_proc.distance_matrix(self.points, self.ref)
+        full[:, 5] = np.inf
+        expected = np.argsort(full, axis=1)[:, :3]
+        np.testing.assert_array_equal(idx, expected)
+        np.testing.assert_allclose(dist, np.take_along_axis(full, expected, axis=1), rtol=1e-9)
+
+    def test_missing_query_coordinates(self):
+        dist, idx = GeoIndex(self.ref[:, 0], self.ref[:, 1]).query([np.nan, 10.0], [0.0, 10.0])
+        self.assertEqual(idx[0, 0], -1)
+        self.assertTrue(np.isnan(dist[0, 0]))
+        self.assertGreaterEqual(idx[1, 0], 0)
+
+    def test_index_is_persisted_and_reused(self):
+        first = GeoIndex.cached(self.ref[:, 0], self.ref[:, 1], cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        with patch.object(GeoIndex, "__init__", side_effect=AssertionError("rebuilt")):
+            second = GeoIndex.cached(self.ref[:, 0], self.ref[:, 1], cache_dir=self.cache_dir)
+        np.testing.assert_array_equal(
+            first.query(self.points[:, 0], self.points[:, 1])[1],
+            second.query(self.points[:, 0], self.points[:, 1])[1],
+        )
+
+    def test_kd_tree_matches_ball_tree(self):
+        ball = GeoIndex(self.ref[:, 0], self.ref[:, 1], tree="ball")
+        kd = GeoIndex(self.ref[:, 0], self.ref[:, 1], tree="kd")
+        dist_ball, idx_ball = ball.query(self.points[:, 0], self.points[:, 1], k=2)
+        dist_kd, idx_kd = kd.query(self.points[:, 0], self.points[:, 1], k=2, batch_size=7)
+        np.testing.assert_array_equal(idx_kd, idx_ball)
+        np.testing.assert_allclose(dist_kd, dist_ball, rtol=1e-6)
+        with self.assertRaisesRegex(ValueError, "Unsupported tree"):
+            GeoIndex(self.ref[:, 0], self.ref[:, 1], tree="quad")
+
+    def test_invalid_k_raises(self):
+        index = GeoIndex(self.ref[:10, 0], self.ref[:10, 1])
+        with self.assertRaisesRegex(ValueError, "k must be between"):
+            index.query([0.0], [0.0], k=10)
+
+
+class TestReverseGeocode(unittest.TestCase):
+    def setUp(self):
+        self.geo_proc = GeoProcessor()
+        self.cache_dir = tempfile.mkdtemp()
+        self.places = pd.DataFrame(
+            {
+                "name": ["Los Angeles", "San Francisco", "New York", "Nowhere"],
+                "region": ["CA", "CA", "NY", None],
+                "latitude": [34.05, 37.77, 40.71, np.nan],
+                "longitude": [-118.24, -122.41, -74.0, 0.0],
+            }
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_tags_nearest_place(self):
+        result = self.geo_proc.reverse_geocode_array(
+            [34.1, 40.0, np.nan, 0.0],
+            [-118.3, -74.5, 0.0, 0.0],
+            self.places,
+            columns=["region"],
+            max_distance=1000,
+            cache_dir=None,
+        )
+        self.assertEqual(list(result.columns), ["name", "region", "distance"])
+        self.assertEqual(result["name"].tolist()[:2], ["Los Angeles", "New York"])
+        self.assertEqual(result["region"].tolist()[:2], ["CA", "NY"])
+        self.assertTrue(result.iloc[2:].isna().all().all())  # missing point, too far away
+        self.assertAlmostEqual(
+            result["distance"][0], self.geo_proc.calculate_distance(34.1, -118.3, 34.05, -118.24), places=6
+        )
+
+    def test_index_is_persisted_and_memory_mapped(self):
+        path = os.path.join(self.cache_dir, "places.csv")
+        self.places.to_csv(path, index=False)
+        first = self.geo_proc.reverse_geocode_array([37.0], [-122.0], path, cache_dir=self.cache_dir)
+        index_files = [n for n in os.listdir(self.cache_dir) if n.endswith(".kdtree.joblib")]
+        self.assertEqual(len(index_files), 1)
+        with patch.object(GeoIndex, "__init__", side_effect=AssertionError("rebuilt")):
+            second = self.geo_proc.reverse_geocode_array([37.0], [-122.0], path, cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(first, second)
+        index = GeoIndex.load(os.path.join(self.cache_dir, index_files[0]))
+        self.assertIsInstance(index.tree.data, np.memmap)
+
+
+class TestBatchGeocoding(unittest.TestCase):
+    def setUp(self):
+        self.geo_proc = GeoProcessor()
+        self.temp_dir = tempfile.mkdtemp()
+        self.gazetteer_df = pd.DataFrame(
+            {
+                "address": ["1 Main Street", "22 North Oak Avenue", "5 Saint James Road"],
+                "latitude": [34.0, 40.0, 51.5],
+                "longitude": [-118.0, -74.0, -0.1],
+            }
+        )
+        self.csv_path = os.path.join(self.temp_dir, "gazetteer.csv")
+        self.gazetteer_df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_normalize_address(self):
+        self.assertEqual(normalize_address("22 North Oak Avenue, Apt. 4"), "22 n oak ave apt 4")
+        self.assertEqual(normalize_address("1 MAIN ST."), normalize_address("1 main street"))
+
+    def test_gazetteer_csv_and_sqlite(self):
+        db_path = os.path.join(self.temp_dir, "gazetteer.sqlite")
+        with sqlite3.connect(db_path) as conn:
+            self.gazetteer_df.rename(columns={"address": "addr"}).to_sql("places", conn, index=False)
+        for gazetteer in (Gazetteer(self.csv_path), Gazetteer(db_path, address_col="addr")):
+            result = gazetteer.lookup("22 n. oak ave")
+            self.assertEqual(result["latitude"], 40.0)
+            self.assertEqual(result["address_found"], "22 North Oak Avenue")
+            self.assertIsNone(gazetteer.lookup("10 Unknown Road"))
+
+    def test_geocode_address_uses_gazetteer(self):
+        gazetteer = Gazetteer(self.csv_path)
+        self.assertEqual(self.geo_proc.geocode_address("1 main st", gazetteer=gazetteer)["longitude"], -118.0)
+
+    def test_geocode_batch_aligns_rows_and_caches_results(self):
+        gazetteer = Gazetteer(self.csv_path)
+        cache = GeocodeCache(os.path.join(self.temp_dir, "cache.sqlite"))
+        calls = []
+        lock = threading.Lock()
+
+        def resolver(address):
+            with lock:
+                calls.append(address)
+            return gazetteer.lookup(address)
+
+        addresses = ["1 Main St", None, "nowhere", "1 MAIN STREET", "5 St James Rd", ""]
+        result = self.geo_proc.geocode_batch(
+            addresses, gazetteer=gazetteer, cache=cache, resolver=resolver, max_workers=4
+        )
+        self.assertEqual(result["latitude"].tolist()[0], 34.0)
+        self.assertEqual(result["latitude"].tolist()[3], 34.0)
+        self.assertEqual(result["latitude"].tolist()[4], 51.5)
+        self.assertTrue(result["latitude"].iloc[[1, 2, 5]].isna().all())
+        self.assertEqual(len(calls), 3)  # one per distinct normalized address
+        self.assertEqual(len(cache), 3)  # the miss is cached too
+
+        again = self.geo_proc.geocode_batch(addresses, gazetteer=gazetteer, cache=cache, resolver=resolver)
+        self.assertEqual(len(calls), 3)
+        pd.testing.assert_frame_equal(again, result)
+        cache.close()
+
+    def test_geocode_batch_requires_gazetteer_or_resolver(self):
+        with self.assertRaisesRegex(ValueError, "needs a gazetteer or a resolver"):
+            self.geo_proc.geocode_batch(["1 Main St"])
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = GeocodeCache(os.path.join(self.temp_dir, "lru.sqlite"), max_entries=2)
+        hit = {"latitude": 1.0, "longitude": 2.0, "address_found": "x", "confidence": "exact"}
+        cache.put_many({"a": hit})
+        cache.put_many({"b": hit})
+        cache.get_many(["a"])  # refreshes 'a'
+        cache.put_many({"c": None})
+        self.assertEqual(set(cache.get_many(["a", "b", "c"])), {"a", "c"})
+        self.assertIsNone(cache.get_many(["c"])["c"])
+        cache.close()
+
+
+class TestGeoCliOptions(unittest.TestCase):
+    """--address-column (bulk geocode) and --column (distance output) are separate options."""
+
+    def setUp(self):
+        from DataNinja import cli
+
+        self.cli = cli
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        session = patch.object(cli, "SESSION_FILE", os.path.join(self.temp_dir, "session.pkl"))
+        session.start()
+        self.addCleanup(session.stop)
+
+    def invoke(self, *args):
+        from typer.testing import CliRunner
+
+        result = CliRunner().invoke(self.cli.app, ["geo", *args])
+        self.assertEqual(result.exit_code, 0, result.output)
+        return self.cli.load_session()
+
+    def test_distance_column_name(self):
+        self.cli.save_session(pd.DataFrame({"lat": [0.0], "lon": [0.0]}))
+        df = self.invoke("distance", "--lat-col", "lat", "--lon-col", "lon",
+                         "--lat2", "0", "--lon2", "1", "--column", "dist_km")
+        self.assertIn("dist_km", df.columns)
+        self.assertNotIn("distance", df.columns)
+
+    def test_geocode_address_column(self):
+        gazetteer = os.path.join(self.temp_dir, "gazetteer.csv")
+        pd.DataFrame({"address": ["1 Main Street"], "latitude": [34.0], "longitude": [-118.0]}).to_csv(
+            gazetteer, index=False
+        )
+        self.cli.save_session(pd.DataFrame({"addr": ["1 main st"]}))
+        df = self.invoke("geocode", "--address-column", "addr", "--gazetteer", gazetteer, "--geocode-cache", "")
+        self.assertEqual(df["latitude"].tolist(), [34.0])
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
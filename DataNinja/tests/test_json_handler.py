@@ -273,5 +273,36 @@ class TestJSONHandlerSaveData(unittest.TestCase):
         self.assertIn("is not JSON serializable", str(context.exception).lower())
 
 
+class TestJSONHandlerIterChunks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({"id": range(25), "name": [f"n{i}" for i in range(25)]})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_chunks_streams_json_lines(self):
+        path = os.path.join(self.temp_dir, "data.json")
+        self.df.to_json(path, orient="records", lines=True)
+        chunks = list(JSONHandler(path).iter_chunks(chunksize=10))
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+        assert_frame_equal(pd.concat(chunks, ignore_index=True), self.df)
+
+    def test_iter_chunks_slices_json_array(self):
+        path = os.path.join(self.temp_dir, "array.json")
+        self.df.to_json(path, orient="records")
+        chunks = list(JSONHandler(path).iter_chunks(chunksize=20))
+        self.assertEqual([len(c) for c in chunks], [20, 5])
+
+    def test_iter_chunks_empty_file_yields_nothing(self):
+        path = os.path.join(self.temp_dir, "empty.json")
+        open(path, "w").close()
+        self.assertEqual(list(JSONHandler(path).iter_chunks()), [])
+
+    def test_iter_chunks_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            list(JSONHandler(os.path.join(self.temp_dir, "missing.json")).iter_chunks())
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from DataNinja.core.linkage import FuzzyMatcher
+
+
+class TestFuzzyMatcher(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "name": [
+                    "John Smith",
+                    "Jon Smith",
+                    "john smith ",
+                    "Mary Jones",
+                    "Mary Jone",
+                    "Bob Stone",
+                    "Alice Brown",
+                ],
+                "city": ["NYC", "NYC", "NYC", "LA", "LA", "SF", "Boston"],
+            }
+        )
+
+    def test_minhash_clusters_near_duplicates(self):
+        # True shingle Jaccard of the near-duplicates is 0.62-0.64; 64 hashes
+        # estimate it to within about +-0.1.
+        labels = FuzzyMatcher(["name", "city"], threshold=0.5).cluster(self.data)
+        self.assertEqual(labels.tolist(), [0, 0, 0, 1, 1, 2, 3])
+
+    def test_sorted_neighbourhood_clusters_near_duplicates(self):
+        labels = FuzzyMatcher(["name", "city"], threshold=0.5, method="sorted").cluster(
+            self.data
+        )
+        self.assertEqual(labels.tolist(), [0, 0, 0, 1, 1, 2, 3])
+
+    def test_match_returns_pairs_above_threshold(self):
+        matches = FuzzyMatcher("name", threshold=0.9).match(self.data)
+        self.assertEqual(matches[["left", "right"]].values.tolist(), [[0, 2]])
+        self.assertTrue((matches["similarity"] >= 0.9).all())
+
+    def test_signatures_depend_only_on_shingle_sets(self):
+        matcher = FuzzyMatcher("name", num_perm=256, bands=16)
+        sig = matcher.signatures(np.array(["abcab", "cabca", "abcabcab", "ab", "ab", "b", ""], dtype=object))
+        # {abc, bca, cab} for the first three keys; short keys are one shingle each.
+        np.testing.assert_array_equal(sig[0], sig[1])
+        np.testing.assert_array_equal(sig[0], sig[2])
+        np.testing.assert_array_equal(sig[3], sig[4])
+        self.assertLess((sig[3] == sig[5]).mean(), 0.1)
+        self.assertLess((sig[5] == sig[6]).mean(), 0.1)
+        # 'abcd' vs 'abce': shingles {abc, bcd} and {abc, bce}, Jaccard 1/3.
+        pair = matcher.signatures(np.array(["abcd", "abce"], dtype=object))
+        self.assertAlmostEqual((pair[0] == pair[1]).mean(), 1 / 3, delta=0.1)
+
+    def test_missing_keys_do_not_cluster_together(self):
+        data = pd.DataFrame(
+            {"name": ["John Smith", None, np.nan, "nan", "Jon Smith", None], "city": ["NYC", None, None, None, "NYC", "NYC"]}
+        )
+        labels = FuzzyMatcher(["name", "city"], threshold=0.5).cluster(data)
+        self.assertEqual(labels.tolist(), [0, 1, 2, 3, 0, 4])
+
+    def test_candidate_pairs_are_sparse(self):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {"name": ["".join(rng.choice(list("abcdefghij"), 12)) for _ in range(2000)]}
+        )
+        matcher = FuzzyMatcher("name")
+        keys = matcher._keys(data)
+        pairs = matcher.candidate_pairs(keys, matcher.signatures(keys))
+        self.assertLess(len(pairs), 2000 * 1999 // 2 // 100)
+
+    def test_parallel_scoring_matches_serial(self):
+        matcher = FuzzyMatcher(["name", "city"], threshold=0.5, block_size=2)
+        serial = matcher.match(self.data)
+        matcher.n_jobs = 2
+        parallel = matcher.match(self.data)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_empty_dataframe(self):
+        labels = FuzzyMatcher("name").cluster(self.data.iloc[0:0])
+        self.assertEqual(len(labels), 0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FuzzyMatcher("name", method="bogus")
+        with self.assertRaises(ValueError):
+            FuzzyMatcher("name", num_perm=10, bands=3)
+        with self.assertRaises(KeyError):
+            FuzzyMatcher("missing").cluster(self.data)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=["first-arg-is-ignored"], exit=False)
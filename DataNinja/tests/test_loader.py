@@ -119,6 +119,16 @@ class TestCSVHandler(unittest.TestCase):
         expected_df = pd.DataFrame({"A": [1, 2], "B": ["x", "y"]})
         assert_frame_equal(loaded_df, expected_df)
 
+    def test_iter_chunks(self):
+        handler = CSVHandler(source=self.valid_csv_path)
+        chunks = list(handler.iter_chunks(chunksize=2))
+        self.assertEqual([len(c) for c in chunks], [2, 1])
+        assert_frame_equal(pd.concat(chunks), self.sample_df)
+
+    def test_iter_chunks_empty_csv_yields_nothing(self):
+        handler = CSVHandler(source=self.empty_csv_path)
+        self.assertEqual(list(handler.iter_chunks(chunksize=2)), [])
+
     def test_load_empty_csv_returns_empty_dataframe(self):
         handler = CSVHandler(source=self.empty_csv_path)
         loaded_df = handler.load_data()
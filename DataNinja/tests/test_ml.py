@@ -0,0 +1,302 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+
+from DataNinja.plugins import ml
+from DataNinja.plugins.ml import (
+    MODEL_REGISTRY,
+    FeatureCache,
+    MLModel,
+    ModelCache,
+    create_estimator,
+    predict_chunks,
+    shuffle_batches,
+)
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_default_model_is_logistic_regression(self):
+        self.assertIsInstance(MLModel().model, LogisticRegression)
+
+    def test_n_jobs_passed_only_where_supported(self):
+        forest = create_estimator("random_forest", {"n_estimators": 5}, n_jobs=3)
+        self.assertIsInstance(forest, RandomForestClassifier)
+        self.assertEqual(forest.n_jobs, 3)
+        self.assertNotIn("n_jobs", create_estimator("gradient_boosting", n_jobs=3).get_params())
+
+    def test_unknown_model_type_raises(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported model_type"):
+            MLModel("no_such_model")
+
+    def test_every_registered_model_instantiates(self):
+        for name in MODEL_REGISTRY:
+            self.assertIsNotNone(create_estimator(name))
+
+
+class TestCrossValidationAndSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(200, 3))
+        self.y = (self.X[:, 0] + self.X[:, 1] > 0).astype(int)
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_cross_validate_serial_and_parallel_agree(self):
+        model = MLModel("logistic_regression")
+        serial = model.cross_validate(self.X, self.y, cv=4)
+        parallel = model.cross_validate(self.X, self.y, cv=4, n_jobs=2)
+        self.assertEqual(len(serial["scores"]), 4)
+        np.testing.assert_allclose(serial["scores"], parallel["scores"])
+        self.assertGreater(serial["mean"], 0.9)
+
+    def test_regressor_defaults_to_r2(self):
+        y = self.X @ np.array([1.0, 2.0, 3.0])
+        result = MLModel("linear_regression").cross_validate(self.X, y, cv=3)
+        self.assertAlmostEqual(result["mean"], 1.0)
+
+    def test_grid_search_refits_best_and_caches_trials(self):
+        model = MLModel("logistic_regression")
+        grid = {"C": [0.001, 1.0]}
+        result = model.search(self.X, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        self.assertEqual(result["best_params"], {"C": 1.0})
+        self.assertEqual(len(result["results"]), 2)
+        self.assertEqual(model.model.C, 1.0)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 6)
+
+        with patch.object(ml, "_fit_fold", side_effect=AssertionError("trial re-run")):
+            again = MLModel("logistic_regression").search(self.X, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        self.assertEqual(again["best_score"], result["best_score"])
+
+    def test_failed_trials_do_not_discard_others(self):
+        grid = {"C": [-1.0, 1.0]}  # C must be positive
+        result = MLModel("logistic_regression").search(self.X, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        self.assertEqual(result["best_params"], {"C": 1.0})
+        self.assertTrue(np.isnan(result["results"].loc[0, "mean_score"]))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_interrupted_search_keeps_finished_trials(self):
+        fit_fold, calls = ml._fit_fold, []
+
+        def interrupt_third(task):
+            calls.append(task)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return fit_fold(task)
+
+        grid = {"C": [0.1, 1.0]}
+        with patch.object(ml, "_fit_fold", side_effect=interrupt_third), self.assertRaises(KeyboardInterrupt):
+            MLModel("logistic_regression").search(self.X, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_changed_data_invalidates_search_cache(self):
+        grid = {"C": [1.0]}
+        MLModel("logistic_regression").search(self.X, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        MLModel("logistic_regression").search(self.X + 1, self.y, grid, cv=3, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 6)
+
+    def test_random_search_samples_n_iter_candidates(self):
+        result = MLModel("logistic_regression").search(
+            self.X, self.y, {"C": [0.01, 0.1, 1.0, 10.0]}, cv=3, n_iter=2
+        )
+        self.assertEqual(len(result["results"]), 2)
+
+
+class TestStreamingTraining(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(3000, 3))
+        self.df = pd.DataFrame(X, columns=["a", "b", "c"])
+        self.df["target"] = (X[:, 0] - X[:, 1] > 0).astype(int)
+        # Sorted by target so an unshuffled stream would see one class at a time.
+        self.df = self.df.sort_values("target", ignore_index=True)
+
+    def chunks(self):
+        return (self.df.iloc[i : i + 500] for i in range(0, len(self.df), 500))
+
+    def test_shuffle_batches_preserves_rows(self):
+        batches = list(shuffle_batches(self.chunks(), buffer_size=2000, batch_size=128, random_state=0))
+        self.assertTrue(all(len(b) <= 128 for b in batches))
+        combined = pd.concat(batches)
+        self.assertEqual(sorted(combined.index), list(range(len(self.df))))
+        self.assertNotEqual(list(combined.index), list(range(len(self.df))))
+        # The first batch already mixes both classes.
+        self.assertEqual(batches[0]["target"].nunique(), 2)
+
+    def test_train_stream_sgd(self):
+        model = MLModel("sgd", {"random_state": 0})
+        model.train_stream(self.chunks, target="target", epochs=3, buffer_size=1000)
+        self.assertEqual([h["rows"] for h in model.history], [3000, 3000, 3000])
+        accuracy = (model.model.predict(self.df[["a", "b", "c"]].to_numpy()) == self.df["target"]).mean()
+        self.assertGreater(accuracy, 0.9)
+
+    def test_train_stream_naive_bayes_and_kmeans(self):
+        nb = MLModel("gaussian_nb")
+        nb.train_stream(self.chunks, target="target", features=["a", "b"])
+        self.assertEqual(list(nb.model.classes_), [0, 1])
+        kmeans = MLModel("minibatch_kmeans", {"n_clusters": 2, "random_state": 0, "n_init": 1})
+        kmeans.train_stream(self.chunks, features=["a", "b"])
+        self.assertEqual(kmeans.model.cluster_centers_.shape, (2, 2))
+
+    def test_train_stream_rejects_models_without_partial_fit(self):
+        with self.assertRaisesRegex(ValueError, "does not support partial_fit"):
+            MLModel("random_forest").train_stream(self.chunks, target="target")
+
+
+class TestBatchPrediction(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.normal(size=(300, 2)), columns=["a", "b"])
+        self.df["t"] = (self.df["a"] > 0).astype(int)
+        self.model = RandomForestClassifier(n_estimators=5, random_state=0).fit(self.df[["a", "b"]], self.df["t"])
+        self.model_path = os.path.join(self.temp_dir, "model.rf.pkl")
+        with open(self.model_path, "wb") as f:
+            pickle.dump(self.model, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_predict_chunks_matches_full_predict(self):
+        chunks = (self.df.iloc[i : i + 64] for i in range(0, len(self.df), 64))
+        scored = pd.concat(predict_chunks(self.model, chunks, ["a", "b"]))
+        np.testing.assert_array_equal(scored["prediction"], self.model.predict(self.df[["a", "b"]]))
+        self.assertNotIn("prediction", self.df.columns)
+
+    def test_model_cache_memory_maps_arrays(self):
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        X = self.df[["a", "b"]]
+        knn = KNeighborsClassifier().fit(X, self.df["t"])
+        knn_path = os.path.join(self.temp_dir, "model.knn.pkl")
+        with open(knn_path, "wb") as f:
+            pickle.dump(knn, f)
+        loaded = ModelCache(cache_dir).load(knn_path)
+        self.assertIsInstance(loaded._fit_X, np.memmap)
+        np.testing.assert_array_equal(loaded.predict(X), knn.predict(X))
+
+    def test_model_cache_tree_arrays_are_copied(self):
+        # sklearn's Tree copies its node arrays on unpickling: forests load
+        # correctly from the cache but are not memory-mapped (see ModelCache).
+        loaded = ModelCache(os.path.join(self.temp_dir, "cache")).load(self.model_path)
+        tree = loaded.estimators_[0].tree_
+        self.assertNotIsInstance(tree.value, np.memmap)
+        np.testing.assert_array_equal(tree.value, self.model.estimators_[0].tree_.value)
+        np.testing.assert_array_equal(
+            loaded.predict(self.df[["a", "b"]]), self.model.predict(self.df[["a", "b"]])
+        )
+
+    def test_model_cache_reuses_loaded_model_and_tracks_changes(self):
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        cache = ModelCache(cache_dir)
+        first = cache.load(self.model_path)
+        self.assertIs(cache.load(self.model_path), first)
+        os.utime(self.model_path, ns=(0, 0))  # looks like a retrained model
+        self.assertIsNot(cache.load(self.model_path), first)
+        # The entry for the previous version is evicted.
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+        self.df["label"] = np.where(self.df["a"] + self.df["b"] > 0, "pos", "neg")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_matrix_is_memory_mapped_and_reused(self):
+        cache = FeatureCache(self.cache_dir)
+        X, y = cache.load(self.df, target="label")
+        self.assertEqual(list(X.columns), ["a", "b", "c"])
+        self.assertIsInstance(y, np.memmap)
+        np.testing.assert_array_equal(X.to_numpy(), self.df[["a", "b", "c"]].to_numpy())
+        np.testing.assert_array_equal(y, self.df["label"].to_numpy())
+
+        with patch.object(FeatureCache, "_save") as save:
+            X2, _ = cache.load(self.df, target="label")
+        save.assert_not_called()
+        np.testing.assert_array_equal(X2.to_numpy(), X.to_numpy())
+
+    def test_key_depends_on_data_features_and_dtype(self):
+        cache = FeatureCache(self.cache_dir)
+        cache.load(self.df, target="label")
+        cache.load(self.df, target="label", features=["a", "b"])
+        cache.load(self.df.assign(a=0.0), target="label")
+        FeatureCache(self.cache_dir, dtype="float32").load(self.df, target="label")
+        metas = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+        self.assertEqual(len(metas), 4)
+
+    def test_key_depends_on_transform(self):
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        cache = FeatureCache(self.cache_dir)
+        raw, _ = cache.load(self.df, target="label")
+        scaler = StandardScaler().fit(self.df[["a", "b", "c"]])
+        scaled, _ = cache.load(self.df, target="label", transform=scaler)
+        np.testing.assert_allclose(scaled.to_numpy(), scaler.transform(self.df[["a", "b", "c"]]))
+        self.assertFalse(np.allclose(scaled.to_numpy(), raw.to_numpy()))
+        # A refit scaler is a different transformation.
+        refit = StandardScaler().fit(self.df[["a", "b", "c"]] * 2)
+        self.assertFalse(np.allclose(cache.load(self.df, features=["a", "b", "c"], transform=refit)[0].to_numpy(), scaled.to_numpy()))
+
+        encoder = OneHotEncoder().fit(self.df[["label"]])
+        encoded, _ = cache.load(self.df, features=["label"], transform=encoder)
+        self.assertEqual(list(encoded.columns), ["label_neg", "label_pos"])
+        with patch.object(FeatureCache, "_save") as save:
+            again, _ = cache.load(self.df, features=["label"], transform=encoder)
+        save.assert_not_called()
+        self.assertEqual(list(again.columns), ["label_neg", "label_pos"])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = FeatureCache(self.cache_dir, max_entries=2)
+        cache.load(self.df, features=["a"])
+        cache.load(self.df, features=["b"])
+        cache.load(self.df, features=["a"])  # hit: "a" becomes the most recent
+        cache.load(self.df, features=["c"])
+        kept = sorted(json.load(open(os.path.join(self.cache_dir, n)))["features"][0]
+                      for n in os.listdir(self.cache_dir) if n.endswith(".json"))
+        self.assertEqual(kept, ["a", "c"])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)  # .json and .X.npy each
+
+    def test_sklearn_reads_matrix_without_copying(self):
+        from sklearn.utils import check_array
+
+        X, _ = FeatureCache(self.cache_dir, dtype="float32").load(self.df, target="label")
+        self.assertEqual(X.to_numpy().dtype, np.float32)
+        self.assertTrue(np.shares_memory(check_array(X, dtype=np.float32), X.to_numpy()))
+
+    def test_workers_map_cached_matrix_by_path(self):
+        X, y = FeatureCache(self.cache_dir).load(self.df, target="label")
+        self.assertIsInstance(ml._shareable(X), ml._MappedArray)
+        self.assertIsInstance(ml._shareable(y), ml._MappedArray)
+        # Subsets must travel as data, not as the whole file.
+        self.assertIsInstance(ml._shareable(X.iloc[::-1]), pd.DataFrame)
+        self.assertIsInstance(ml._shareable(y[10:]), np.ndarray)
+
+        model = MLModel("logistic_regression")
+        serial = model.cross_validate(X, y, cv=3)
+        parallel = model.cross_validate(X, y, cv=3, n_jobs=2)
+        np.testing.assert_allclose(serial["scores"], parallel["scores"])
+        model.train(X, y)
+        self.assertEqual(list(model.model.feature_names_in_), ["a", "b", "c"])
+
+    def test_invalid_dtype_raises(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported feature dtype"):
+            FeatureCache(self.cache_dir, dtype="int64")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from DataNinja.core.pipeline import TransformPipeline
+from DataNinja.core.transformer import DataTransformer
+
+
+class TestTransformPipeline(unittest.TestCase):
+    def setUp(self):
+        self.train = pd.DataFrame(
+            {
+                "num1": [1.0, 2.0, 3.0, 4.0, 5.0],
+                "num2": [10, 20, 30, 40, 50],
+                "cat": ["A", "B", "A", "C", None],
+                "city": ["x", "y", "z", "x", "y"],
+                "tag": ["p", "q", "p", "q", "r"],
+            }
+        )
+        self.batch = pd.DataFrame(
+            {
+                "num1": [0.0, 6.0, 3.0],
+                "num2": [15, 60, 30],
+                "cat": ["B", "D", None],
+                "city": ["y", "x", "w"],
+                "tag": ["q", "p", "r"],
+            }
+        )
+        self.steps = [
+            {"method": "scale_numerical_features", "params": {"columns": ["num1"], "scaler_type": "minmax"}},
+            {"method": "scale_numerical_features", "params": {"columns": ["num2"], "scaler_type": "standard"}},
+            {"method": "encode_categorical_features", "params": {"columns": ["cat"]}},
+            {"method": "encode_categorical_features", "params": {"columns": ["city"], "encoder_type": "ordinal"}},
+            {
+                "method": "encode_categorical_features",
+                "params": {"columns": ["tag"], "encoder_type": "hashing", "n_features": 8},
+            },
+        ]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "pipeline.npz")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _reference(self, df):
+        """Applies the steps through a DataTransformer fitted on the training data."""
+        transformer = DataTransformer(self.train)
+        transformer.transform_data(self.steps)
+        return transformer.transform(df.copy())
+
+    def test_fit_transform_matches_transform_data(self):
+        pipeline = TransformPipeline(self.steps)
+        result = pipeline.fit_transform(self.train)
+        expected = DataTransformer(self.train).transform_data(self.steps)
+        assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_transform_does_not_refit(self):
+        pipeline = TransformPipeline(self.steps).fit(self.train)
+        result = pipeline.transform(self.batch)
+        # num1 was fitted on [1, 5], so 0 and 6 fall outside [0, 1].
+        np.testing.assert_allclose(result["num1"], [-0.25, 1.25, 0.5])
+        mean, std = 30.0, np.std([10, 20, 30, 40, 50])
+        np.testing.assert_allclose(result["num2"], (np.array([15, 60, 30]) - mean) / std, atol=1e-12)
+        # Unknown category 'D' encodes to all zeros, like handle_unknown='ignore'.
+        self.assertEqual(result.loc[1, ["cat_A", "cat_B", "cat_C", "cat_nan"]].sum(), 0)
+        self.assertEqual(result.loc[2, "cat_nan"], 1.0)
+        self.assertEqual(result["city"].tolist(), [1, 0, -1])
+
+    def test_transform_matches_fitted_transformer(self):
+        pipeline = TransformPipeline(self.steps).fit(self.train)
+        assert_frame_equal(pipeline.transform(self.batch), self._reference(self.batch), check_dtype=False)
+
+    def test_save_load_roundtrip(self):
+        pipeline = TransformPipeline(self.steps).fit(self.train)
+        pipeline.save(self.path)
+        loaded = TransformPipeline.load(self.path)
+        self.assertEqual(loaded.steps, self.steps)
+        assert_frame_equal(loaded.transform(self.batch), pipeline.transform(self.batch))
+
+    def test_saved_file_loads_without_pickle(self):
+        TransformPipeline(self.steps).fit(self.train).save(self.path)
+        with np.load(self.path, allow_pickle=False) as data:
+            self.assertTrue(all(data[key].dtype != object for key in data.files))
+
+    def test_sparse_and_drop_first_roundtrip(self):
+        steps = [
+            {
+                "method": "encode_categorical_features",
+                "params": {"columns": ["cat"], "sparse": True, "drop": "first"},
+            }
+        ]
+        pipeline = TransformPipeline(steps).fit(self.train)
+        pipeline.save(self.path)
+        result = TransformPipeline.load(self.path).transform(self.batch)
+        self.assertNotIn("cat_A", result.columns)
+        self.assertIsInstance(result["cat_B"].dtype, pd.SparseDtype)
+        self.assertEqual(result["cat_B"].sparse.to_dense().tolist(), [1.0, 0.0, 0.0])
+
+    def test_numeric_categories_roundtrip(self):
+        train = pd.DataFrame({"code": [1, 2, 3, 2]})
+        steps = [{"method": "encode_categorical_features", "params": {"columns": ["code"]}}]
+        pipeline = TransformPipeline(steps).fit(train)
+        pipeline.save(self.path)
+        result = TransformPipeline.load(self.path).transform(pd.DataFrame({"code": [3, 4]}))
+        self.assertEqual(result.columns.tolist(), ["code_1", "code_2", "code_3"])
+        self.assertEqual(result.iloc[0].tolist(), [0.0, 0.0, 1.0])
+        self.assertEqual(result.iloc[1].tolist(), [0.0, 0.0, 0.0])
+
+    def test_object_categories_keep_their_type(self):
+        train = pd.DataFrame({"code": pd.Series([1, "1", 2.5, "x"], dtype=object)})
+        batch = pd.DataFrame({"code": pd.Series(["1", 1, 2.5, "2.5", "x"], dtype=object)})
+        steps = [{"method": "encode_categorical_features", "params": {"columns": ["code"], "encoder_type": "ordinal"}}]
+        pipeline = TransformPipeline(steps).fit(train)
+        expected = pipeline.transform(batch)["code"].tolist()
+        self.assertEqual(expected, [1, 0, 2, -1, 3])
+        pipeline.save(self.path)
+        self.assertEqual(TransformPipeline.load(self.path).transform(batch)["code"].tolist(), expected)
+
+        # Ints in an object column must not turn into strings either.
+        train = pd.DataFrame({"code": pd.Series([1, 2, 3], dtype=object)})
+        steps = [{"method": "encode_categorical_features", "params": {"columns": ["code"]}}]
+        pipeline = TransformPipeline(steps).fit(train)
+        pipeline.save(self.path)
+        result = TransformPipeline.load(self.path).transform(pd.DataFrame({"code": pd.Series([3, "3"], dtype=object)}))
+        self.assertEqual(result.iloc[0].tolist(), [0.0, 0.0, 1.0])
+        self.assertEqual(result.iloc[1].tolist(), [0.0, 0.0, 0.0])
+
+    def test_unstorable_categories_raise(self):
+        train = pd.DataFrame({"when": pd.Series([pd.Timestamp("2024-01-01"), "x"], dtype=object)})
+        steps = [{"method": "encode_categorical_features", "params": {"columns": ["when"], "encoder_type": "ordinal"}}]
+        with self.assertRaisesRegex(ValueError, "Cannot store category"):
+            TransformPipeline(steps).fit(train)
+
+    def test_unsupported_step_raises(self):
+        with self.assertRaises(ValueError):
+            TransformPipeline([{"method": "apply_custom_function", "params": {}}])
+
+    def test_transform_before_fit_raises(self):
+        with self.assertRaises(RuntimeError):
+            TransformPipeline(self.steps).transform(self.batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import io  # For Capturing
 import sys  # For Capturing
 
 from DataNinja.core.plotter import DataPlotter
+from DataNinja.core import downsample
 
 # matplotlib.pyplot is implicitly imported by DataPlotter,
 # and its functions like show() or savefig() are what we'll often mock.
@@ -298,5 +299,253 @@ class TestPlottingWithEmptyOrInvalidData(unittest.TestCase):
         self.assertIn("Column 'AnyCol' not found in data.", output)
 
 
+class TestDownsampleHelpers(unittest.TestCase):
+    def test_histogram_counts_matches_numpy(self):
+        values = np.random.default_rng(0).normal(size=1000)
+        counts, edges = downsample.histogram_counts(values, bins=20)
+        expected, expected_edges = np.histogram(values, bins=20)
+        np.testing.assert_array_equal(counts, expected)
+        np.testing.assert_allclose(edges, expected_edges)
+
+    def test_histogram_chunks_equals_single_pass(self):
+        df = pd.DataFrame({"v": np.random.default_rng(1).uniform(0, 10, 5000)})
+        chunks = [df.iloc[i : i + 700] for i in range(0, len(df), 700)]
+        counts, edges = downsample.histogram_chunks(chunks, "v", bins=10, range=(0, 10))
+        expected, _ = np.histogram(df["v"], bins=10, range=(0, 10))
+        np.testing.assert_array_equal(counts, expected)
+        with self.assertRaises(ValueError):
+            downsample.histogram_chunks(chunks, "v", bins=10)
+
+    def test_bin_2d_counts_every_finite_point(self):
+        x = np.array([0.0, 1.0, 2.0, np.nan])
+        y = np.array([0.0, 1.0, 2.0, 3.0])
+        counts, _, _ = downsample.bin_2d(x, y, gridsize=4)
+        self.assertEqual(counts.sum(), 3)
+
+    def test_lttb_keeps_endpoints_and_spike(self):
+        x = np.arange(10_000, dtype=float)
+        y = np.zeros_like(x)
+        y[4321] = 100.0
+        kept = downsample.lttb_indices(x, y, 100)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], 9999)
+        self.assertIn(4321, kept)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_lttb_returns_all_points_when_small(self):
+        np.testing.assert_array_equal(downsample.lttb_indices(np.arange(5.0), np.arange(5.0), 10), np.arange(5))
+
+    def test_minmax_envelope_keeps_extremes_per_bucket(self):
+        x = np.arange(100_000, dtype=float)
+        y = np.sin(x / 1000)
+        y[54_321] = 50.0
+        y[12_345] = -50.0
+        x_out, y_out = downsample.minmax_envelope(x, y, 80)
+        self.assertEqual(len(x_out), 160)
+        self.assertEqual(y_out.max(), 50.0)
+        self.assertEqual(y_out.min(), -50.0)
+        self.assertTrue(np.all(np.diff(x_out) >= 0))
+
+    def test_minmax_envelope_small_input_is_sorted_passthrough(self):
+        x_out, y_out = downsample.minmax_envelope([3, 1, 2], [30, 10, 20], 80)
+        np.testing.assert_array_equal(x_out, [1, 2, 3])
+        np.testing.assert_array_equal(y_out, [10, 20, 30])
+
+    def test_sample_indices(self):
+        kept = downsample.sample_indices(1_000_000, 500)
+        self.assertEqual(len(np.unique(kept)), 500)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        np.testing.assert_array_equal(downsample.sample_indices(10, 500), np.arange(10))
+
+
+class TestBigDataModes(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(
+            {
+                "x": rng.normal(size=5000),
+                "y": rng.normal(size=5000),
+                "t": pd.date_range("2024-01-01", periods=5000, freq="min"),
+            }
+        )
+        self.plotter = DataPlotter(self.df, big_data_threshold=1000)
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+
+        plt.close("all")
+
+    def test_histogram_auto_prebins_above_threshold(self):
+        with patch("DataNinja.core.plotter.sns.histplot") as mock_histplot:
+            fig = self.plotter.plot_histogram("x", bins=25)
+        mock_histplot.assert_not_called()
+        patches = fig.axes[0].patches
+        self.assertEqual(len(patches), 1)  # a single StepPatch instead of one bar per row/bin
+
+    def test_histogram_streams_chunks(self):
+        chunks = (self.df.iloc[i : i + 1000] for i in range(0, len(self.df), 1000))
+        fig = self.plotter.plot_histogram("x", bins=10, chunks=chunks, range=(-5, 5))
+        step = fig.axes[0].patches[0]
+        self.assertEqual(step.get_data().values.sum(), ((self.df["x"] >= -5) & (self.df["x"] <= 5)).sum())
+
+    def test_scatter_auto_uses_hexbin_above_threshold(self):
+        with patch("DataNinja.core.plotter.sns.scatterplot") as mock_scatter:
+            fig = self.plotter.plot_scatter("x", "y")
+        mock_scatter.assert_not_called()
+        self.assertEqual(len(fig.axes), 2)  # plot + colorbar
+
+    def test_scatter_raster_mode(self):
+        fig = self.plotter.plot_scatter("x", "y", mode="raster", gridsize=50)
+        self.assertEqual(fig.axes[0].collections[0].get_array().shape, (50, 50))
+
+    def test_line_is_downsampled(self):
+        fig = self.plotter.plot_line("t", "y", max_points=500)
+        line = fig.axes[0].get_lines()[0]
+        self.assertEqual(len(line.get_xdata()), 500)
+
+    def test_line_missing_column(self):
+        self.assertIsNone(self.plotter.plot_line("t", "missing"))
+
+
+class TestBarFastPath(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(
+            {
+                "cat": rng.choice(["b", "a", "c"], size=3000),
+                "value": rng.normal(10, 2, size=3000),
+            }
+        )
+        self.plotter = DataPlotter(self.df, big_data_threshold=1000)
+
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+
+        plt.close("all")
+
+    def test_aggregate_mean_with_analytic_ci(self):
+        aggregated = self.plotter.aggregate_bar("cat", "value", estimator="mean", ci=95)
+        expected = self.df.groupby("cat", sort=False)["value"].mean()
+        self.assertEqual(list(aggregated.index), list(self.df["cat"].unique()))
+        np.testing.assert_allclose(aggregated["value"], expected.reindex(aggregated.index))
+        group = self.df.loc[self.df["cat"] == "a", "value"]
+        from scipy import stats
+
+        half_width = stats.t.ppf(0.975, len(group) - 1) * group.std() / np.sqrt(len(group))
+        self.assertAlmostEqual(aggregated.loc["a", "error"], half_width)
+
+    def test_aggregate_without_ci_or_for_other_estimators(self):
+        self.assertNotIn("error", self.plotter.aggregate_bar("cat", "value", ci=None))
+        median = self.plotter.aggregate_bar("cat", "value", estimator="median")
+        self.assertNotIn("error", median)
+        self.assertAlmostEqual(median.loc["a", "value"], self.df.loc[self.df["cat"] == "a", "value"].median())
+
+    def test_aggregate_count_uses_value_counts(self):
+        counts = self.plotter.aggregate_bar("cat", "value", estimator="count")
+        self.assertEqual(counts["value"].sum(), 3000)
+
+    def test_auto_mode_skips_seaborn_above_threshold(self):
+        with patch("DataNinja.core.plotter.sns.barplot") as mock_barplot, patch(
+            "DataNinja.core.plotter.sns.countplot"
+        ) as mock_countplot:
+            fig = self.plotter.plot_bar("cat", "value")
+            count_fig = self.plotter.plot_bar("cat", "value", estimator="count")
+        mock_barplot.assert_not_called()
+        mock_countplot.assert_not_called()
+        self.assertEqual(len(fig.axes[0].patches), 3)
+        self.assertEqual(sum(p.get_height() for p in count_fig.axes[0].patches), 3000)
+
+    def test_seaborn_mode_below_threshold(self):
+        small = DataPlotter(self.df.head(100), big_data_threshold=1000)
+        with patch("DataNinja.core.plotter.sns.barplot") as mock_barplot:
+            small.plot_bar("cat", "value")
+        mock_barplot.assert_called_once()
+
+
+class TestExportPlots(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.plotter = DataPlotter(
+            pd.DataFrame(
+                {
+                    "x": rng.normal(size=200),
+                    "y": rng.normal(size=200),
+                    "cat": rng.choice(["a", "b"], size=200),
+                }
+            )
+        )
+        self.specs = [
+            {"plot_type": "histogram", "path": os.path.join(self.temp_dir, "h.png"), "params": {"column": "x"}},
+            {"plot_type": "scatter", "path": os.path.join(self.temp_dir, "s.svg"), "params": {"x_column": "x", "y_column": "y"}},
+            {"plot_type": "bar", "path": os.path.join(self.temp_dir, "b.png"), "params": {"x_column": "cat", "y_column": "y", "mode": "fast"}},
+            {"plot_type": "line", "path": os.path.join(self.temp_dir, "l.png"), "params": {"x_column": "x", "y_column": "y"}},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_export_serial_writes_all_files(self):
+        saved = self.plotter.export_plots(self.specs)
+        self.assertEqual(saved, [spec["path"] for spec in self.specs])
+        for path in saved:
+            self.assertGreater(os.path.getsize(path), 0)
+        with open(self.specs[1]["path"]) as f:
+            self.assertIn("<svg", f.read())
+
+    def test_export_in_process_pool(self):
+        saved = self.plotter.export_plots(self.specs, n_jobs=2)
+        self.assertEqual(len(saved), len(self.specs))
+        self.assertTrue(all(os.path.exists(path) for path in saved))
+
+    def test_export_reports_bad_specs(self):
+        specs = self.specs[:1] + [
+            {"plot_type": "unknown", "path": os.path.join(self.temp_dir, "u.png")},
+            {"plot_type": "histogram", "path": os.path.join(self.temp_dir, "m.png"), "params": {"column": "missing"}},
+        ]
+        with Capturing() as output:
+            saved = self.plotter.export_plots(specs)
+        self.assertEqual(saved, [specs[0]["path"]])
+        self.assertIn("Exported 1 of 3 plots.", output)
+
+    def test_plot_methods_draw_into_given_axes(self):
+        from matplotlib.figure import Figure
+
+        fig = Figure()
+        ax = fig.add_subplot()
+        self.assertIs(self.plotter.plot_histogram("x", ax=ax), fig)
+        self.assertGreater(len(ax.patches), 0)
+
+
+class TestTerminalPlotCommand(unittest.TestCase):
+    """The `plot` command only downsamples numeric columns."""
+
+    def setUp(self):
+        from DataNinja import cli
+
+        self.cli = cli
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        session = patch.object(cli, "SESSION_FILE", os.path.join(self.temp_dir, "session.pkl"))
+        session.start()
+        self.addCleanup(session.stop)
+        cli.save_session(pd.DataFrame({"city": ["a", "b", "c"], "n": [1.0, 2.0, 3.0], "m": [3, 2, 1]}))
+
+    def _scatter_args(self, columns):
+        from typer.testing import CliRunner
+
+        with patch.object(self.cli, "plt") as plt:
+            result = CliRunner().invoke(self.cli.app, ["plot", "scatter", columns])
+        self.assertEqual(result.exit_code, 0, result.output)
+        return [list(arg) for arg in plt.scatter.call_args.args]
+
+    def test_scatter_keeps_categorical_values(self):
+        self.assertEqual(self._scatter_args("city,n"), [["a", "b", "c"], [1.0, 2.0, 3.0]])
+
+    def test_scatter_samples_numeric_columns(self):
+        self.assertEqual(self._scatter_args("n,m"), [[1.0, 2.0, 3.0], [3.0, 2.0, 1.0]])
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -0,0 +1,200 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.client import HTTPConnection
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from DataNinja.plugins.serving import MicroBatcher, PredictionServer
+
+
+class CountingModel:
+    """Predicts x * 2 and records the size of every predict call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return (X["x"] * 2).to_numpy()
+
+
+class StrictModel(CountingModel):
+    """Like CountingModel, but rejects any batch with a missing x."""
+
+    def predict(self, X):
+        if "x" not in X or X["x"].isna().any():
+            raise ValueError("x is required")
+        return super().predict(X)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_one_predict_call(self):
+        model = CountingModel()
+        batcher = MicroBatcher(model, max_batch_size=100, max_latency_ms=200)
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def worker(i):
+            barrier.wait()
+            results[i] = batcher.submit([{"x": i}, {"x": i + 100}])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.close()
+
+        for i in range(8):
+            self.assertEqual(results[i], [2 * i, 2 * (i + 100)])
+        self.assertEqual(sum(model.calls), 16)
+        self.assertLess(len(model.calls), 8)
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 8)
+        self.assertEqual(stats["records"], 16)
+        self.assertEqual(stats["batches"], len(model.calls))
+        self.assertIn("latency_ms_p99", stats)
+
+    def test_batch_size_caps_records_per_call(self):
+        model = CountingModel()
+        batcher = MicroBatcher(model, max_batch_size=2, max_latency_ms=1000)
+        threads = [
+            threading.Thread(target=batcher.submit, args=([{"x": i}],)) for i in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.close()
+        self.assertTrue(all(n <= 2 for n in model.calls))
+        self.assertEqual(sum(model.calls), 6)
+
+    def test_prediction_error_reaches_caller(self):
+        batcher = MicroBatcher(CountingModel(), max_latency_ms=1)
+        with self.assertRaises(KeyError):
+            batcher.submit([{"y": 1}])
+        batcher.close()
+        self.assertEqual(batcher.stats()["errors"], 1)
+
+    def test_bad_request_does_not_fail_its_batch(self):
+        model = StrictModel()
+        batcher = MicroBatcher(model, max_batch_size=100, max_latency_ms=200)
+        results, barrier = {}, threading.Barrier(4)
+
+        def worker(i):
+            barrier.wait()
+            try:
+                results[i] = batcher.submit([{"y": 1}] if i == 0 else [{"x": i}])
+            except ValueError as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.close()
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual([results[i] for i in (1, 2, 3)], [[2], [4], [6]])
+        self.assertEqual(batcher.stats()["errors"], 1)
+
+    def test_uses_model_feature_names(self):
+        X = pd.DataFrame({"a": [0, 1, 0, 1], "b": [0, 0, 1, 1]})
+        model = LogisticRegression().fit(X, [0, 1, 0, 1])
+        batcher = MicroBatcher(model, max_latency_ms=1)
+        self.assertEqual(batcher.features, ["a", "b"])
+        # Key order in the record does not matter, extra keys are dropped.
+        self.assertEqual(batcher.submit([{"b": 0, "extra": 5, "a": 1}]), [1])
+        batcher.close()
+
+
+class TestPredictionServer(unittest.TestCase):
+    def _start(self, server):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+
+    def test_http_predict_and_stats(self):
+        server = PredictionServer(CountingModel(), port=0, max_latency_ms=1)
+        self._start(server)
+
+        def post(payload):
+            req = urllib.request.Request(
+                server.address + "/predict",
+                data=json.dumps(payload).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(req) as resp:
+                return json.load(resp)
+
+        self.assertEqual(post({"x": 3}), {"predictions": [6]})
+        self.assertEqual(post([{"x": 1}, {"x": 2}]), {"predictions": [2, 4]})
+        self.assertEqual(post({"records": [{"x": 5}]}), {"predictions": [10]})
+
+        with urllib.request.urlopen(server.address + "/stats") as resp:
+            stats = json.load(resp)
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["records"], 4)
+
+        req = urllib.request.Request(server.address + "/predict", data=b"[1, 2]")
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(req)
+        self.assertEqual(ctx.exception.code, 400)
+
+    def test_failed_bind_stops_batcher(self):
+        taken = PredictionServer(CountingModel(), port=0)
+        self.addCleanup(taken.close)
+        before = threading.active_count()
+        with self.assertRaises(OSError):
+            PredictionServer(CountingModel(), port=taken.httpd.server_address[1])
+        self.assertEqual(threading.active_count(), before)
+
+    @unittest.skipUnless(hasattr(__import__("socket"), "AF_UNIX"), "needs Unix sockets")
+    def test_unix_socket(self):
+        import socket
+
+        path = os.path.join(tempfile.mkdtemp(), "serve.sock")
+        server = PredictionServer(CountingModel(), unix_socket=path, max_latency_ms=1)
+        self._start(server)
+
+        class UnixConnection(HTTPConnection):
+            def connect(self):
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(path)
+
+        conn = UnixConnection("localhost")
+        conn.request("POST", "/predict", body=json.dumps({"x": 4}))
+        resp = conn.getresponse()
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(json.load(resp), {"predictions": [8]})
+        conn.close()
+
+    @unittest.skipUnless(hasattr(__import__("socket"), "AF_UNIX"), "needs Unix sockets")
+    def test_unix_socket_path_never_removes_other_files(self):
+        path = os.path.join(tempfile.mkdtemp(), "data.csv")
+        with open(path, "w") as f:
+            f.write("keep me")
+        with self.assertRaisesRegex(FileExistsError, "not a Unix socket"):
+            PredictionServer(CountingModel(), unix_socket=path)
+        with open(path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+        # A stale socket from an earlier server is replaced, and removed on close.
+        path = os.path.join(os.path.dirname(path), "serve.sock")
+        stale = PredictionServer(CountingModel(), unix_socket=path)
+        stale.httpd.server_close()  # closed without removing its socket file
+        stale.batcher.close()
+        self.assertTrue(os.path.exists(path))
+        server = PredictionServer(CountingModel(), unix_socket=path)
+        server.close()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -257,5 +257,35 @@ class TestSQLiteHandlerSaveAndLoadData(unittest.TestCase):
             handler.load_data(table_name="any_table")
 
 
+class TestSQLiteHandlerIterChunks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "chunks.db")
+        self.df = pd.DataFrame({"id": range(25), "value": [i * 1.5 for i in range(25)]})
+        SQLiteHandler(self.db_path).save_data(self.df, table_name="items")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_chunks_table(self):
+        chunks = list(SQLiteHandler(self.db_path).iter_chunks(table_name="items", chunksize=10))
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+        assert_frame_equal(pd.concat(chunks, ignore_index=True), self.df)
+
+    def test_iter_chunks_query(self):
+        chunks = list(
+            SQLiteHandler(self.db_path).iter_chunks(
+                query="SELECT id FROM items WHERE id < 12", chunksize=5
+            )
+        )
+        self.assertEqual(sum(len(c) for c in chunks), 12)
+
+    def test_iter_chunks_validates_arguments(self):
+        with self.assertRaises(ValueError):
+            list(SQLiteHandler(self.db_path).iter_chunks())
+        with self.assertRaises(ValueError):
+            list(SQLiteHandler(self.db_path).iter_chunks(table_name="items; DROP"))
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
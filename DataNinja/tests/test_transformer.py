@@ -6,8 +6,13 @@ import io
 import sys
 import logging  # For capturing print output from the class
 
-from DataNinja.core.transformer import DataTransformer
-from sklearn.preprocessing import MinMaxScaler, OneHotEncoder  # For verifying behavior
+from DataNinja.core.transformer import DataTransformer, CategoryCodeEncoder, HashingEncoder
+from sklearn.preprocessing import (  # For verifying behavior
+    MinMaxScaler,
+    OneHotEncoder,
+    RobustScaler,
+    StandardScaler,
+)
 
 
 # Helper to capture print/logging outputs
@@ -179,6 +184,68 @@ class TestScaleNumericalFeatures(unittest.TestCase):
         self.assertIn("Numeric3_all_same", self.transformer_instance.scalers)
 
 
+class TestVectorizedAndStreamingScaling(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "A": [1.0, 2.0, 3.0, 4.0, 100.0, 6.0],
+                "B": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+                "Label": ["a", "b", "c", "d", "e", "f"],
+            }
+        )
+        self.transformer = DataTransformer(self.data.copy())
+
+    def test_multiple_columns_share_one_scaler(self):
+        scaled_df = self.transformer.scale_numerical_features(
+            self.data.copy(), columns=["A", "B"], scaler_type="minmax"
+        )
+        self.assertIs(self.transformer.scalers["A"], self.transformer.scalers["B"])
+        expected = MinMaxScaler().fit_transform(self.data[["A", "B"]])
+        np.testing.assert_allclose(scaled_df[["A", "B"]].to_numpy(), expected)
+
+    def test_standard_scaler(self):
+        scaled_df = self.transformer.scale_numerical_features(
+            self.data.copy(), columns=["A", "B"], scaler_type="standard"
+        )
+        expected = StandardScaler().fit_transform(self.data[["A", "B"]])
+        np.testing.assert_allclose(scaled_df[["A", "B"]].to_numpy(), expected)
+        self.assertIsInstance(self.transformer.scalers["A"], StandardScaler)
+
+    def test_robust_scaler(self):
+        scaled_df = self.transformer.scale_numerical_features(
+            self.data.copy(), columns=["A"], scaler_type="robust"
+        )
+        expected = RobustScaler().fit_transform(self.data[["A"]])
+        np.testing.assert_allclose(scaled_df[["A"]].to_numpy(), expected)
+
+    def test_fit_partial_matches_full_fit(self):
+        for start in range(0, len(self.data), 2):
+            self.transformer.fit_partial(
+                self.data.iloc[start : start + 2], ["A", "B"], scaler_type="standard"
+            )
+        chunks = [
+            self.transformer.transform(self.data.iloc[start : start + 2])
+            for start in range(0, len(self.data), 2)
+        ]
+        streamed = pd.concat(chunks)
+        expected = StandardScaler().fit_transform(self.data[["A", "B"]])
+        np.testing.assert_allclose(streamed[["A", "B"]].to_numpy(), expected)
+        assert_series_equal(streamed["Label"], self.data["Label"])
+
+    def test_transform_does_not_refit(self):
+        self.transformer.scale_numerical_features(
+            self.data.copy(), columns=["B"], scaler_type="minmax"
+        )
+        new_batch = pd.DataFrame({"B": [10.0, 110.0]})
+        result = self.transformer.transform(new_batch)
+        np.testing.assert_allclose(result["B"].to_numpy(), [0.0, 2.0])
+        assert_frame_equal(new_batch, pd.DataFrame({"B": [10.0, 110.0]}))
+
+    def test_fit_partial_robust_raises_valueerror(self):
+        with self.assertRaisesRegex(ValueError, "cannot be fitted incrementally"):
+            self.transformer.fit_partial(self.data, ["A"], scaler_type="robust")
+
+
 class TestEncodeCategoricalFeatures(unittest.TestCase):
     def setUp(self):
         self.data = pd.DataFrame(
@@ -303,6 +370,88 @@ class TestEncodeCategoricalFeatures(unittest.TestCase):
         self.assertNotIn("Category1", self.transformer_instance.encoders)
 
 
+class TestSparseAndHashedEncoding(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "Category1": ["A", "B", "A", "C", "B"],
+                "Category2": ["X", "Y", np.nan, "X", "Y"],
+                "NumericCol": [1, 2, 3, 4, 5],
+            }
+        )
+        self.transformer_instance = DataTransformer(self.data.copy())
+
+    def test_sparse_onehot_matches_dense(self):
+        dense = self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1", "Category2"]
+        )
+        sparse = self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1", "Category2"], sparse=True
+        )
+        self.assertIsInstance(sparse["Category1_A"].dtype, pd.SparseDtype)
+        self.assertEqual(list(sparse.columns), list(dense.columns))
+        np.testing.assert_array_equal(
+            sparse.drop(columns="NumericCol").astype(float).to_numpy(),
+            dense.drop(columns="NumericCol").to_numpy(),
+        )
+
+    def test_ordinal_encoding_in_place(self):
+        encoded_df = self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1", "Category2"], encoder_type="ordinal"
+        )
+        self.assertEqual(list(encoded_df.columns), list(self.data.columns))
+        self.assertEqual(encoded_df["Category1"].tolist(), [0, 1, 0, 2, 1])
+        self.assertEqual(encoded_df["Category2"].tolist(), [0, 1, -1, 0, 1])
+        self.assertIsInstance(
+            self.transformer_instance.encoders["Category1"], CategoryCodeEncoder
+        )
+
+    def test_hashing_encoding_fixed_budget(self):
+        encoded_df = self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1"], encoder_type="hashing", n_features=8
+        )
+        hash_cols = [c for c in encoded_df.columns if c.startswith("Category1_hash_")]
+        self.assertEqual(len(hash_cols), 8)
+        self.assertTrue((encoded_df[hash_cols].sum(axis=1) == 1).all())
+        # Equal values land in the same bucket
+        np.testing.assert_array_equal(
+            encoded_df.loc[0, hash_cols].to_numpy(), encoded_df.loc[2, hash_cols].to_numpy()
+        )
+
+    def test_sparse_hashing_encoding(self):
+        encoded_df = self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1"], encoder_type="hashing", n_features=8, sparse=True
+        )
+        self.assertTrue(self.transformer_instance.encoders["Category1"].sparse)
+        hash_cols = [c for c in encoded_df.columns if c.startswith("Category1_hash_")]
+        self.assertTrue(all(isinstance(encoded_df[c].dtype, pd.SparseDtype) for c in hash_cols))
+        self.assertEqual(encoded_df[hash_cols].sparse.to_dense().sum(axis=1).tolist(), [1.0] * len(encoded_df))
+
+    def test_hashing_encoder_is_stable(self):
+        a = HashingEncoder(n_features=16).transform(pd.Series(["x", "y"]))
+        b = HashingEncoder(n_features=16).transform(pd.Series(["y", "x"]))
+        self.assertEqual(a.indices.tolist(), b.indices[::-1].tolist())
+
+    def test_encode_to_matrix(self):
+        matrix, names = self.transformer_instance.encode_to_matrix(
+            self.data, columns=["Category1", "Category2"]
+        )
+        self.assertEqual(matrix.shape, (5, 6))
+        self.assertEqual(matrix.format, "csr")
+        self.assertEqual(names[:3], ["Category1_A", "Category1_B", "Category1_C"])
+        self.assertEqual(matrix.sum(), 10)
+
+    def test_transform_applies_fitted_encoders(self):
+        self.transformer_instance.encode_categorical_features(
+            self.data.copy(), columns=["Category1"]
+        )
+        result = self.transformer_instance.transform(
+            pd.DataFrame({"Category1": ["C", "Z"], "NumericCol": [1, 2]})
+        )
+        self.assertEqual(result["Category1_C"].tolist(), [1.0, 0.0])
+        self.assertEqual(result["Category1_A"].tolist(), [0.0, 0.0])
+
+
 class TestTransformDataOrchestration(unittest.TestCase):
     def setUp(self):
         self.data = pd.DataFrame(
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from DataNinja.plugins.calculator import CalculatorProcessor
+from DataNinja.plugins.units import UnitRegistry
+
+
+class TestUnitRegistry(unittest.TestCase):
+    def setUp(self):
+        self.units = UnitRegistry()
+
+    def test_compound_units(self):
+        self.assertAlmostEqual(self.units.convert(36, "km/h", "m/s"), 10.0)
+        self.assertAlmostEqual(self.units.convert(1, "g/cm³", "kg/m^3"), 1000.0)
+        self.assertAlmostEqual(self.units.convert(1, "kWh", "MJ"), 3.6)
+        self.assertAlmostEqual(self.units.convert(2, "N*m", "J"), 2.0)
+        self.assertAlmostEqual(self.units.convert(1, "m**2", "cm2"), 10000.0)
+        self.assertAlmostEqual(self.units.convert(1, "GiB", "MB"), 1073.741824)
+        self.assertEqual(self.units.category_of("kg·m⁻³"), "density")
+
+    def test_temperature_is_exact_for_scalars(self):
+        self.assertEqual(self.units.convert(100, "C", "F"), 212.0)
+        self.assertEqual(self.units.convert(-40, "F", "C"), -40.0)
+        self.assertEqual(self.units.convert(0, "C", "K"), 273.15)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Unknown unit: 'furlong'"):
+            self.units.convert(1, "furlong", "m")
+        with self.assertRaisesRegex(ValueError, "incompatible dimensions"):
+            self.units.convert(1, "m", "s")
+        with self.assertRaisesRegex(ValueError, "cannot be used in a compound unit"):
+            self.units.convert(1, "C/s", "K/s")
+        with self.assertRaisesRegex(ValueError, "Unknown units in length: kg, m"):
+            self.units.convert(1, "kg", "m", category="length")
+
+    def test_series_conversion_is_vectorized_and_keeps_index(self):
+        values = pd.Series([0.0, 100.0, np.nan], index=list("abc"), name="t")
+        result = self.units.convert(values, "C", "F")
+        self.assertEqual(list(result.index), list("abc"))
+        np.testing.assert_allclose(result, [32.0, 212.0, np.nan])
+
+    def test_load_definitions_from_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "units.json")
+        with open(path, "w") as f:
+            json.dump({
+                "units": {"furlong": "201.168 m", "fortnight": {"factor": 14, "unit": "day"}},
+                "categories": {"slowness": "s/m"},
+            }, f)
+        units = UnitRegistry.from_file(path)
+        self.assertAlmostEqual(units.convert(1, "furlong/fortnight", "mm/h"), 201168 / 336, places=6)
+        self.assertAlmostEqual(units.convert(1, "s/m", "h/km"), 1000 / 3600)
+        self.assertEqual(units.category_of("s/km"), "slowness")
+        self.assertIn("furlong", units.units("length"))
+        # New definitions invalidate memoized factors.
+        self.assertEqual(units.factors("fortnight", "day"), (14.0, 0.0))
+        units.define("fortnight", "15", "day")
+        self.assertEqual(units.factors("fortnight", "day"), (15.0, 0.0))
+
+        calc = CalculatorProcessor(units)
+        self.assertAlmostEqual(calc.convert_unit(1, "furlong", "m", "length"), 201.168)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -324,6 +324,36 @@ class TestGenerateTimestampedFilename(unittest.TestCase):
         self.assertIsNotNone(pattern.match(filename))
 
 
+class TestFingerprintDataFrame(unittest.TestCase):
+    def setUp(self):
+        import pandas as pd
+
+        self.pd = pd
+        self.df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+
+    def test_equal_data_gives_equal_fingerprint(self):
+        self.assertEqual(
+            utils.fingerprint_dataframe(self.df), utils.fingerprint_dataframe(self.df.copy())
+        )
+
+    def test_value_dtype_name_and_index_changes_are_detected(self):
+        base = utils.fingerprint_dataframe(self.df)
+        changed_value = self.df.copy()
+        changed_value.loc[0, "a"] = 10
+        variants = [
+            changed_value,
+            self.df.astype({"a": "float64"}),
+            self.df.rename(columns={"a": "c"}),
+            self.df.set_axis([5, 6, 7]),
+        ]
+        for variant in variants:
+            self.assertNotEqual(utils.fingerprint_dataframe(variant), base)
+
+    def test_unhashable_cells(self):
+        df = self.pd.DataFrame({"a": [[1, 2], [3]]})
+        self.assertEqual(len(utils.fingerprint_dataframe(df)), 32)
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
 # Need to import sys for Capturing helper.